@@ -0,0 +1,279 @@
+"""Cold-start and per-command latency benchmarks for the swhat entry point.
+
+Each scenario runs swhat in a fresh interpreter several times and records:
+
+- wall time (median and minimum, milliseconds)
+- import time (median, milliseconds, from `python -X importtime`)
+- peak RSS (maximum across runs, kilobytes)
+
+The daemon is bypassed (SWHAT_NO_DAEMON=1) so the numbers reflect the
+in-process cold path that agents hit when no `swhat serve` is running.
+
+Usage:
+
+    python benchmarks/bench_cli.py                      # print results
+    python benchmarks/bench_cli.py --save baseline.json # store a baseline
+    python benchmarks/bench_cli.py --compare baseline.json --threshold 0.25
+
+In compare mode the script exits non-zero if any scenario's wall or import
+time regresses by more than the threshold (and by more than --min-delta-ms,
+so sub-millisecond noise on fast commands does not fail the run).
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Benchmark result file format version
+BASELINE_FORMAT = 1
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class Scenario:
+    """A single benchmarked swhat invocation."""
+
+    name: str
+    argv: list[str]
+    # "none": run in a scratch dir; "empty": fresh empty dir per run;
+    # "initialized": a dir that already went through `swhat init`.
+    workdir: str = "none"
+
+
+@dataclass
+class Result:
+    """Aggregated measurements for one scenario."""
+
+    name: str
+    runs: int
+    wall_ms_median: float
+    wall_ms_min: float
+    import_ms_median: float
+    peak_rss_kb: int
+
+
+def default_scenarios() -> list[Scenario]:
+    """Build the scenario list, including one entry per registered template."""
+    from swhat.template_cli import list_templates
+
+    scenarios = [
+        Scenario("version", ["--version"]),
+        Scenario("template-list", ["template", "--list"]),
+    ]
+    for name, _ in list_templates():
+        scenarios.append(Scenario(f"template-{name}", ["template", name]))
+    scenarios.append(Scenario("template-all", ["template", "--all", "--hash"]))
+    scenarios.append(Scenario("init-empty", ["init"], workdir="empty"))
+    scenarios.append(Scenario("init-initialized", ["init"], workdir="initialized"))
+    return scenarios
+
+
+def _command(argv: list[str], importtime: bool = False) -> list[str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    return command + ["-m", "swhat.client", *argv]
+
+
+def _env() -> dict[str, str]:
+    return dict(os.environ, SWHAT_NO_DAEMON="1", PYTHONDONTWRITEBYTECODE="")
+
+
+def _rss_kb(ru_maxrss: int) -> int:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return ru_maxrss // 1024 if sys.platform == "darwin" else ru_maxrss
+
+
+def _run_once(argv: list[str], cwd: Path) -> tuple[float, int]:
+    """Run one invocation and return (wall_ms, peak_rss_kb)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        _command(argv),
+        cwd=cwd,
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        rss = _rss_kb(usage.ru_maxrss)
+    else:
+        proc.wait()
+        rss = 0
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"swhat {' '.join(argv)} exited with {proc.returncode}")
+    return wall_ms, rss
+
+
+def _import_ms(argv: list[str], cwd: Path) -> float:
+    """Run one invocation under -X importtime and return total import time."""
+    proc = subprocess.run(
+        _command(argv, importtime=True),
+        cwd=cwd,
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # Top-level imports have a single space of indentation before the name.
+        if match and len(match.group(3)) == 1:
+            total_us += int(match.group(2))
+    return total_us / 1000
+
+
+def _prepare_workdir(scenario: Scenario, scratch: Path, index: int) -> Path:
+    if scenario.workdir == "none":
+        return scratch
+    workdir = scratch / f"{scenario.name}-{index}"
+    if scenario.workdir == "initialized":
+        workdir = scratch / scenario.name
+        if workdir.exists():
+            return workdir
+    workdir.mkdir(parents=True)
+    if scenario.workdir == "initialized":
+        subprocess.run(
+            _command(["init"]), cwd=workdir, env=_env(), stdout=subprocess.DEVNULL, check=True
+        )
+    return workdir
+
+
+def run_scenario(scenario: Scenario, runs: int, scratch: Path) -> Result:
+    """Benchmark one scenario."""
+    # Warm the OS page cache so the first sample is not an outlier.
+    _run_once(scenario.argv, _prepare_workdir(scenario, scratch, -1))
+
+    walls, rss_values, imports = [], [], []
+    for index in range(runs):
+        wall_ms, rss = _run_once(scenario.argv, _prepare_workdir(scenario, scratch, index))
+        walls.append(wall_ms)
+        rss_values.append(rss)
+        workdir = _prepare_workdir(scenario, scratch, runs + index)
+        imports.append(_import_ms(scenario.argv, workdir))
+    return Result(
+        name=scenario.name,
+        runs=runs,
+        wall_ms_median=round(statistics.median(walls), 2),
+        wall_ms_min=round(min(walls), 2),
+        import_ms_median=round(statistics.median(imports), 2),
+        peak_rss_kb=max(rss_values),
+    )
+
+
+def run_all(scenarios: list[Scenario], runs: int) -> dict:
+    """Run every scenario and return a baseline document."""
+    scratch = Path(tempfile.mkdtemp(prefix="swhat-bench-"))
+    try:
+        results = [run_scenario(scenario, runs, scratch) for scenario in scenarios]
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    from swhat import __version__
+
+    return {
+        "format": BASELINE_FORMAT,
+        "swhat_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: asdict(result) for result in results},
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Return regressions of current results against a baseline."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("wall_ms_median", "import_ms_median"):
+            old, new = previous[metric], result[metric]
+            if new - old > min_delta_ms and new > old * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {old:.1f} -> {new:.1f} ms (+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(document: dict, baseline: dict | None = None) -> None:
+    """Print results as an aligned table, with baseline deltas if given."""
+    header = f"{'scenario':<34} {'wall ms':>9} {'min ms':>9} {'import ms':>10} {'rss KB':>9}"
+    if baseline:
+        header += f" {'Δ wall':>8}"
+    print(header)
+    for name, result in document["results"].items():
+        line = (
+            f"{name:<34} {result['wall_ms_median']:>9.1f} {result['wall_ms_min']:>9.1f} "
+            f"{result['import_ms_median']:>10.1f} {result['peak_rss_kb']:>9}"
+        )
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous:
+            delta = (result["wall_ms_median"] / previous["wall_ms_median"] - 1) * 100
+            line += f" {delta:>+7.0f}%"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario (default 10).")
+    parser.add_argument("--only", action="append", default=[], help="Run only these scenarios.")
+    parser.add_argument("--save", type=Path, help="Write results to this JSON baseline file.")
+    parser.add_argument("--compare", type=Path, help="Compare against this JSON baseline file.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed relative regression (default 0.25)."
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=5.0, help="Ignore regressions below this (ms)."
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    scenarios = default_scenarios()
+    if args.only:
+        scenarios = [s for s in scenarios if s.name in args.only]
+        if not scenarios:
+            parser.error(f"no scenarios match {args.only}")
+
+    document = run_all(scenarios, args.runs)
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+
+    if args.json:
+        print(json.dumps(document, indent=2))
+    else:
+        print_table(document, baseline)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if baseline is not None:
+        regressions = compare(document, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print("", file=sys.stderr)
+            print("Regressions:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
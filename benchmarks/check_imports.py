@@ -0,0 +1,106 @@
+"""Import-time regression check for the swhat entry point.
+
+Runs each scenario in a fresh interpreter and records which swhat modules
+were imported by the time it exited. The check fails when a command loads
+template or command content it does not need, or when the cold-start path
+(`swhat --version`) picks up swhat modules beyond the entry point itself.
+Because it checks module sets rather than timings, the result is stable
+across machines and stays meaningful as templates and agent platforms are
+added.
+
+Usage:
+
+    python benchmarks/check_imports.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# Modules that make up the entry point; anything else must be imported lazily.
+ENTRY_MODULES = frozenset({"swhat", "swhat.cli", "swhat.client", "swhat.serve_cli"})
+
+# Packages whose submodules hold large content strings.
+CONTENT_PACKAGES = ("swhat.templates.", "swhat.commands.")
+
+# (label, argv, content modules the scenario is allowed to import)
+SCENARIOS: list[tuple[str, list[str], frozenset[str]]] = [
+    ("swhat --version", ["--version"], frozenset()),
+    ("swhat --help", ["--help"], frozenset()),
+    ("swhat template --list", ["template", "--list"], frozenset()),
+    (
+        "swhat template plan",
+        ["template", "plan"],
+        frozenset({"swhat.templates.plan_template"}),
+    ),
+    (
+        "swhat template specification",
+        ["template", "specification"],
+        frozenset({"swhat.templates.spec_template"}),
+    ),
+]
+
+_PROBE = """\
+import atexit, json, os, sys
+
+def _dump():
+    with open(os.environ["SWHAT_IMPORT_PROBE"], "w", encoding="utf-8") as f:
+        json.dump(sorted(m for m in sys.modules if m == "swhat" or m.startswith("swhat.")), f)
+
+atexit.register(_dump)
+sys.argv = ["swhat"] + sys.argv[1:]
+from swhat.client import main
+main()
+"""
+
+
+def loaded_modules(argv: list[str]) -> set[str]:
+    """Run swhat with argv in a fresh interpreter and return imported swhat modules."""
+    fd, probe_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        env = dict(os.environ, SWHAT_IMPORT_PROBE=probe_path, SWHAT_NO_DAEMON="1")
+        subprocess.run(
+            [sys.executable, "-c", _PROBE, *argv],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        with open(probe_path, encoding="utf-8") as f:
+            return set(json.load(f))
+    finally:
+        os.unlink(probe_path)
+
+
+def check_scenario(argv: list[str], allowed_content: frozenset[str]) -> list[str]:
+    """Return a list of problems found for one scenario (empty if clean)."""
+    modules = loaded_modules(argv)
+    problems = []
+    content = {m for m in modules if m.startswith(CONTENT_PACKAGES)}
+    for module in sorted(content - allowed_content):
+        problems.append(f"eagerly imported content module {module}")
+    for module in sorted(allowed_content - content):
+        problems.append(f"expected content module {module} was not imported")
+    if argv == ["--version"]:
+        for module in sorted(modules - ENTRY_MODULES):
+            problems.append(f"cold start imported {module}")
+    return problems
+
+
+def main() -> int:
+    failures = 0
+    for label, argv, allowed in SCENARIOS:
+        problems = check_scenario(argv, allowed)
+        status = "ok" if not problems else "FAIL"
+        print(f"{status:<5} {label}")
+        for problem in problems:
+            print(f"      {problem}")
+        failures += bool(problems)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""Structured parsing of swhat Markdown artifacts.
+
+spec.md, plan.md and tasks.md follow the structure defined by the
+specification, plan and tasks templates. This module turns them into a
+typed model in a single streaming pass over the file's lines:
+
+- sections: every heading with its level, parent and byte offsets
+- user stories with their priorities (spec.md)
+- numbered items such as FR-001 and SC-001 (spec.md)
+- [NEEDS CLARIFICATION] markers
+- bold "**Key**: value" fields, e.g. the plan's Technical Context
+- phases, checkpoints and tasks with IDs, [P] flags, story tags and
+  explicit "depends on T012, T013" references (tasks.md)
+
+Fenced code blocks and HTML comments are skipped, so template guidance
+and examples are never mistaken for content. Parsed documents are cached
+by content hash, in memory and optionally as JSON on disk, so repeated
+queries against an unchanged file do not re-parse it. The disk cache
+keeps one entry per source file: writing a file's new entry removes the
+entries for its earlier versions.
+"""
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from swhat.fsutil import atomic_write_text, sha256_bytes
+from swhat.workspace import INDEX_DIR, WORKSPACE_DIR
+
+# Bump when the model or parsing rules change; invalidates on-disk caches
+PARSER_VERSION = 2
+
+# Directory for cached parse results inside the workspace index directory
+PARSE_CACHE_DIR = "parsed"
+
+# A closing run of "#" must follow whitespace, as in CommonMark, so a
+# title such as "C#" keeps its last character.
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_USER_STORY = re.compile(
+    r"User Story\s+(\d+)\s*[-–—:]\s*(.*?)\s*\(Priority:\s*(P\d+)\)", re.IGNORECASE
+)
+_ITEM = re.compile(r"^\s*[-*]\s+\*\*([A-Z]{2,4}-\d+)\*\*:?\s*(.*)$")
+_CLARIFICATION = re.compile(r"\[NEEDS CLARIFICATION(?::\s*([^\]]*))?\]")
+_FIELD = re.compile(r"^\*\*([^*]+?)\*\*:\s*(.*)$")
+_TASK = re.compile(r"^\s*[-*]\s+\[([ xX])\]\s+(T\d+|TXXX)\b\s*(.*)$")
+_TASK_TAG = re.compile(r"^\[([^\]]+)\]\s*")
+_STORY_TAG = re.compile(r"^US\d+$")
+_DEPENDS = re.compile(r"depends on\s+((?:T\d+)(?:\s*(?:,|and|&)\s*T\d+)*)", re.IGNORECASE)
+_TASK_ID = re.compile(r"T\d+")
+_PHASE = re.compile(r"^Phase\s+(\w+)\s*[:-]\s*(.*)$", re.IGNORECASE)
+_CHECKPOINT = re.compile(r"^\*\*Checkpoint\*\*:\s*(.*)$")
+
+
+@dataclass
+class Section:
+    """A Markdown heading and the byte range it covers."""
+
+    level: int
+    title: str
+    line: int
+    # Byte offsets: heading start, body start (after the heading line), end
+    start: int
+    body_start: int
+    end: int
+    # Index of the enclosing section in Document.sections, or None
+    parent: int | None = None
+
+
+@dataclass
+class UserStory:
+    """A prioritized user story from spec.md."""
+
+    number: int
+    title: str
+    priority: str
+    line: int
+    # Index of the story's heading in Document.sections
+    section: int
+
+    @property
+    def tag(self) -> str:
+        """Return the story tag used in tasks.md, e.g. "US1"."""
+        return f"US{self.number}"
+
+
+@dataclass
+class Item:
+    """A numbered item such as FR-001 or SC-002."""
+
+    id: str
+    text: str
+    line: int
+    # Byte offsets of the item's line
+    start: int
+    end: int
+
+
+@dataclass
+class Clarification:
+    """A [NEEDS CLARIFICATION] marker."""
+
+    text: str
+    line: int
+
+
+@dataclass
+class Phase:
+    """A phase heading in tasks.md."""
+
+    index: int
+    title: str
+    line: int
+    checkpoint: str | None = None
+
+
+@dataclass
+class Task:
+    """A checklist task line from tasks.md."""
+
+    id: str
+    done: bool
+    parallel: bool
+    story: str | None
+    description: str
+    line: int
+    # Byte offset of the line start and of the checkbox character
+    start: int
+    checkbox: int
+    # Index into Document.phases, or None if outside any phase
+    phase: int | None = None
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Document:
+    """Structured view of one Markdown artifact."""
+
+    kind: str
+    sha256: str
+    size: int
+    sections: list[Section] = field(default_factory=list)
+    stories: list[UserStory] = field(default_factory=list)
+    items: list[Item] = field(default_factory=list)
+    clarifications: list[Clarification] = field(default_factory=list)
+    fields: dict[str, str] = field(default_factory=dict)
+    phases: list[Phase] = field(default_factory=list)
+    tasks: list[Task] = field(default_factory=list)
+
+    @property
+    def requirements(self) -> list[Item]:
+        """Functional requirements (FR-*)."""
+        return [item for item in self.items if item.id.startswith("FR-")]
+
+    @property
+    def success_criteria(self) -> list[Item]:
+        """Success criteria (SC-*)."""
+        return [item for item in self.items if item.id.startswith("SC-")]
+
+    def find_sections(self, title: str) -> list[Section]:
+        """Find sections whose title matches, ignoring case and decorations.
+
+        A title matches if it equals the query or starts with it, after
+        stripping emphasis such as "*(mandatory)*".
+        """
+        query = _normalize_title(title)
+        exact = [s for s in self.sections if _normalize_title(s.title) == query]
+        if exact:
+            return exact
+        return [s for s in self.sections if _normalize_title(s.title).startswith(query)]
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Document":
+        """Rebuild a Document from `to_dict()` output."""
+        return cls(
+            kind=data["kind"],
+            sha256=data["sha256"],
+            size=data["size"],
+            sections=[Section(**s) for s in data["sections"]],
+            stories=[UserStory(**s) for s in data["stories"]],
+            items=[Item(**i) for i in data["items"]],
+            clarifications=[Clarification(**c) for c in data["clarifications"]],
+            fields=dict(data["fields"]),
+            phases=[Phase(**p) for p in data["phases"]],
+            tasks=[Task(**t) for t in data["tasks"]],
+        )
+
+
+def _normalize_title(title: str) -> str:
+    title = re.sub(r"\*\([^)]*\)\*", "", title)
+    title = re.sub(r"[*_`]", "", title)
+    return " ".join(title.lower().split())
+
+
+def kind_for(path: Path) -> str:
+    """Return the artifact kind ("spec", "plan", "tasks", ...) for a file."""
+    return path.stem.lower()
+
+
+def parse_lines(lines: Iterable[bytes], kind: str = "markdown", sha256: str = "") -> Document:
+    """Parse an artifact from an iterable of raw lines in a single pass.
+
+    Args:
+        lines: Lines as bytes, including their line endings.
+        kind: Artifact kind recorded on the document.
+        sha256: Content hash recorded on the document.
+
+    Returns:
+        The parsed document.
+    """
+    doc = Document(kind=kind, sha256=sha256, size=0)
+    open_sections: list[int] = []
+    in_fence = False
+    in_comment = False
+    phase: int | None = None
+    offset = 0
+
+    for number, raw in enumerate(lines, start=1):
+        start = offset
+        offset += len(raw)
+        text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        if _FENCE.match(text):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if in_comment:
+            if "-->" in text:
+                in_comment = False
+                text = text.split("-->", 1)[1]
+            else:
+                continue
+        if "<!--" in text:
+            before, _, after = text.partition("<!--")
+            if "-->" in after:
+                text = before + after.split("-->", 1)[1]
+            else:
+                in_comment = True
+                text = before
+        if not text.strip():
+            continue
+
+        heading = _HEADING.match(text)
+        if heading:
+            level = len(heading.group(1))
+            title = heading.group(2)
+            while open_sections and doc.sections[open_sections[-1]].level >= level:
+                doc.sections[open_sections.pop()].end = start
+            parent = open_sections[-1] if open_sections else None
+            doc.sections.append(Section(level, title, number, start, offset, offset, parent))
+            index = len(doc.sections) - 1
+            open_sections.append(index)
+
+            story = _USER_STORY.search(title)
+            if story:
+                doc.stories.append(
+                    UserStory(
+                        int(story.group(1)), story.group(2), story.group(3).upper(), number, index
+                    )
+                )
+            phase_match = _PHASE.match(title)
+            if phase_match and level <= 2:
+                doc.phases.append(Phase(len(doc.phases), title, number))
+                phase = len(doc.phases) - 1
+            elif level <= 2 and kind == "tasks":
+                # A non-phase top-level section ends the current phase.
+                phase = None
+            continue
+
+        for marker in _CLARIFICATION.finditer(text):
+            doc.clarifications.append(Clarification((marker.group(1) or "").strip(), number))
+
+        task = _TASK.match(text)
+        if task:
+            doc.tasks.append(_parse_task(task, number, start, raw, phase))
+            continue
+
+        item = _ITEM.match(text)
+        if item:
+            doc.items.append(Item(item.group(1), item.group(2).strip(), number, start, offset))
+            continue
+
+        checkpoint = _CHECKPOINT.match(text)
+        if checkpoint and phase is not None:
+            doc.phases[phase].checkpoint = checkpoint.group(1).strip()
+            continue
+
+        bold_field = _FIELD.match(text)
+        if bold_field:
+            doc.fields.setdefault(bold_field.group(1).strip(), bold_field.group(2).strip())
+
+    for index in open_sections:
+        doc.sections[index].end = offset
+    doc.size = offset
+    return doc
+
+
+def _parse_task(match: re.Match, line: int, start: int, raw: bytes, phase: int | None) -> Task:
+    """Build a Task from a matched checklist line."""
+    rest = match.group(3)
+    parallel = False
+    story = None
+    while True:
+        tag = _TASK_TAG.match(rest)
+        if not tag:
+            break
+        value = tag.group(1).strip()
+        if value == "P":
+            parallel = True
+        elif _STORY_TAG.match(value):
+            story = value
+        else:
+            break
+        rest = rest[tag.end() :]
+    depends_on = []
+    for clause in _DEPENDS.finditer(rest):
+        depends_on.extend(_TASK_ID.findall(clause.group(1)))
+    checkbox = start + raw.index(b"[") + 1
+    return Task(
+        id=match.group(2),
+        done=match.group(1) in "xX",
+        parallel=parallel,
+        story=story,
+        description=rest.strip(),
+        line=line,
+        start=start,
+        checkbox=checkbox,
+        phase=phase,
+        depends_on=list(dict.fromkeys(depends_on)),
+    )
+
+
+def parse_bytes(data: bytes, kind: str = "markdown") -> Document:
+    """Parse an artifact held in memory."""
+    return parse_lines(data.splitlines(keepends=True), kind, sha256_bytes(data))
+
+
+# In-process cache: (sha256, kind) -> Document
+_MEMORY_CACHE: dict[tuple[str, str], Document] = {}
+
+
+def default_cache_dir(path: Path) -> Path | None:
+    """Return the on-disk parse cache for a file inside a swhat workspace."""
+    for parent in Path(path).resolve().parents:
+        if parent.name == WORKSPACE_DIR:
+            return parent / INDEX_DIR / PARSE_CACHE_DIR
+    return None
+
+
+def parse_file(path: Path, cache_dir: Path | None = None, kind: str | None = None) -> Document:
+    """Parse an artifact file, reusing cached results for unchanged content.
+
+    Args:
+        path: Markdown file to parse.
+        cache_dir: Directory for cached JSON results. Defaults to the
+            workspace's `.index/parsed/` when the file lives under `.swhat/`.
+        kind: Artifact kind; derived from the file name if None.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    kind = kind or kind_for(path)
+    digest = sha256_bytes(data)
+    key = (digest, kind)
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+
+    cache_dir = cache_dir or default_cache_dir(path)
+    source = sha256_bytes(str(path.resolve()).encode("utf-8"))[:16]
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = cache_dir / f"{source}-{kind}-v{PARSER_VERSION}-{digest}.json"
+    if cache_file is not None:
+        try:
+            doc = Document.from_dict(json.loads(cache_file.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError):
+            doc = None
+        if doc is not None:
+            _MEMORY_CACHE[key] = doc
+            return doc
+
+    doc = parse_lines(data.splitlines(keepends=True), kind, digest)
+    _MEMORY_CACHE[key] = doc
+    if cache_file is not None:
+        try:
+            # Drop this file's entries for content it no longer has.
+            for stale in cache_dir.glob(f"{source}-{kind}-*.json"):
+                stale.unlink(missing_ok=True)
+            atomic_write_text(cache_file, json.dumps(doc.to_dict()))
+        except OSError:
+            pass
+    return doc
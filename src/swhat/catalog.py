@@ -0,0 +1,178 @@
+"""Feature catalog for swhat.
+
+The catalog is a small SQLite database at `.swhat/.index/catalog.sqlite`
+describing every feature directory in the workspace: title, status,
+creation date, which artifacts exist, and when they last changed. It is
+refreshed incrementally: each feature's directory and artifact stats are
+compared against the stored stamp, and only features whose stamp changed
+have their spec.md re-read.
+"""
+
+import re
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.workspace import feature_dirs, index_dir
+
+# Catalog database file inside the workspace index directory
+CATALOG_FILE = "catalog.sqlite"
+
+# Bump when the schema or extracted fields change; forces a rebuild
+CATALOG_VERSION = 1
+
+# Artifact name -> candidate paths relative to the feature directory
+ARTIFACTS: dict[str, tuple[str, ...]] = {
+    "spec": ("spec.md",),
+    "requirements": ("requirements.md", "checklists/requirements.md"),
+    "plan": ("plan.md",),
+    "research": ("research.md",),
+    "data-model": ("data-model.md",),
+    "contracts": ("contracts",),
+    "tasks": ("tasks.md",),
+}
+
+# Bytes of spec.md read to find the title, status and created date
+_HEADER_BYTES = 4096
+
+_TITLE = re.compile(r"^#\s+(?:Feature Specification:\s*)?(.+?)\s*$", re.MULTILINE)
+_STATUS = re.compile(r"^\*\*Status\*\*:\s*(.+?)\s*$", re.MULTILINE)
+_CREATED = re.compile(r"^\*\*Created\*\*:\s*(.+?)\s*$", re.MULTILINE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    name TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created TEXT NOT NULL,
+    modified_ns INTEGER NOT NULL,
+    artifacts TEXT NOT NULL,
+    stamp TEXT NOT NULL
+)
+"""
+
+
+@dataclass
+class FeatureEntry:
+    """One feature as recorded in the catalog."""
+
+    name: str
+    title: str
+    status: str
+    created: str
+    modified_ns: int
+    # Space-separated artifact names present, in ARTIFACTS order
+    artifacts: str
+
+    def has(self, artifact: str) -> bool:
+        """Return True if the feature has the given artifact."""
+        return artifact in self.artifacts.split()
+
+    def to_dict(self) -> dict:
+        """Return a JSON-friendly dict, with artifacts as a name -> bool map."""
+        data = asdict(self)
+        present = set(self.artifacts.split())
+        data["artifacts"] = {name: name in present for name in ARTIFACTS}
+        return data
+
+
+def _stat_feature(directory: Path) -> tuple[str, list[str], int]:
+    """Stat a feature directory and its artifacts without reading them.
+
+    Returns:
+        Tuple of (stamp, present artifact names, latest mtime in ns).
+    """
+    dir_stat = directory.stat()
+    parts = [str(dir_stat.st_mtime_ns)]
+    present = []
+    latest = dir_stat.st_mtime_ns
+    for artifact, candidates in ARTIFACTS.items():
+        for candidate in candidates:
+            try:
+                stat = (directory / candidate).stat()
+            except OSError:
+                continue
+            parts.append(f"{candidate}:{stat.st_mtime_ns}:{stat.st_size}")
+            present.append(artifact)
+            latest = max(latest, stat.st_mtime_ns)
+            break
+    return "|".join(parts), present, latest
+
+
+def _read_header(directory: Path) -> tuple[str, str, str]:
+    """Extract (title, status, created) from the top of spec.md."""
+    try:
+        with open(directory / "spec.md", encoding="utf-8", errors="replace") as f:
+            head = f.read(_HEADER_BYTES)
+    except OSError:
+        return directory.name, "", ""
+    title = _TITLE.search(head)
+    status = _STATUS.search(head)
+    created = _CREATED.search(head)
+    return (
+        title.group(1) if title else directory.name,
+        status.group(1) if status else "",
+        created.group(1) if created else "",
+    )
+
+
+class Catalog:
+    """Incrementally maintained feature catalog for one workspace."""
+
+    def __init__(self, workspace: Path) -> None:
+        self.workspace = workspace
+        self.path = index_dir(workspace) / CATALOG_FILE
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS features")
+            self.conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def refresh(self) -> int:
+        """Bring the catalog up to date with the workspace.
+
+        Returns:
+            Number of features that were (re)read from disk.
+        """
+        stored = dict(self.conn.execute("SELECT name, stamp FROM features"))
+        seen = set()
+        changed = 0
+        with self.conn:
+            for directory in feature_dirs(self.workspace):
+                name = directory.name
+                seen.add(name)
+                try:
+                    stamp, present, latest = _stat_feature(directory)
+                except OSError:
+                    continue
+                if stored.get(name) == stamp:
+                    continue
+                title, status, created = _read_header(directory)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name, title, status, created, latest, " ".join(present), stamp),
+                )
+                changed += 1
+            for name in set(stored) - seen:
+                self.conn.execute("DELETE FROM features WHERE name = ?", (name,))
+        return changed
+
+    def entries(self) -> list[FeatureEntry]:
+        """Return all catalogued features, sorted by name."""
+        rows = self.conn.execute(
+            "SELECT name, title, status, created, modified_ns, artifacts FROM features "
+            "ORDER BY name"
+        )
+        return [FeatureEntry(*row) for row in rows]
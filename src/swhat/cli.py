@@ -4,8 +4,20 @@ import sys
 
 import click
 
-from swhat.init_cli import initialize_project
-from swhat.template_cli import get_template, list_templates
+# Artifact names accepted by --has/--missing; mirrors swhat.catalog.ARTIFACTS,
+# kept here so building the CLI does not import the catalog module.
+ARTIFACT_NAMES = ["spec", "requirements", "plan", "research", "data-model", "contracts", "tasks"]
+
+# Artifacts searched by `swhat show`; mirrors swhat.show_cli.SHOW_ARTIFACTS.
+SHOW_ARTIFACT_NAMES = [
+    "spec",
+    "plan",
+    "tasks",
+    "research",
+    "data-model",
+    "quickstart",
+    "requirements",
+]
 
 
 @click.group(invoke_without_command=True)
@@ -25,59 +37,1471 @@ def main(ctx: click.Context, help: bool) -> None:
 
 
 @main.command()
-@click.argument("name", required=False, default=None)
+@click.argument("names", nargs=-1)
 @click.option("--list", "-l", "list_flag", is_flag=True, help="List available templates.")
-def template(name: str | None, list_flag: bool) -> None:
-    """Output a specification template.
+@click.option("--all", "all_flag", is_flag=True, help="Output every template as JSON.")
+@click.option("--json", "json_flag", is_flag=True, help="Output JSON (name -> content).")
+@click.option("--hash", "hash_flag", is_flag=True, help="Include a sha256 content hash per entry.")
+@click.option(
+    "--set",
+    "set_values",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Fill a placeholder, e.g. --set DATE=2026-01-28 (repeatable).",
+)
+@click.option(
+    "--values",
+    "values_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON file of placeholder values.",
+)
+@click.option("--out", "out_path", type=click.Path(dir_okay=False), help="Write to this file.")
+@click.option("--placeholders", is_flag=True, help="List the placeholders a template accepts.")
+def template(
+    names: tuple[str, ...],
+    list_flag: bool,
+    all_flag: bool,
+    json_flag: bool,
+    hash_flag: bool,
+    set_values: tuple[str, ...],
+    values_file: str | None,
+    out_path: str | None,
+    placeholders: bool,
+) -> None:
+    """Output one or more specification templates.
 
-    If NAME is provided, outputs the template content to stdout.
+    If a single NAME is provided, outputs the template content to stdout.
+    If several NAMEs or --all are given, outputs one JSON object mapping
+    each name to its content (or to {"content", "sha256"} with --hash).
     If no NAME is provided or --list is used, lists available templates.
 
+    Placeholders such as [DATE], [FEATURE] or {feature_short_name} are
+    filled from --set and --values; keys match case-insensitively and
+    treat spaces, dashes and underscores alike. Unset placeholders are
+    left as-is.
+
     Examples:
 
         swhat template specification
 
-        swhat template specification-checklist
+        swhat template specification specification-checklist
+
+        swhat template --all --hash
+
+        swhat template plan --set FEATURE="User auth" --set DATE=2026-01-28
+
+        swhat template plan --values values.json --out .swhat/user-auth/plan.md
+
+        swhat template plan --placeholders
 
         swhat template --list
     """
+    from swhat.template_cli import compile_template, get_template, get_templates, list_templates
+
+    names = tuple(name for name in names if name.strip())
+
     # Show list if --list flag or no name provided
-    if list_flag or name is None or name.strip() == "":
+    if list_flag or (not names and not all_flag):
         click.echo("Available templates:")
         for template_name, description in list_templates():
             click.echo(f"  {template_name:<25} {description}")
         return
 
-    # Look up template by name (case-insensitive)
-    result = get_template(name)
-    if result is None:
-        click.echo(f"Error: Template '{name}' not found.", err=True)
+    if all_flag:
+        names = tuple(template_name for template_name, _ in list_templates())
+
+    # Look up templates by name (case-insensitive)
+    missing = [name for name in names if get_template(name) is None]
+    if missing:
+        for name in missing:
+            click.echo(f"Error: Template '{name}' not found.", err=True)
         click.echo("", err=True)
         click.echo("Available templates:", err=True)
         for template_name, description in list_templates():
             click.echo(f"  {template_name:<25} {description}", err=True)
         sys.exit(1)
 
-    # Output template content to stdout
-    content, _ = result
-    click.echo(content)
+    import json
+
+    if placeholders:
+        keys = {name.lower(): compile_template(name.lower()).keys() for name in names}
+        click.echo(json.dumps(keys, indent=2))
+        return
+
+    values = _parse_values(set_values, values_file)
+    single = len(names) == 1 and not (all_flag or json_flag or hash_flag)
+
+    if out_path is not None:
+        if not single:
+            click.echo("Error: --out requires exactly one template name.", err=True)
+            sys.exit(1)
+        from pathlib import Path
+
+        from swhat.fsutil import atomic_write_text
+
+        content = get_templates(names, values=values)[names[0].lower()]
+        atomic_write_text(Path(out_path), content + "\n")
+        click.echo(f"Wrote {out_path}")
+        return
+
+    # Single template: output raw content to stdout
+    if single:
+        click.echo(get_templates(names, values=values)[names[0].lower()])
+        return
+
+    click.echo(json.dumps(get_templates(names, with_hash=hash_flag, values=values), indent=2))
+
+
+def _parse_values(set_values: tuple[str, ...], values_file: str | None) -> dict[str, str]:
+    """Merge placeholder values from a JSON file and --set KEY=VALUE pairs."""
+    import json
+
+    values: dict[str, str] = {}
+    if values_file is not None:
+        try:
+            with open(values_file, encoding="utf-8") as f:
+                loaded = json.load(f)
+        except (OSError, ValueError) as exc:
+            click.echo(f"Error: Cannot read values file '{values_file}': {exc}", err=True)
+            sys.exit(1)
+        if not isinstance(loaded, dict):
+            click.echo(f"Error: Values file '{values_file}' must contain a JSON object.", err=True)
+            sys.exit(1)
+        values.update({str(key): str(value) for key, value in loaded.items()})
+    for item in set_values:
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            click.echo(f"Error: Invalid --set '{item}', expected KEY=VALUE.", err=True)
+            sys.exit(1)
+        values[key.strip()] = value
+    return values
 
 
 @main.command()
-def init() -> None:
-    """Initialize the current directory for swhat specification workflow.
+@click.argument("paths", nargs=-1, type=click.Path(file_okay=False))
+@click.option(
+    "--from-file",
+    "from_file",
+    default=None,
+    help="Read project roots from a file, one per line ('-' for stdin).",
+)
+@click.option(
+    "--recursive", "-r", is_flag=True, help="Initialize every git root found under PATHS."
+)
+@click.option("--jobs", "-j", default=None, type=click.IntRange(min=1), help="Parallel workers.")
+@click.option("--shared", is_flag=True, help="Link files from the machine-wide shared cache.")
+@click.option(
+    "--link-mode",
+    type=click.Choice(["hardlink", "symlink"]),
+    default="hardlink",
+    show_default=True,
+    help="How --shared links files into projects.",
+)
+def init(
+    paths: tuple[str, ...],
+    from_file: str | None,
+    recursive: bool,
+    jobs: int | None,
+    shared: bool,
+    link_mode: str,
+) -> None:
+    """Initialize projects for swhat specification workflow.
 
     Creates the .swhat/ directory and installs AI agent command files
     to .claude/commands/ and .roo/commands/.
 
+    With no PATHS, initializes the current directory. With PATHS and/or
+    --from-file, initializes each listed directory concurrently and prints
+    a per-root summary. With --recursive, every git repository under the
+    given directories (or the current directory) is initialized.
+
     Examples:
 
         swhat init
 
         cd /path/to/project && swhat init
+
+        swhat init ~/src/service-a ~/src/service-b
+
+        swhat init --from-file repos.txt --jobs 16
+
+        swhat init --recursive ~/src
+
+    With --shared, each file is stored once in a per-user cache
+    (~/.cache/swhat, or $SWHAT_CACHE_DIR) and linked into projects.
+    Hard links share one inode per file version across all checkouts;
+    --link-mode symlink points projects at the cache's current version,
+    so a later `swhat init --shared` anywhere upgrades every linked
+    project at once. Falls back to a private copy if linking fails.
+
+        swhat init --shared --link-mode symlink --recursive ~/src
     """
-    success = initialize_project()
-    if not success:
+    from pathlib import Path
+
+    from swhat.init_cli import (
+        DEFAULT_JOBS,
+        find_git_roots,
+        initialize_project,
+        initialize_projects,
+        read_path_list,
+    )
+
+    roots = [Path(path) for path in paths]
+    if from_file is not None:
+        try:
+            roots.extend(read_path_list(from_file))
+        except OSError as exc:
+            click.echo(f"Error: Cannot read '{from_file}': {exc}", err=True)
+            sys.exit(1)
+
+    if recursive:
+        search = roots or [Path.cwd()]
+        roots = [root for directory in search for root in find_git_roots(directory)]
+        if not roots:
+            click.echo("Error: No git repositories found.", err=True)
+            sys.exit(1)
+
+    shared_mode = link_mode if shared else None
+    if not roots:
+        if not initialize_project(shared_mode):
+            sys.exit(1)
+        return
+
+    if not initialize_projects(roots, jobs or DEFAULT_JOBS, shared_mode):
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("description")
+@click.option("--short-name", default=None, help="Use this short name instead of deriving one.")
+@click.option("--date", "today", default=None, help="Date for the [DATE] placeholder (ISO).")
+@click.option("--numbered", is_flag=True, help="Name the directory NNN-<short-name>.")
+@click.option(
+    "--check-dupes", is_flag=True, help="Refuse to create it if an existing spec looks the same."
+)
+def new(
+    description: str, short_name: str | None, today: str | None, numbered: bool, check_dupes: bool
+) -> None:
+    """Create a feature workspace under .swhat/.
+
+    Derives a short name from DESCRIPTION (unless --short-name is given),
+    appends a 12-character random suffix, and creates
+    .swhat/<short-name>_<suffix>/ with spec.md and requirements.md
+    pre-rendered from the specification templates. Prints the feature
+    name and file paths as JSON.
+
+    Allocation is serialized through a lock in .swhat/.index/, so
+    concurrent calls from several agents never collide. With --numbered,
+    the directory is named NNN-<short-name> from a persisted counter
+    instead of carrying a random suffix.
+
+    With --check-dupes, DESCRIPTION is first compared against the title
+    and original description of every existing spec (see `swhat dupes`);
+    if one is similar, nothing is created and the command exits non-zero.
+
+    Examples:
+
+        swhat new "Add user authentication with OAuth2"
+
+        swhat new --short-name user-auth "Let users sign in with SSO"
+
+        swhat new --numbered "Export reports as CSV"
+
+        swhat new --check-dupes "Let users reset a forgotten password"
+    """
+    import json
+    from datetime import date
+
+    from swhat.new_cli import create_feature
+    from swhat.workspace import find_workspace
+
+    if today is not None:
+        try:
+            date.fromisoformat(today)
+        except ValueError:
+            raise click.BadParameter(
+                f"{today!r} is not an ISO date (YYYY-MM-DD).", param_hint="--date"
+            ) from None
+
+    if not description.strip():
+        click.echo("Error: No feature description provided.", err=True)
+        sys.exit(1)
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+
+    if check_dupes:
+        from swhat.dupes import DupesIndex
+
+        try:
+            with DupesIndex(workspace) as index:
+                index.refresh()
+                matches = index.similar_to_description(description)
+        except ValueError as exc:
+            click.echo(f"Error: Cannot check for duplicates: {exc}.", err=True)
+            sys.exit(1)
+        if matches:
+            click.echo("Error: Similar features already exist:", err=True)
+            for match in matches:
+                click.echo(
+                    f"  {match.similarity:.2f}  {match.other}  {match.other_title}", err=True
+                )
+            click.echo("Run without --check-dupes to create it anyway.", err=True)
+            sys.exit(1)
+
+    try:
+        feature = create_feature(workspace, description, short_name, today, numbered)
+    except OSError as exc:
+        click.echo(f"Error: Cannot create feature: {exc}", err=True)
+        sys.exit(1)
+
+    root = workspace.parent
+    result = {
+        "name": feature.name,
+        "short_name": feature.short_name,
+        "number": feature.number,
+        "directory": feature.directory.relative_to(root).as_posix(),
+        "spec": feature.spec.relative_to(root).as_posix(),
+        "requirements": feature.requirements.relative_to(root).as_posix(),
+        "root": str(root),
+    }
+    if feature.number is None:
+        del result["number"]
+    click.echo(json.dumps(result, indent=2))
+
+
+@main.command("list")
+@click.option("--json", "json_flag", is_flag=True, help="Output as JSON.")
+@click.option("--status", default=None, help="Only features with this status (e.g. Draft).")
+@click.option(
+    "--has",
+    "has_artifacts",
+    multiple=True,
+    type=click.Choice(ARTIFACT_NAMES),
+    help="Only features that have this artifact (repeatable).",
+)
+@click.option(
+    "--missing",
+    "missing_artifacts",
+    multiple=True,
+    type=click.Choice(ARTIFACT_NAMES),
+    help="Only features that lack this artifact (repeatable).",
+)
+@click.option(
+    "--sort",
+    "sort_key",
+    type=click.Choice(["name", "title", "status", "created", "modified"]),
+    default="name",
+    show_default=True,
+    help="Sort order.",
+)
+@click.option("--reverse", is_flag=True, help="Reverse the sort order.")
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Show at most N features.")
+def list_features(
+    json_flag: bool,
+    status: str | None,
+    has_artifacts: tuple[str, ...],
+    missing_artifacts: tuple[str, ...],
+    sort_key: str,
+    reverse: bool,
+    limit: int | None,
+) -> None:
+    """List features in the .swhat/ workspace.
+
+    Backed by an incrementally refreshed catalog in .swhat/.index/, so
+    only features whose files changed since the last call are re-read.
+
+    Examples:
+
+        swhat list
+
+        swhat list --has spec --missing plan
+
+        swhat list --status draft --sort modified --reverse --json
+    """
+    import json
+    from datetime import datetime
+
+    from swhat.catalog import ARTIFACTS, Catalog
+    from swhat.workspace import find_workspace
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+
+    with Catalog(workspace) as catalog:
+        catalog.refresh()
+        entries = catalog.entries()
+
+    if status is not None:
+        entries = [e for e in entries if e.status.lower() == status.lower()]
+    entries = [
+        e
+        for e in entries
+        if all(e.has(a) for a in has_artifacts) and not any(e.has(a) for a in missing_artifacts)
+    ]
+    sort_field = "modified_ns" if sort_key == "modified" else sort_key
+    entries.sort(key=lambda e: getattr(e, sort_field), reverse=reverse)
+    if limit is not None:
+        entries = entries[:limit]
+
+    if json_flag:
+        click.echo(json.dumps([e.to_dict() for e in entries], indent=2))
+        return
+
+    if not entries:
+        click.echo("No features found.")
+        return
+    for entry in entries:
+        modified = datetime.fromtimestamp(entry.modified_ns / 1e9).strftime("%Y-%m-%d %H:%M")
+        artifacts = ",".join(a for a in ARTIFACTS if entry.has(a)) or "-"
+        click.echo(f"{entry.name:<40} {entry.status or '-':<10} {modified}  {artifacts}")
+        if entry.title != entry.name:
+            click.echo(f"  {entry.title}")
+
+
+@main.command()
+@click.argument("feature")
+@click.option("--section", "-s", "sections", multiple=True, help="Heading to show (repeatable).")
+@click.option("--item", "-i", "items", multiple=True, help="Item ID such as FR-003 or T012.")
+@click.option("--story", "stories", multiple=True, help="User story such as US2 (repeatable).")
+@click.option(
+    "--artifact",
+    "-a",
+    "artifacts",
+    multiple=True,
+    type=click.Choice(SHOW_ARTIFACT_NAMES),
+    help="Only search this artifact (repeatable).",
+)
+@click.option("--json", "json_flag", is_flag=True, help="Output slices as JSON.")
+def show(
+    feature: str,
+    sections: tuple[str, ...],
+    items: tuple[str, ...],
+    stories: tuple[str, ...],
+    artifacts: tuple[str, ...],
+    json_flag: bool,
+) -> None:
+    """Show selected parts of a feature's artifacts.
+
+    FEATURE is a feature directory name or a unique prefix of one. Each
+    --section, --item and --story is looked up in spec.md, plan.md,
+    tasks.md and the other artifacts, in that order, and only the
+    matching slices are printed. Without selectors, prints the heading
+    outline of each artifact.
+
+    Examples:
+
+        swhat show user-auth --section "User Stories" --section "Success Criteria"
+
+        swhat show user-auth --item FR-003 --story US2
+
+        swhat show user-auth -a plan --section "Technical Context" --json
+    """
+    import json
+
+    from swhat.show_cli import outline
+    from swhat.show_cli import show as show_slices
+    from swhat.workspace import find_workspace, resolve_feature
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+    directory = resolve_feature(workspace, feature)
+    if directory is None:
+        click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+        sys.exit(1)
+
+    try:
+        if not (sections or items or stories):
+            index = outline(directory, list(artifacts) or None)
+            if json_flag:
+                click.echo(json.dumps(index, indent=2))
+                return
+            for name, headings in index.items():
+                click.echo(f"{name}:")
+                for heading in headings:
+                    indent = "  " * (heading["level"] - 1)
+                    click.echo(f"{indent}{heading['title']}  (line {heading['line']})")
+            return
+        slices, missing = show_slices(
+            directory, list(sections), list(items), list(stories), list(artifacts) or None
+        )
+    except OSError as exc:
+        click.echo(f"Error: Cannot read artifacts: {exc}", err=True)
+        sys.exit(1)
+
+    if json_flag:
+        click.echo(json.dumps([s.to_dict() for s in slices], indent=2))
+    else:
+        click.echo("\n".join(s.content.rstrip("\n") + "\n" for s in slices), nl=False)
+    for selector in missing:
+        click.echo(f"Error: No {selector} found in {directory.name}.", err=True)
+    if missing:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("features", nargs=-1)
+@click.option("--all", "all_flag", is_flag=True, help="Validate every feature in .swhat/.")
+@click.option("--update", is_flag=True, help="Tick or untick items in requirements.md.")
+@click.option(
+    "--jobs", "-j", default=None, type=click.IntRange(min=1), help="Parallel worker processes."
+)
+@click.option("--no-cache", is_flag=True, help="Re-check specs even if a cached result exists.")
+def validate(
+    features: tuple[str, ...], all_flag: bool, update: bool, jobs: int | None, no_cache: bool
+) -> None:
+    """Run the mechanical spec quality checks.
+
+    Checks each feature's spec.md against the specification quality
+    checklist: mandatory sections completed without template
+    placeholders, no [NEEDS CLARIFICATION] markers (at most 3 while
+    drafting), measurable success criteria, acceptance scenarios and
+    edge cases. Items that need judgment are reported as "manual".
+
+    Prints JSON with pass/fail per checklist item and exits non-zero if
+    any check failed. With --update, mechanical results are written back
+    to the feature's requirements.md checklist.
+
+    Results are cached in .swhat/.index/ by spec content hash and
+    checklist version, so unchanged specs are not re-checked. Remaining
+    specs are checked on a process pool (--jobs, default CPU count).
+    When several features are validated, a summary is printed to stderr.
+
+    Examples:
+
+        swhat validate user-auth
+
+        swhat validate user-auth --update
+
+        swhat validate --all --jobs 8
+    """
+    import json
+
+    from swhat.validate_cli import (
+        RESULT_CACHE_DIR,
+        find_checklist,
+        update_checklist,
+        validate_features,
+    )
+    from swhat.workspace import feature_dirs, find_workspace, index_dir, resolve_feature
+
+    if not features and not all_flag:
+        click.echo("Error: Name a feature or pass --all.", err=True)
+        sys.exit(1)
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+
+    if all_flag:
+        directories = [d for d in feature_dirs(workspace) if (d / "spec.md").is_file()]
+    else:
+        directories = []
+        for feature in features:
+            directory = resolve_feature(workspace, feature)
+            if directory is None:
+                click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+                sys.exit(1)
+            directories.append(directory)
+
+    cache_dir = None if no_cache else index_dir(workspace) / RESULT_CACHE_DIR
+    outcomes = validate_features(directories, jobs, cache_dir)
+
+    results = []
+    failures = []
+    for outcome in outcomes:
+        name = outcome.feature.name
+        if outcome.result is None:
+            click.echo(f"Error: Cannot validate {name}: {outcome.error}", err=True)
+            failures.append(f"{name}: {outcome.error}")
+            continue
+        if update:
+            checklist = find_checklist(outcome.feature)
+            try:
+                if checklist is not None:
+                    update_checklist(checklist, outcome.result)
+            except OSError as exc:
+                click.echo(f"Error: Cannot update {checklist}: {exc}", err=True)
+        for check in outcome.result.checks:
+            if check.status == "fail":
+                failures.append(f"{name}: {check.item}")
+        results.append(outcome.result.to_dict())
+
+    if len(results) == 1 and not all_flag:
+        click.echo(json.dumps(results[0], indent=2))
+    else:
+        click.echo(json.dumps(results, indent=2))
+
+    if len(outcomes) > 1 or all_flag:
+        passed = sum(1 for o in outcomes if o.result is not None and o.result.passed)
+        cached = sum(1 for o in outcomes if o.cached)
+        click.echo(
+            f"Validated {len(outcomes)} features: {passed} passed, "
+            f"{len(outcomes) - passed} failed ({cached} cached)",
+            err=True,
+        )
+        for failure in failures:
+            click.echo(f"  FAIL {failure}", err=True)
+    if failures:
+        sys.exit(1)
+
+
+def _tasks_file(feature: str):
+    """Resolve FEATURE to its tasks.md, exiting with an error if missing.
+
+    FEATURE may be a path to tasks.md, a directory containing it, or a
+    feature name (or unique prefix) in the .swhat/ workspace.
+    """
+    from pathlib import Path
+
+    from swhat.workspace import find_workspace, resolve_feature
+
+    path = Path(feature)
+    if path.is_file():
+        return path
+    if path.is_dir() and (path / "tasks.md").is_file():
+        return path / "tasks.md"
+    workspace = find_workspace()
+    directory = resolve_feature(workspace, feature) if workspace else None
+    if directory is None:
+        click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+        sys.exit(1)
+    if not (directory / "tasks.md").is_file():
+        click.echo(f"Error: {directory.name} has no tasks.md.", err=True)
+        sys.exit(1)
+    return directory / "tasks.md"
+
+
+@main.group()
+def tasks() -> None:
+    """Inspect and schedule the tasks in a feature's tasks.md."""
+
+
+@tasks.command("graph")
+@click.argument("feature")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "dot"]),
+    default="json",
+    show_default=True,
+    help="Output format.",
+)
+@click.option("--include-done", is_flag=True, help="Schedule completed tasks too.")
+def tasks_graph(feature: str, output_format: str, include_done: bool) -> None:
+    """Compute the task dependency graph and parallel waves.
+
+    Builds a DAG from phase order (user story phases run in parallel
+    after the foundational phases), [P] markers and "depends on T012"
+    notes, then prints the waves of tasks that can run concurrently, the
+    critical path and the maximum useful parallelism. Completed tasks
+    count as satisfied and are left out of the waves.
+
+    FEATURE is a feature name, a feature directory or a tasks.md path.
+
+    Examples:
+
+        swhat tasks graph user-auth
+
+        swhat tasks graph user-auth --format dot | dot -Tsvg > tasks.svg
+    """
+    import json
+
+    from swhat.artifact_parser import parse_file
+    from swhat.task_graph import build_graph, schedule, to_dict, to_dot
+
+    path = _tasks_file(feature)
+    try:
+        graph = build_graph(parse_file(path, kind="tasks"))
+        plan = schedule(graph, include_done)
+    except OSError as exc:
+        click.echo(f"Error: Cannot read {path}: {exc}", err=True)
+        sys.exit(1)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    if output_format == "dot":
+        click.echo(to_dot(graph, plan), nl=False)
+    else:
+        click.echo(json.dumps(to_dict(graph, plan), indent=2))
+    for warning in graph.warnings:
+        click.echo(f"Warning: {warning}", err=True)
+
+
+@tasks.command("conflicts")
+@click.argument("feature")
+@click.option("--demote", is_flag=True, help="Drop [P] from later tasks in same-phase conflicts.")
+@click.option("--include-done", is_flag=True, help="Check completed tasks too.")
+@click.option("--json", "json_flag", is_flag=True, help="Output as JSON.")
+def tasks_conflicts(feature: str, demote: bool, include_done: bool, json_flag: bool) -> None:
+    """Report parallel tasks that touch the same files.
+
+    Extracts file paths from task descriptions and reports tasks that
+    mention the same path (or a containing directory) but are not ordered
+    by the task graph, so they may run at the same time. With --demote,
+    the [P] marker is dropped from the later task of each same-phase
+    conflict, rewriting tasks.md in place. Exits non-zero if conflicts
+    remain.
+
+    FEATURE is a feature name, a feature directory or a tasks.md path.
+
+    Examples:
+
+        swhat tasks conflicts user-auth
+
+        swhat tasks conflicts user-auth --demote
+    """
+    import json
+
+    from swhat.artifact_parser import parse_file
+    from swhat.task_conflicts import demote as demote_tasks
+    from swhat.task_conflicts import find_conflicts, plan_demotions
+
+    path = _tasks_file(feature)
+    demoted: list[str] = []
+    try:
+        if demote:
+            demotions = plan_demotions(parse_file(path, kind="tasks"))
+            if demotions:
+                demoted = demote_tasks(path, set(demotions))
+        conflicts = find_conflicts(parse_file(path, kind="tasks"), include_done)
+    except OSError as exc:
+        click.echo(f"Error: Cannot update {path}: {exc}", err=True)
+        sys.exit(1)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    if json_flag:
+        result = {
+            "conflicts": [
+                {"path": c.path, "tasks": c.tasks, "demotable": c.demotable} for c in conflicts
+            ],
+            "demoted": demoted,
+        }
+        click.echo(json.dumps(result, indent=2))
+    else:
+        for task_id in demoted:
+            click.echo(f"Demoted {task_id}: removed [P]")
+        for conflict in conflicts:
+            hint = (
+                f" (--demote drops [P] from {', '.join(conflict.demotable)})"
+                if conflict.demotable
+                else " (add a 'depends on' note to order them)"
+            )
+            click.echo(f"{conflict.path}: {', '.join(conflict.tasks)}{hint}")
+        if not conflicts:
+            click.echo("No file conflicts between parallel tasks.")
+    if conflicts:
+        sys.exit(1)
+
+
+@tasks.command("run")
+@click.argument("feature")
+@click.option(
+    "--command",
+    "command",
+    envvar="SWHAT_AGENT_COMMAND",
+    required=True,
+    help="Command run per task, e.g. 'claude -p {prompt}' (or $SWHAT_AGENT_COMMAND).",
+)
+@click.option("--jobs", "-j", default=None, type=click.IntRange(min=1), help="Concurrent workers.")
+@click.option("--log-dir", type=click.Path(file_okay=False), help="Directory for per-task logs.")
+@click.option("--quiet", "-q", is_flag=True, help="Do not stream task output.")
+@click.option(
+    "--checkpoint-command", default=None, help="Run at each phase checkpoint; stop if it fails."
+)
+@click.option("--stop-at-checkpoint", is_flag=True, help="Stop after the first checkpoint.")
+def tasks_run(
+    feature: str,
+    command: str,
+    jobs: int | None,
+    log_dir: str | None,
+    quiet: bool,
+    checkpoint_command: str | None,
+    stop_at_checkpoint: bool,
+) -> None:
+    """Run pending tasks on parallel agent workers.
+
+    Keeps up to --jobs workers busy, launching COMMAND for every task
+    whose dependencies are complete (see `swhat tasks graph`). Arguments
+    may use {id}, {description}, {prompt}, {tasks_file} and
+    {feature_dir} ({{ and }} for literal braces); the prompt is also sent
+    on stdin. Completed tasks are ticked [x] in tasks.md, output is
+    streamed with a [Txxx] prefix and saved per task, and the dependents
+    of a failed task are skipped.
+
+    FEATURE is a feature name, a feature directory or a tasks.md path.
+
+    Examples:
+
+        swhat tasks run user-auth --command 'claude -p {prompt}' -j 3
+
+        swhat tasks run user-auth --command ./stub-agent.sh --stop-at-checkpoint
+    """
+    import os
+    from datetime import datetime
+    from pathlib import Path
+
+    from swhat.task_runner import DEFAULT_WORKERS, CommandBackend, Executor
+    from swhat.workspace import find_workspace, index_dir
+
+    path = _tasks_file(feature).resolve()
+    workspace = find_workspace(path.parent)
+    root = workspace.parent if workspace else Path.cwd()
+    if log_dir is None:
+        stamp = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        if workspace:
+            log_dir = index_dir(workspace) / "runs" / path.parent.name / stamp
+        else:
+            log_dir = path.parent / ".runs" / stamp
+
+    try:
+        backend = CommandBackend(command, cwd=root)
+    except ValueError as exc:
+        click.echo(f"Error: Invalid --command: {exc}", err=True)
+        sys.exit(1)
+    try:
+        executor = Executor(
+            path,
+            backend,
+            Path(log_dir),
+            workers=jobs or DEFAULT_WORKERS,
+            echo=click.echo,
+            stream=not quiet,
+            checkpoint_command=checkpoint_command,
+            stop_at_checkpoint=stop_at_checkpoint,
+        )
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--checkpoint-command") from None
+    try:
+        result = executor.run()
+    except KeyboardInterrupt:
+        click.echo("Interrupted; running tasks were terminated.", err=True)
+        sys.exit(130)
+    except OSError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    counts = {state: 0 for state in ("done", "failed", "skipped")}
+    for state in result.states.values():
+        counts[state] += 1
+    click.echo(
+        f"{counts['done']} done, {counts['failed']} failed, {counts['skipped']} skipped. "
+        f"Logs: {log_dir}"
+    )
+    if result.stopped_at:
+        click.echo(f"Stopped at checkpoint: {result.stopped_at}")
+    if result.failed:
+        sys.exit(1)
+
+
+@tasks.command("claim")
+@click.argument("feature")
+@click.option("--owner", default=None, help="Agent identity (default $SWHAT_AGENT_ID or host:pid).")
+@click.option("--ttl", default=None, type=click.IntRange(min=1), help="Lease duration in seconds.")
+def tasks_claim(feature: str, owner: str | None, ttl: int | None) -> None:
+    """Lease the next ready task for this agent.
+
+    Hands out the first task whose dependencies are all ticked and that
+    no other agent holds, under an exclusive lease (default 15 minutes).
+    Renew it with `swhat tasks heartbeat` and finish with `swhat tasks
+    complete`; an expired lease is handed out again. Prints compact JSON
+    with "status" set to "claimed", "waiting" (tasks remain but none is
+    ready) or "finished".
+
+    FEATURE is a feature name, a feature directory or a tasks.md path.
+
+    Examples:
+
+        swhat tasks claim user-auth
+
+        swhat tasks claim user-auth --owner agent-2 --ttl 1800
+    """
+    import json
+
+    from swhat.task_leases import DEFAULT_TTL, LeaseStore, default_owner
+
+    path = _tasks_file(feature)
+    try:
+        with LeaseStore(path) as store:
+            lease, summary = store.claim(owner or default_owner(), ttl or DEFAULT_TTL)
+    except OSError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    if lease is None:
+        status = "waiting" if summary["remaining"] else "finished"
+        click.echo(json.dumps({"status": status, **summary}, separators=(",", ":")))
+        return
+    result = {
+        "status": "claimed",
+        "task": lease.task_id,
+        "description": summary.pop("description"),
+        "phase": summary.pop("phase"),
+        "story": summary.pop("story"),
+        "lease": lease.token,
+        "expires_at": round(lease.expires_at),
+        **summary,
+    }
+    click.echo(json.dumps(result, separators=(",", ":")))
+
+
+@tasks.command("heartbeat")
+@click.argument("feature")
+@click.argument("task_id")
+@click.option("--lease", "token", required=True, help="Lease token from `swhat tasks claim`.")
+@click.option(
+    "--ttl", default=None, type=click.IntRange(min=1), help="New lease duration in seconds."
+)
+def tasks_heartbeat(feature: str, task_id: str, token: str, ttl: int | None) -> None:
+    """Renew the lease on a claimed task.
+
+    Exits non-zero if the lease was lost (expired and handed to another
+    agent); the caller should then stop working on the task.
+
+    Example:
+
+        swhat tasks heartbeat user-auth T012 --lease 3f9a1c2b7d4e5f60
+    """
+    import json
+
+    from swhat.task_leases import DEFAULT_TTL, LeaseStore
+
+    path = _tasks_file(feature)
+    try:
+        with LeaseStore(path) as store:
+            lease = store.heartbeat(task_id.upper(), token, ttl or DEFAULT_TTL)
+    except (OSError, ValueError) as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    result = {"status": "renewed", "task": lease.task_id, "expires_at": round(lease.expires_at)}
+    click.echo(json.dumps(result, separators=(",", ":")))
+
+
+@tasks.command("complete")
+@click.argument("feature")
+@click.argument("task_id")
+@click.option("--lease", "token", required=True, help="Lease token from `swhat tasks claim`.")
+@click.option("--release", is_flag=True, help="Give the task back without marking it done.")
+def tasks_complete(feature: str, task_id: str, token: str, release: bool) -> None:
+    """Finish a claimed task.
+
+    Ticks the task [x] in tasks.md and drops the lease. With --release,
+    the lease is dropped without ticking the task, so another agent can
+    claim it.
+
+    Examples:
+
+        swhat tasks complete user-auth T012 --lease 3f9a1c2b7d4e5f60
+
+        swhat tasks complete user-auth T012 --lease 3f9a1c2b7d4e5f60 --release
+    """
+    import json
+
+    from swhat.task_leases import LeaseStore
+
+    path = _tasks_file(feature)
+    task_id = task_id.upper()
+    try:
+        with LeaseStore(path) as store:
+            store.complete(task_id, token, release)
+    except (OSError, ValueError) as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+    status = "released" if release else "completed"
+    click.echo(json.dumps({"status": status, "task": task_id}, separators=(",", ":")))
+
+
+def _task_index(path):
+    """Load the task index and the IDs under live leases, exiting on errors."""
+    from swhat.task_index import load_index
+    from swhat.task_leases import LeaseStore, leases_path
+
+    try:
+        index = load_index(path)
+        claimed: set[str] = set()
+        if leases_path(path).exists():
+            with LeaseStore(path) as store:
+                claimed = set(store.active())
+    except OSError as exc:
+        click.echo(f"Error: Cannot read {path}: {exc}", err=True)
+        sys.exit(1)
+    return index, claimed
+
+
+@tasks.command("next")
+@click.argument("feature")
+@click.option("--limit", "-n", default=1, type=click.IntRange(min=1), help="Tasks to list.")
+def tasks_next(feature: str, limit: int) -> None:
+    """Print the next ready task(s) as compact JSON.
+
+    A task is ready when every task it depends on is ticked and no agent
+    holds a lease on it. Answered from the task index beside tasks.md,
+    which is refreshed without re-parsing when only checkboxes changed.
+    Unlike `swhat tasks claim`, nothing is leased.
+
+    FEATURE is a feature name, a feature directory or a tasks.md path.
+
+    Examples:
+
+        swhat tasks next user-auth
+
+        swhat tasks next user-auth -n 3
+    """
+    import json
+
+    from swhat.task_index import READY
+
+    index, claimed = _task_index(_tasks_file(feature))
+    states = index.states(claimed)
+    ready = [index.get(task_id) for task_id, state in states.items() if state == READY]
+    result = {
+        "next": [
+            {
+                "task": task.id,
+                "description": task.description,
+                "phase": index.phase_title(task),
+                "story": task.story,
+            }
+            for task in ready[:limit]
+        ],
+        "ready": len(ready),
+        "remaining": sum(not task.done for task in index.tasks),
+        "claimed": len(claimed & set(states)),
+    }
+    click.echo(json.dumps(result, separators=(",", ":")))
+
+
+@tasks.command("status")
+@click.argument("feature")
+@click.argument("task_ids", nargs=-1)
+def tasks_status(feature: str, task_ids: tuple[str, ...]) -> None:
+    """Print the state of each task as compact JSON.
+
+    States are "done", "claimed" (leased by an agent), "ready" and
+    "blocked". With TASK_IDS, only those tasks are reported, and blocked
+    tasks list the open tasks they wait on.
+
+    Examples:
+
+        swhat tasks status user-auth
+
+        swhat tasks status user-auth T012 T013
+    """
+    import json
+
+    from swhat.task_index import BLOCKED, DONE
+
+    index, claimed = _task_index(_tasks_file(feature))
+    states = index.states(claimed)
+    if not task_ids:
+        click.echo(json.dumps(states, separators=(",", ":")))
+        return
+    result = {}
+    for task_id in (task_id.upper() for task_id in task_ids):
+        task = index.get(task_id)
+        if task is None:
+            click.echo(f"Error: Unknown task '{task_id}'.", err=True)
+            sys.exit(1)
+        entry = {"state": states[task_id]}
+        if states[task_id] == BLOCKED:
+            entry["waiting_on"] = [dep for dep in task.deps if states[dep] != DONE]
+        result[task_id] = entry
+    click.echo(json.dumps(result, separators=(",", ":")))
+
+
+@tasks.command("progress")
+@click.argument("feature")
+def tasks_progress(feature: str) -> None:
+    """Print completion counts, overall and per phase, as compact JSON.
+
+    Each phase is reported as [title, done, total].
+
+    Example:
+
+        swhat tasks progress user-auth
+    """
+    import json
+
+    from swhat.task_index import BLOCKED, CLAIMED, DONE, READY
+
+    index, claimed = _task_index(_tasks_file(feature))
+    states = list(index.states(claimed).values())
+    total = len(states)
+    done = states.count(DONE)
+    phases: dict[int | None, list[int]] = {}
+    for task in index.tasks:
+        counts = phases.setdefault(task.phase, [0, 0])
+        counts[0] += task.done
+        counts[1] += 1
+    result = {
+        "done": done,
+        "total": total,
+        "percent": round(100 * done / total) if total else 100,
+        "ready": states.count(READY),
+        "claimed": states.count(CLAIMED),
+        "blocked": states.count(BLOCKED),
+        "phases": [
+            [index.phases[phase] if phase is not None else None, *counts]
+            for phase, counts in phases.items()
+        ],
+    }
+    click.echo(json.dumps(result, separators=(",", ":")))
+
+
+@main.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option("--limit", "-n", default=10, show_default=True, type=click.IntRange(min=1))
+@click.option("--feature", default=None, help="Only features whose name starts with this.")
+@click.option("--artifact", "-a", default=None, help="Only this artifact (e.g. spec, plan).")
+@click.option("--json", "json_flag", is_flag=True, help="Output as JSON.")
+@click.option("--no-refresh", is_flag=True, help="Query the index without checking for changes.")
+def search(
+    query: tuple[str, ...],
+    limit: int,
+    feature: str | None,
+    artifact: str | None,
+    json_flag: bool,
+    no_refresh: bool,
+) -> None:
+    """Search every artifact in the .swhat/ workspace.
+
+    Ranks matching sections with BM25, weighted by the kind of section:
+    a match in Functional Requirements or a user story ranks above the
+    same match in Assumptions. Sections that contain more of the query's
+    words rank first. Backed by an inverted index in .swhat/.index/ that
+    re-reads only files changed since the last call.
+
+    Examples:
+
+        swhat search password reset
+
+        swhat search "rate limiting" --artifact spec -n 5
+
+        swhat search oauth --feature user-auth --json
+    """
+    import json
+
+    from swhat.search_index import SearchIndex
+    from swhat.workspace import find_workspace
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+
+    with SearchIndex(workspace) as index:
+        if not no_refresh:
+            index.refresh()
+        hits = index.search(" ".join(query), limit, feature, artifact)
+
+    if json_flag:
+        click.echo(json.dumps([hit.to_dict() for hit in hits], indent=2))
+        return
+    if not hits:
+        click.echo("No matches.")
+        return
+    for hit in hits:
+        section = hit.section or "(preamble)"
+        click.echo(f"{hit.score:7.2f}  {hit.path}:{hit.line}  {section}")
+        if hit.snippet:
+            click.echo(f"         {hit.snippet}")
+
+
+@main.command()
+@click.argument("feature", required=False)
+@click.option(
+    "--threshold",
+    default=0.5,
+    show_default=True,
+    type=click.FloatRange(0.0, 1.0),
+    help="Minimum estimated similarity to report.",
+)
+@click.option("--json", "json_flag", is_flag=True, help="Output as JSON.")
+def dupes(feature: str | None, threshold: float, json_flag: bool) -> None:
+    """Find specs that describe the same feature.
+
+    Compares MinHash signatures of each spec's user stories and
+    functional requirements through an LSH index in .swhat/.index/, so
+    only specs sharing a bucket are compared; thresholds below about 0.22
+    compare every pair instead, which is slower on large workspaces.
+    Reports pairs whose
+    estimated similarity is at least --threshold; with FEATURE, only that
+    feature's near-duplicates. Exits non-zero if any are found.
+
+    Examples:
+
+        swhat dupes
+
+        swhat dupes user-auth --threshold 0.4 --json
+    """
+    import json
+
+    from swhat.dupes import DupesIndex
+    from swhat.workspace import find_workspace, resolve_feature
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+    directory = None
+    if feature is not None:
+        directory = resolve_feature(workspace, feature)
+        if directory is None:
+            click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+            sys.exit(1)
+
+    try:
+        with DupesIndex(workspace) as index:
+            index.refresh()
+            if directory is not None:
+                found = index.similar_to(directory.name, threshold)
+            else:
+                found = index.all_pairs(threshold)
+                skipped = index.unsigned()
+                if skipped:
+                    click.echo(
+                        f"Skipped {len(skipped)} spec(s) with too little written content: "
+                        + ", ".join(skipped),
+                        err=True,
+                    )
+    except ValueError as exc:
+        click.echo(f"Error: Cannot check for duplicates: {exc}.", err=True)
+        sys.exit(1)
+
+    if json_flag:
+        click.echo(json.dumps([d.to_dict() for d in found], indent=2))
+    elif not found:
+        click.echo("No duplicates found.")
+    else:
+        for duplicate in found:
+            click.echo(f"{duplicate.similarity:.2f}  {duplicate.feature}  {duplicate.other}")
+            click.echo(f"      {duplicate.title}  |  {duplicate.other_title}")
+    if found:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("feature")
+@click.option("-k", "k", default=5, show_default=True, type=click.IntRange(min=1), help="Results.")
+@click.option(
+    "--artifact",
+    "-a",
+    "artifacts",
+    multiple=True,
+    type=click.Choice(["spec", "plan", "research"]),
+    help="Only return this artifact (repeatable).",
+)
+@click.option("--json", "json_flag", is_flag=True, help="Output as JSON.")
+def related(feature: str, k: int, artifacts: tuple[str, ...], json_flag: bool) -> None:
+    """Find other features' artifacts related to a feature.
+
+    Ranks the spec, plan and research documents of every other feature by
+    TF-IDF cosine similarity to FEATURE's own artifacts, so planning can
+    start from research that earlier features already did. The term
+    matrix is kept in .swhat/.index/ and only changed documents are
+    re-read. Uses NumPy/SciPy when installed (pip install 'swhat[fast]').
+
+    Examples:
+
+        swhat related user-auth
+
+        swhat related user-auth -k 3 --artifact research --json
+    """
+    import json
+
+    from swhat.related import RelatedIndex
+    from swhat.workspace import find_workspace, resolve_feature
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+    directory = resolve_feature(workspace, feature)
+    if directory is None:
+        click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+        sys.exit(1)
+
+    with RelatedIndex(workspace) as index:
+        index.refresh()
+        results = index.related(directory.name, k, artifacts)
+
+    if json_flag:
+        click.echo(json.dumps([r.to_dict() for r in results], indent=2))
+        return
+    if not results:
+        click.echo("No related artifacts found.")
+        return
+    for result in results:
+        click.echo(f"{result.score:.3f}  .swhat/{result.path}")
+
+
+@main.command()
+@click.argument("feature")
+@click.option(
+    "--budget",
+    default=4000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum estimated tokens.",
+)
+@click.option("--json", "json_flag", is_flag=True, help="Output blocks and omissions as JSON.")
+def context(feature: str, budget: int, json_flag: bool) -> None:
+    """Print a token-budgeted context bundle for a feature.
+
+    Collects the most important parts of the feature's artifacts first
+    (title and description, plan summary, P1 stories, functional
+    requirements, technical context, open tasks), then lower-priority
+    sections, until the estimated token budget is spent. The block that
+    crosses the budget is truncated and the rest are dropped; omitted
+    blocks are listed on stderr. The output depends only on the
+    artifacts, so it can be cached and reused across sessions.
+
+    Examples:
+
+        swhat context user-auth
+
+        swhat context user-auth --budget 1500 > handoff.md
+    """
+    import json
+
+    from swhat.context_cli import build_bundle
+    from swhat.workspace import find_workspace, resolve_feature
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+    directory = resolve_feature(workspace, feature)
+    if directory is None:
+        click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+        sys.exit(1)
+
+    try:
+        bundle = build_bundle(directory, budget)
+    except OSError as exc:
+        click.echo(f"Error: Cannot read artifacts: {exc}", err=True)
+        sys.exit(1)
+
+    if json_flag:
+        click.echo(json.dumps(bundle.to_dict(), indent=2))
+        return
+    click.echo(bundle.render(), nl=False)
+    click.echo(
+        f"context: ~{bundle.tokens}/{budget} tokens, {len(bundle.blocks)} blocks, "
+        f"{len(bundle.omitted)} omitted",
+        err=True,
+    )
+    for omitted in bundle.omitted:
+        click.echo(f"  omitted {omitted}", err=True)
+
+
+@main.command()
+@click.argument("feature")
+@click.option("--json", "json_flag", is_flag=True, help="Output the prompt and cache key as JSON.")
+def handoff(feature: str, json_flag: bool) -> None:
+    """Print the hand-off prompt for an implementation agent.
+
+    Builds the continuation prompt used by the specify, plan and feature
+    workflows from the parsed spec.md: feature name and description, user
+    stories by priority, functional requirements, success criteria, open
+    clarifications and the paths of the feature's artifacts. The prompt
+    is cached in .swhat/.index/ by spec.md's content hash, so it is
+    rendered once per spec version and is identical on every call.
+
+    Examples:
+
+        swhat handoff user-auth
+
+        swhat handoff user-auth --json
+    """
+    import json
+
+    from swhat.handoff_cli import handoff as build_handoff
+    from swhat.workspace import find_workspace, resolve_feature
+
+    workspace = find_workspace()
+    if workspace is None:
+        click.echo("Error: No .swhat/ workspace found. Run `swhat init` first.", err=True)
+        sys.exit(1)
+    directory = resolve_feature(workspace, feature)
+    if directory is None:
+        click.echo(f"Error: Unknown or ambiguous feature '{feature}'.", err=True)
+        sys.exit(1)
+
+    try:
+        result = build_handoff(directory, workspace)
+    except OSError as exc:
+        click.echo(f"Error: Cannot read {directory.name}/spec.md: {exc}", err=True)
+        sys.exit(1)
+
+    if json_flag:
+        click.echo(json.dumps(result.to_dict(), indent=2))
+    else:
+        click.echo(result.prompt, nl=False)
+
+
+@main.command()
+@click.option("--socket", "socket_path", default=None, help="Unix socket path to listen on.")
+@click.option("--detach", is_flag=True, help="Run the daemon in the background.")
+@click.option("--status", "status_flag", is_flag=True, help="Report whether a daemon is running.")
+@click.option("--stop", "stop_flag", is_flag=True, help="Stop a running daemon.")
+def serve(socket_path: str | None, detach: bool, status_flag: bool, stop_flag: bool) -> None:
+    """Keep templates resident behind a local socket.
+
+    While the daemon is running, `swhat template ...` calls are answered
+    by it instead of paying interpreter startup on every invocation. When
+    no daemon is listening, swhat falls back to running in-process.
+    Set SWHAT_NO_DAEMON=1 to bypass a running daemon.
+
+    Examples:
+
+        swhat serve
+
+        swhat serve --detach
+
+        swhat serve --status
+
+        swhat serve --stop
+    """
+    from swhat import serve_cli
+
+    path = socket_path or serve_cli.socket_path()
+
+    if status_flag:
+        version = serve_cli.ping(path)
+        if version is None:
+            click.echo(f"swhat serve is not running ({path})")
+            sys.exit(1)
+        click.echo(f"swhat serve {version} is running ({path})")
+        return
+
+    if stop_flag:
+        if not serve_cli.stop(path):
+            click.echo(f"swhat serve is not running ({path})", err=True)
+            sys.exit(1)
+        click.echo("swhat serve stopped")
+        return
+
+    if detach:
+        if not serve_cli.serve_detached(path):
+            click.echo(f"Error: swhat serve did not start on {path}", err=True)
+            sys.exit(1)
+        click.echo(f"swhat serve running on {path}")
+        return
+
+    if not serve_cli.serve(path, echo=click.echo):
         sys.exit(1)
 
 
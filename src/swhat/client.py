@@ -0,0 +1,26 @@
+"""Console entry point for swhat.
+
+Tries the `swhat serve` daemon first for commands it can answer, and
+falls back to the in-process click application otherwise. This module
+must stay free of heavy imports: its whole purpose is to return before
+click and the template content are loaded.
+"""
+
+import sys
+
+
+def main() -> None:
+    """Run swhat, forwarding to the daemon when one is listening."""
+    from swhat.serve_cli import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from swhat.cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
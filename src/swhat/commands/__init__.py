@@ -1,21 +1,44 @@
-"""Command and skill content for swhat init."""
-
-from swhat.commands.claude_specify_command import CLAUDE_SPECIFY_COMMAND
-from swhat.commands.roo_specify_command import ROO_SPECIFY_COMMAND
-from swhat.commands.claude_plan_command import CLAUDE_PLAN_COMMAND
-from swhat.commands.roo_plan_command import ROO_PLAN_COMMAND
-from swhat.commands.claude_tasks_command import CLAUDE_TASKS_COMMAND
-from swhat.commands.roo_tasks_command import ROO_TASKS_COMMAND
-from swhat.commands.claude_feature_skill import CLAUDE_FEATURE_SKILL
-from swhat.commands.roo_feature_skill import ROO_FEATURE_SKILL
-
-__all__ = [
-    "CLAUDE_SPECIFY_COMMAND",
-    "ROO_SPECIFY_COMMAND",
-    "CLAUDE_PLAN_COMMAND",
-    "ROO_PLAN_COMMAND",
-    "CLAUDE_TASKS_COMMAND",
-    "ROO_TASKS_COMMAND",
-    "CLAUDE_FEATURE_SKILL",
-    "ROO_FEATURE_SKILL",
-]
+"""Command and skill content for swhat init.
+
+Content constants are loaded lazily: each one lives in its own module and
+is only imported on first access, so only commands that actually install
+agent files pay for the prompt strings.
+"""
+
+import importlib
+
+# Content name -> module that defines it
+COMMAND_MODULES: dict[str, str] = {
+    "CLAUDE_SPECIFY_COMMAND": "swhat.commands.claude_specify_command",
+    "ROO_SPECIFY_COMMAND": "swhat.commands.roo_specify_command",
+    "CLAUDE_PLAN_COMMAND": "swhat.commands.claude_plan_command",
+    "ROO_PLAN_COMMAND": "swhat.commands.roo_plan_command",
+    "CLAUDE_TASKS_COMMAND": "swhat.commands.claude_tasks_command",
+    "ROO_TASKS_COMMAND": "swhat.commands.roo_tasks_command",
+    "CLAUDE_FEATURE_SKILL": "swhat.commands.claude_feature_skill",
+    "ROO_FEATURE_SKILL": "swhat.commands.roo_feature_skill",
+}
+
+__all__ = list(COMMAND_MODULES)
+
+
+def load_command_content(name: str) -> str:
+    """Import and return a command or skill content constant by name.
+
+    Args:
+        name: Constant name, e.g. "CLAUDE_SPECIFY_COMMAND".
+
+    Returns:
+        The command or skill content.
+
+    Raises:
+        KeyError: If the name is not a registered content constant.
+    """
+    module = importlib.import_module(COMMAND_MODULES[name])
+    return getattr(module, name)
+
+
+def __getattr__(name: str) -> str:
+    if name in COMMAND_MODULES:
+        return load_command_content(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
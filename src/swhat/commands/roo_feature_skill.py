@@ -36,21 +36,21 @@ Before proceeding, ask the user:
 
 ---
 
-## Step 1: Generate Feature Short Name
+## Step 1: Create Feature Workspace
 
-Create a concise short name (2-4 words) for the feature:
+Run this command with the user's feature description:
 
-- Analyze the feature description and extract the most meaningful keywords
-- Use action-noun format when possible (e.g., "add-user-auth", "fix-payment-bug")
-- Preserve technical terms and acronyms (OAuth2, API, JWT, etc.)
-- Keep it concise but descriptive enough to understand the feature at a glance
-- **Append 12 random alphanumeric characters** to the short name, separated by an underscore
-- Generate the random characters using lowercase letters and digits (a-z, 0-9)
+```bash
+swhat new "<feature description>"
+```
+
+It creates `.swhat/{FEATURE_SHORT_NAME}/` with `spec.md` and `requirements.md` pre-rendered from the templates, and prints JSON with `name` (the `{FEATURE_SHORT_NAME}`), `spec` and `requirements` paths.
+
+To choose the name yourself, pass a concise 2-4 word action-noun short name (preserve technical terms and acronyms such as OAuth2, API, JWT); swhat appends the 12-character random suffix:
 
-**Examples**:
-- "I want to add user authentication" -> "user-auth_a3b7x9k2m4n1"
-- "Implement OAuth2 integration for the API" -> "oauth2-api-integration_p8q2w5e1r7t3"
-- "Create a dashboard for analytics" -> "analytics-dashboard_j6h4f2d9s1l8"
+```bash
+swhat new --short-name "add-user-auth" "<feature description>"
+```
 
 ---
 
@@ -75,15 +75,9 @@ Parse the user's feature description and extract key concepts:
 
 ---
 
-## Step 3: Retrieve and Fill Specification Template
+## Step 3: Fill Specification Template
 
-Run this command to get the template:
-
-```bash
-swhat template specification
-```
-
-Write the specification to `.swhat/{FEATURE_SHORT_NAME}/spec.md` using the template structure.
+Open the `spec.md` created in Step 1 and write the specification to `.swhat/{FEATURE_SHORT_NAME}/spec.md` using the template structure.
 
 ### Execution Flow
 
@@ -107,17 +101,19 @@ Write the specification to `.swhat/{FEATURE_SHORT_NAME}/spec.md` using the templ
 
 ## Step 4: Validate Specification Quality
 
-Run this command to get the checklist:
+Use the checklist that Step 1 wrote to `.swhat/{FEATURE_SHORT_NAME}/requirements.md` and validate:
+
+### Validation Check
+
+Run the mechanical checks first; `--update` ticks the items they decide in the checklist file:
 
 ```bash
-swhat template specification-checklist
+swhat validate {FEATURE_SHORT_NAME} --update
 ```
 
-Write the checklist to `.swhat/{FEATURE_SHORT_NAME}/requirements.md` and validate:
-
-### Validation Check
+The JSON output reports `pass`, `fail` or `manual` per checklist item, with `details` for failures. Fix each `fail` and re-run the command until none remain; these re-runs do not count as validation iterations.
 
-For each checklist item:
+Then, for each `manual` checklist item:
 - Determine if it passes or fails
 - Document specific issues found (quote relevant spec sections)
 
@@ -199,7 +195,12 @@ After outputting the spec, present the user with next step options:
 
 **If Option 3 (Attempt to implement)**:
 1. Create a new task/agent to handle implementation
-2. Provide the agent with this context:
+2. Generate the agent's context from the saved artifacts:
+   ```bash
+   swhat handoff {FEATURE_SHORT_NAME}
+   ```
+   Pass its output to the agent verbatim. It is built from spec.md (feature name, user stories, requirements, success criteria, artifact paths) and is identical for every hand-off of the same spec, so do not summarize the spec yourself.
+   If `swhat handoff` is unavailable or reports an error, provide the agent with this context instead:
 
 ```
 You are implementing a feature based on the following specification.
@@ -108,7 +108,12 @@ If the user input contains "headless" or "--headless", operate in **headless mod
 
    - **If Option 3 (Attempt to implement)**:
      1. Create a new task/agent to handle implementation
-     2. Provide the agent with this context:
+     2. Generate the agent's context from the saved artifacts (the directory under `.swhat/` that holds spec.md):
+        ```bash
+        swhat handoff <feature-directory-name>
+        ```
+        Pass its output to the agent verbatim. It is built from spec.md (feature name, user stories, requirements, success criteria, artifact paths) and is identical for every hand-off of the same spec, so do not summarize the spec yourself.
+        If `swhat handoff` is unavailable or reports an error, provide the agent with this context instead:
 
         ```
         You are implementing a feature based on the following specification.
@@ -21,21 +21,16 @@ The text the user typed after `/swhat-specify` in the triggering message **is**
 
 Given that feature description, do this:
 
-1. **Generate a concise short name** (2-4 words) for the feature directory:
-   - Analyze the feature description and extract the most meaningful keywords
-   - Create a 2-4 word short name that captures the essence of the feature
-   - Use action-noun format when possible (e.g., "add-user-auth", "fix-payment-bug")
-   - Preserve technical terms and acronyms (OAuth2, API, JWT, etc.)
-   - Keep it concise but descriptive enough to understand the feature at a glance
-   - **Append 12 random alphanumeric characters** to the short name, separated by an underscore
-   - Generate the random characters using lowercase letters and digits (a-z, 0-9)
+1. **Create the feature workspace** by running `swhat new "<feature description>"`:
+   - This derives a short name from the description, appends 12 random lowercase alphanumeric characters, creates `.swhat/{FEATURE_SHORT_NAME}/`, and pre-renders `spec.md` (specification template) and `requirements.md` (spec quality checklist)
+   - It prints JSON with `name` (use this as `{FEATURE_SHORT_NAME}`), `spec` and `requirements` paths
+   - To choose the name yourself, pass a concise 2-4 word action-noun short name, preserving technical terms and acronyms:
+     `swhat new --short-name "add-user-auth" "<feature description>"`
    - Examples:
      - "I want to add user authentication" -> "user-auth_a3b7x9k2m4n1"
      - "Implement OAuth2 integration for the API" -> "oauth2-api-integration_p8q2w5e1r7t3"
-     - "Create a dashboard for analytics" -> "analytics-dashboard_j6h4f2d9s1l8"
-     - "Fix payment processing timeout bug" -> "fix-payment-timeout_c5v3b7n9m2k4"
 
-2. Retrieve the specification template by running `swhat template specification` to understand required sections.
+2. Read the pre-rendered `spec.md` to understand the required sections.
 
 3. Follow this execution flow:
 
@@ -67,9 +62,14 @@ Given that feature description, do this:
 
 5. **Specification Quality Validation**: After writing the initial spec, validate it against quality criteria:
 
-   a. **Create Spec Quality Checklist**: Retrieve the checklist template by running `swhat template specification-checklist` and write it to `.swhat/{FEATURE_SHORT_NAME}/requirements.md`, replacing placeholders with feature-specific values.
+   a. **Complete Spec Quality Checklist**: `swhat new` already wrote the checklist to `.swhat/{FEATURE_SHORT_NAME}/requirements.md`; replace any remaining placeholders with feature-specific values.
 
-   b. **Run Validation Check**: Review the spec against each checklist item:
+   b. **Run Validation Check**: Run the mechanical checks first; `--update` ticks the items they decide in the checklist file:
+      ```bash
+      swhat validate {FEATURE_SHORT_NAME} --update
+      ```
+      The JSON output reports `pass`, `fail` or `manual` per checklist item, with `details` for failures. Fix each `fail` and re-run the command until none remain; these re-runs do not count as validation iterations.
+      Then review the spec against each `manual` item:
       - For each item, determine if it passes or fails
       - Document specific issues found (quote relevant spec sections)
 
@@ -147,7 +147,12 @@ Given that feature description, do this:
 
      - **If Option 3 (Attempt to implement)**:
        1. Create a new task/agent to handle implementation
-       2. Provide the agent with this context:
+       2. Generate the agent's context from the saved artifacts:
+          ```bash
+          swhat handoff {FEATURE_SHORT_NAME}
+          ```
+          Pass its output to the agent verbatim. It is built from spec.md (feature name, user stories, requirements, success criteria, artifact paths) and is identical for every hand-off of the same spec, so do not summarize the spec yourself.
+          If `swhat handoff` is unavailable or reports an error, provide the agent with this context instead:
           ```
           You are implementing a feature based on the following specification.
 
@@ -65,8 +65,15 @@ If the user input contains "headless" or "--headless", operate in **headless mod
    c. Write the template content to `tasks.md` as the starting point
 
 2. **Load context**: Read the available design artifacts:
-   a. Read `plan.md` (tech stack, libraries, project structure)
-   b. Read `spec.md` (user stories with priorities P1, P2, P3, etc.)
+   a. Read the tech stack, libraries and project structure from `plan.md`. If the feature lives under `.swhat/`, read only those sections:
+      ```bash
+      swhat show <feature-directory-name> -a plan --section "Technical Context" --section "Project Structure"
+      ```
+   b. Read the user stories with priorities P1, P2, P3, etc. from `spec.md`. Under `.swhat/`, read only that section:
+      ```bash
+      swhat show <feature-directory-name> -a spec --section "User Scenarios & Testing"
+      ```
+      If `swhat show` is unavailable or reports an error, read `plan.md` and `spec.md` in full instead.
    c. Note: Generate tasks based on what's available
 
 3. **Execute task generation workflow**:
@@ -89,6 +96,11 @@ If the user input contains "headless" or "--headless", operate in **headless mod
    - Dependencies section showing story completion order
    - Parallel execution examples per story
    - Implementation strategy section (MVP first, incremental delivery)
+   - After writing tasks.md, check that `[P]` tasks do not touch the same files and fix same-phase conflicts:
+     ```bash
+     swhat tasks conflicts <feature-directory-name> --demote
+     ```
+     For remaining conflicts between user story phases, add a "depends on Txxx" note to the later task and re-run the check.
 
 5. **Report**: Output the generated tasks.md and summary:
    - **CRITICAL: Output the ENTIRE contents of tasks.md verbatim** - do not summarize or paraphrase
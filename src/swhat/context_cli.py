@@ -0,0 +1,264 @@
+"""Token-budgeted context bundles for handing a feature to a new session.
+
+This module handles the `swhat context` command. Instead of pasting
+spec.md and plan.md wholesale, it assembles the parts of a feature's
+artifacts that matter most, in a fixed priority order, until a token
+budget is spent:
+
+1. the feature title and original description, and the plan summary
+2. P1 user stories, functional requirements, technical context and the
+   open tasks
+3. the remaining user stories, by priority
+4. success criteria, key entities, edge cases, project structure,
+   research and data model
+5. assumptions
+
+The block that crosses the budget is cut at a line boundary and the rest
+are dropped. Blocks are emitted in priority order and the output depends
+only on the artifacts, so a larger budget yields the same bytes followed
+by more, which keeps prompt caches warm.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.artifact_parser import Document, parse_file
+from swhat.show_cli import artifact_paths
+
+# Default token budget
+DEFAULT_BUDGET = 4000
+
+# Smallest remainder worth filling with a truncated block
+MIN_TRUNCATED_TOKENS = 48
+
+_TRUNCATED = "[... truncated]"
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+@dataclass
+class Block:
+    """One part of a feature's artifacts."""
+
+    source: str
+    title: str
+    line: int
+    text: str
+    tokens: int
+    truncated: bool = False
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+@dataclass
+class Bundle:
+    """A context bundle and what was left out of it."""
+
+    feature: str
+    budget: int
+    blocks: list[Block]
+    # "source: title" of the blocks that did not fit
+    omitted: list[str]
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the rendered bundle."""
+        return estimate_tokens(self.render())
+
+    def render(self) -> str:
+        """Return the bundle as Markdown, one block after another."""
+        return "\n\n".join(_render_block(block) for block in self.blocks) + "\n"
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "feature": self.feature,
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "blocks": [block.to_dict() for block in self.blocks],
+            "omitted": self.omitted,
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text, without a tokenizer.
+
+    Letter runs count one token per 6 characters, digit runs one per 3,
+    and every other non-space character one token, which tracks BPE
+    tokenizers closely enough for budgeting English and Markdown.
+    """
+    tokens = 0
+    for piece in _PIECE.findall(text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def _render_block(block: Block) -> str:
+    return f"<!-- {block.source}:{block.line} -->\n{block.text}"
+
+
+def _clean(text: str) -> str:
+    text = _COMMENT.sub("", text)
+    text = "\n".join(line.rstrip() for line in text.splitlines())
+    return _BLANK_RUNS.sub("\n\n", text).strip()
+
+
+def _section_block(path: Path, data: bytes, doc: Document, title: str) -> Block | None:
+    matches = doc.find_sections(title)
+    if not matches:
+        return None
+    section = matches[0]
+    text = _clean(data[section.start : section.end].decode("utf-8", errors="replace"))
+    if text.count("\n") < 1:
+        return None  # Heading only
+    return Block(path.name, section.title, section.line, text, 0)
+
+
+def _header_block(path: Path, doc: Document) -> Block | None:
+    heading = next((s for s in doc.sections if s.level == 1), None)
+    if heading is None:
+        return None
+    lines = [f"# {heading.title}"]
+    for key in ("Status", "Input"):
+        if doc.fields.get(key):
+            lines.append(f"**{key}**: {doc.fields[key]}")
+    return Block(path.name, heading.title, heading.line, "\n".join(lines), 0)
+
+
+def _story_blocks(path: Path, data: bytes, doc: Document) -> tuple[list[Block], list[Block]]:
+    """Return (P1 story blocks, other story blocks by priority)."""
+    stories = sorted(doc.stories, key=lambda s: (s.priority, s.number))
+    first, rest = [], []
+    for story in stories:
+        section = doc.sections[story.section]
+        text = _clean(data[section.start : section.end].decode("utf-8", errors="replace"))
+        block = Block(path.name, section.title, section.line, text, 0)
+        (first if story.priority == "P1" else rest).append(block)
+    return first, rest
+
+
+def _open_tasks_block(path: Path, data: bytes, doc: Document) -> Block | None:
+    lines = []
+    phase = None
+    for task in doc.tasks:
+        if task.done:
+            continue
+        if task.phase != phase:
+            phase = task.phase
+            if phase is not None:
+                lines.append(f"## {doc.phases[phase].title}")
+        end = data.find(b"\n", task.start)
+        line = data[task.start : end if end >= 0 else len(data)].decode("utf-8", errors="replace")
+        lines.append(line.rstrip())
+    if not lines:
+        return None
+    first = next(task.line for task in doc.tasks if not task.done)
+    return Block(path.name, "Open tasks", first, "\n".join(lines), 0)
+
+
+def _whole_file_block(path: Path, data: bytes, doc: Document) -> Block | None:
+    text = _clean(data.decode("utf-8", errors="replace"))
+    if not text:
+        return None
+    heading = next((s for s in doc.sections if s.level == 1), None)
+    return Block(path.name, heading.title if heading else path.stem, 1, text, 0)
+
+
+def candidate_blocks(feature: Path) -> list[Block]:
+    """Return every block of a feature's artifacts, highest priority first.
+
+    Raises:
+        OSError: If an artifact cannot be read.
+    """
+    docs: dict[str, tuple[Path, bytes, Document]] = {}
+    for name, path in artifact_paths(feature).items():
+        docs[name] = (path, path.read_bytes(), parse_file(path, kind=name))
+
+    def section(name: str, title: str) -> Block | None:
+        return _section_block(*docs[name], title) if name in docs else None
+
+    def whole(name: str) -> Block | None:
+        return _whole_file_block(*docs[name]) if name in docs else None
+
+    first_stories, other_stories = _story_blocks(*docs["spec"]) if "spec" in docs else ([], [])
+    header = _header_block(docs["spec"][0], docs["spec"][2]) if "spec" in docs else None
+    tasks = _open_tasks_block(*docs["tasks"]) if "tasks" in docs else None
+    ordered = [
+        header,
+        section("plan", "Summary"),
+        *first_stories,
+        section("spec", "Functional Requirements"),
+        section("plan", "Technical Context"),
+        tasks,
+        *other_stories,
+        section("spec", "Success Criteria"),
+        section("spec", "Key Entities"),
+        section("spec", "Edge Cases"),
+        section("plan", "Project Structure"),
+        whole("research"),
+        whole("data-model"),
+        section("spec", "Assumptions"),
+    ]
+    blocks = [block for block in ordered if block is not None]
+    for block in blocks:
+        block.tokens = estimate_tokens(_render_block(block))
+    return blocks
+
+
+def _truncate(block: Block, budget: int) -> Block | None:
+    """Cut a block at a line boundary so it fits the budget, if anything useful fits."""
+    header = estimate_tokens(_render_block(Block(block.source, "", block.line, "", 0)))
+    available = budget - header - estimate_tokens(_TRUNCATED)
+    kept: list[str] = []
+    used = 0
+    for line in block.text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > available:
+            break
+        kept.append(line)
+        used += cost
+    if len(kept) < 2:
+        return None
+    text = "\n".join(kept) + "\n" + _TRUNCATED
+    truncated = Block(block.source, block.title, block.line, text, 0, truncated=True)
+    truncated.tokens = estimate_tokens(_render_block(truncated))
+    return truncated
+
+
+def build_bundle(feature: Path, budget: int = DEFAULT_BUDGET) -> Bundle:
+    """Fill a token budget with a feature's blocks in priority order.
+
+    Raises:
+        OSError: If an artifact cannot be read.
+    """
+    bundle = Bundle(feature.name, budget, [], [])
+    remaining = budget
+    cut = False
+    for block in candidate_blocks(feature):
+        # Blocks are joined by a blank line, which costs about one token.
+        separator = 1 if bundle.blocks else 0
+        if not cut and block.tokens + separator <= remaining:
+            bundle.blocks.append(block)
+            remaining -= block.tokens + separator
+            continue
+        if not cut:
+            # Everything after the first block that does not fit is dropped,
+            # so the output stays a prefix of any larger-budget bundle.
+            cut = True
+            if remaining - separator >= MIN_TRUNCATED_TOKENS:
+                truncated = _truncate(block, remaining - separator)
+                if truncated is not None:
+                    bundle.blocks.append(truncated)
+                    remaining -= truncated.tokens + separator
+                    continue
+        bundle.omitted.append(f"{block.source}: {block.title}")
+    return bundle
@@ -0,0 +1,396 @@
+"""Near-duplicate spec detection for swhat.
+
+This module handles `swhat dupes` and the duplicate check in `swhat new`.
+Each spec gets two MinHash signatures:
+
+- content: word pairs from its user stories and functional requirements,
+  used to find specs that describe the same feature
+- intent: words from its title and the original user description, used
+  to compare a new description against existing specs before one is
+  created
+
+Signatures are split into bands and stored in an LSH table in
+`.swhat/.index/dupes.sqlite`. Specs that share a band bucket are
+candidates; only candidates are compared, so a lookup touches a handful
+of specs instead of the whole workspace. Thresholds too low for the band
+table to find reliably are answered by comparing every stored signature
+instead. Signatures are refreshed
+incrementally by spec.md mtime and size.
+
+Content shingles that also occur in the spec and checklist templates
+(section scaffolding, "Why this priority", Given/When/Then) are dropped,
+so specs are compared only on what their authors wrote.
+"""
+
+import functools
+import hashlib
+import operator
+import re
+import sqlite3
+import struct
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.artifact_parser import parse_bytes
+from swhat.search_index import tokenize
+from swhat.templates import load_template_content
+from swhat.workspace import feature_dirs, index_dir
+
+# Dupes database file inside the workspace index directory
+DUPES_FILE = "dupes.sqlite"
+
+# Bump when the schema, shingling or hashing changes; forces a rebuild
+DUPES_VERSION = 3
+
+# Signature length and LSH banding (BANDS * ROWS == NUM_PERM). The
+# s-curve midpoint (1 / BANDS) ** (1 / ROWS) is ~= 0.125, so pairs at the
+# default threshold share a bucket with near certainty.
+NUM_PERM = 128
+BANDS = 64
+ROWS = 2
+
+# Below the threshold where the band table finds a matching pair with at
+# least this probability (~= 0.22), every stored signature is compared
+MIN_RECALL = 0.95
+
+# Default estimated Jaccard similarity reported as a duplicate
+DEFAULT_THRESHOLD = 0.5
+
+# Specs with fewer content shingles than this (e.g. an unfilled template)
+# get no content signature
+MIN_SHINGLES = 5
+
+# Intent texts are a title and a one-line description, so a single word
+# is enough for a signature
+MIN_INTENT_SHINGLES = 1
+
+# Signature kinds
+CONTENT = "content"
+INTENT = "intent"
+
+_PLACEHOLDER = re.compile(r"\[[^\]]*\]")
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_TITLE_PREFIX = re.compile(r"^Feature Specification:\s*", re.IGNORECASE)
+_USER_DESCRIPTION = re.compile(r'^User description:\s*"?(.*?)"?\s*$', re.IGNORECASE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS specs (
+    feature TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    content BLOB,
+    intent BLOB
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    feature TEXT NOT NULL,
+    PRIMARY KEY (kind, band, hash, feature)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS buckets_feature ON buckets (feature);
+"""
+
+
+@dataclass
+class Duplicate:
+    """A pair of features with similar specs."""
+
+    feature: str
+    other: str
+    # Estimated Jaccard similarity of the two signatures
+    similarity: float
+    title: str
+    other_title: str
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+def _clean(text: str) -> str:
+    return _PLACEHOLDER.sub(" ", _COMMENT.sub(" ", text))
+
+
+def shingles(text: str, size: int = 2) -> set[str]:
+    """Return the set of `size`-word shingles of a text.
+
+    Shingles do not span lines, so a line left over from a template never
+    combines with its neighbours into something that looks written.
+    """
+    items: set[str] = set()
+    for line in _clean(text).splitlines():
+        words = tokenize(line)
+        items.update(" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+    return items
+
+
+@functools.lru_cache(maxsize=None)
+def template_shingles(size: int) -> frozenset[str]:
+    """Return the shingles of the spec and checklist templates' boilerplate."""
+    text = "\n".join(
+        load_template_content(name) for name in ("SPEC_TEMPLATE_CONTENT", "CHECKLIST_CONTENT")
+    )
+    return frozenset(shingles(text, size))
+
+
+def signature(items: set[str]) -> list[int]:
+    """Return the MinHash signature of a set of shingles.
+
+    One SHAKE-128 digest per shingle supplies NUM_PERM independent 32-bit
+    hashes, so the per-position minimums are computed in C.
+    """
+    rows = [
+        struct.unpack(f"<{NUM_PERM}I", hashlib.shake_128(item.encode("utf-8")).digest(4 * NUM_PERM))
+        for item in items
+    ]
+    return list(map(min, zip(*rows)))
+
+
+def similarity(first: list[int], second: list[int]) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    return sum(map(operator.eq, first, second)) / NUM_PERM
+
+
+def recall(threshold: float) -> float:
+    """Return the probability that a pair at the threshold shares an LSH bucket."""
+    return 1 - (1 - threshold**ROWS) ** BANDS
+
+
+def _bands(sig: list[int]) -> list[int]:
+    """Hash each band of a signature to a signed 64-bit bucket key."""
+    keys = []
+    for band in range(BANDS):
+        rows = struct.pack(f"<{ROWS}I", *sig[band * ROWS : (band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def _pack(sig: list[int] | None) -> bytes | None:
+    return struct.pack(f"<{NUM_PERM}I", *sig) if sig else None
+
+
+def _unpack(blob: bytes | None) -> list[int] | None:
+    return list(struct.unpack(f"<{NUM_PERM}I", blob)) if blob else None
+
+
+def spec_texts(data: bytes) -> tuple[str, str, str]:
+    """Extract (title, content text, intent text) from a spec.md."""
+    text = data.decode("utf-8", errors="replace")
+    doc = parse_bytes(data, "spec")
+    heading = next((s for s in doc.sections if s.level == 1), None)
+    title = _TITLE_PREFIX.sub("", heading.title) if heading else ""
+    parts = [title]
+    for story in doc.stories:
+        section = doc.sections[story.section]
+        parts.append(data[section.start : section.end].decode("utf-8", errors="replace"))
+    parts += [item.text for item in doc.requirements]
+    description = _USER_DESCRIPTION.match(doc.fields.get("Input", ""))
+    intent = f"{title}\n{description.group(1) if description else ''}"
+    if not doc.stories and not doc.requirements:
+        # Not structured like the template; fall back to the whole text.
+        parts.append(text)
+    return _clean(title).strip(), "\n".join(parts), intent
+
+
+def content_signature(text: str) -> list[int] | None:
+    """Return the content signature of a spec's stories and requirements.
+
+    Returns:
+        The signature, or None if too little besides template boilerplate
+        is left to compare.
+    """
+    items = shingles(text, 2) - template_shingles(2)
+    return signature(items) if len(items) >= MIN_SHINGLES else None
+
+
+def description_signature(description: str) -> list[int] | None:
+    """Return the intent signature of a title or feature description.
+
+    Returns:
+        The signature, or None if the text has no indexable words.
+    """
+    items = shingles(description, 1)
+    return signature(items) if len(items) >= MIN_INTENT_SHINGLES else None
+
+
+class DupesIndex:
+    """Incrementally maintained MinHash LSH index for one workspace."""
+
+    def __init__(self, workspace: Path) -> None:
+        self.workspace = workspace
+        self.path = index_dir(workspace) / DUPES_FILE
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != DUPES_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS specs")
+            self.conn.execute("DROP TABLE IF EXISTS buckets")
+            self.conn.execute(f"PRAGMA user_version = {DUPES_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "DupesIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def refresh(self) -> int:
+        """Bring the signatures up to date with the workspace.
+
+        Returns:
+            Number of specs that were (re)read or removed.
+        """
+        stored = dict(self.conn.execute("SELECT feature, stamp FROM specs"))
+        seen = set()
+        changed = 0
+        with self.conn:
+            for directory in feature_dirs(self.workspace):
+                spec = directory / "spec.md"
+                try:
+                    stat = spec.stat()
+                except OSError:
+                    continue
+                name = directory.name
+                seen.add(name)
+                stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+                if stored.get(name) == stamp:
+                    continue
+                try:
+                    title, content, intent = spec_texts(spec.read_bytes())
+                except OSError:
+                    continue
+                self._store(
+                    name, title, stamp, content_signature(content), description_signature(intent)
+                )
+                changed += 1
+            for name in set(stored) - seen:
+                self.conn.execute("DELETE FROM buckets WHERE feature = ?", (name,))
+                self.conn.execute("DELETE FROM specs WHERE feature = ?", (name,))
+                changed += 1
+        return changed
+
+    def _store(
+        self,
+        name: str,
+        title: str,
+        stamp: str,
+        content: list[int] | None,
+        intent: list[int] | None,
+    ) -> None:
+        self.conn.execute("DELETE FROM buckets WHERE feature = ?", (name,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO specs VALUES (?, ?, ?, ?, ?)",
+            (name, title, stamp, _pack(content), _pack(intent)),
+        )
+        for kind, sig in ((CONTENT, content), (INTENT, intent)):
+            if sig:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?, ?)",
+                    ((kind, band, key, name) for band, key in enumerate(_bands(sig))),
+                )
+
+    def _signature(self, name: str, kind: str) -> tuple[str, list[int] | None]:
+        row = self.conn.execute(
+            f"SELECT title, {kind} FROM specs WHERE feature = ?", (name,)
+        ).fetchone()
+        return (row[0], _unpack(row[1])) if row else ("", None)
+
+    def _signed(self, kind: str) -> list[str]:
+        rows = self.conn.execute(f"SELECT feature FROM specs WHERE {kind} IS NOT NULL")
+        return [row[0] for row in rows]
+
+    def _candidates(self, kind: str, sig: list[int], threshold: float) -> set[str]:
+        if recall(threshold) < MIN_RECALL:
+            return set(self._signed(kind))
+        found: set[str] = set()
+        for band, key in enumerate(_bands(sig)):
+            rows = self.conn.execute(
+                "SELECT feature FROM buckets WHERE kind = ? AND band = ? AND hash = ?",
+                (kind, band, key),
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def _matches(
+        self, name: str, title: str, kind: str, sig: list[int], threshold: float
+    ) -> list[Duplicate]:
+        matches = []
+        for other in sorted(self._candidates(kind, sig, threshold) - {name}):
+            other_title, other_sig = self._signature(other, kind)
+            if other_sig is None:
+                continue
+            score = similarity(sig, other_sig)
+            if score >= threshold:
+                matches.append(Duplicate(name, other, round(score, 3), title, other_title))
+        return sorted(matches, key=lambda d: -d.similarity)
+
+    def similar_to(self, name: str, threshold: float = DEFAULT_THRESHOLD) -> list[Duplicate]:
+        """Return features whose specs are near-duplicates of one feature's spec.
+
+        Raises:
+            ValueError: If the spec has too little written content to compare.
+        """
+        title, sig = self._signature(name, CONTENT)
+        if sig is None:
+            raise ValueError(f"{name} has too little written content to compare")
+        return self._matches(name, title, CONTENT, sig, threshold)
+
+    def similar_to_description(
+        self, description: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> list[Duplicate]:
+        """Return features whose title and original description resemble a new description.
+
+        Raises:
+            ValueError: If the description has no words to compare.
+        """
+        sig = description_signature(description)
+        if sig is None:
+            raise ValueError("the description has no words to compare")
+        title = description.strip().splitlines()[0] if description.strip() else ""
+        return self._matches("", title, INTENT, sig, threshold)
+
+    def unsigned(self) -> list[str]:
+        """Return the features whose specs have too little written content to compare."""
+        rows = self.conn.execute("SELECT feature FROM specs WHERE content IS NULL ORDER BY feature")
+        return [row[0] for row in rows]
+
+    def all_pairs(self, threshold: float = DEFAULT_THRESHOLD) -> list[Duplicate]:
+        """Return every pair of near-duplicate specs in the workspace.
+
+        Only pairs that share at least one LSH bucket are compared, unless
+        the threshold is too low for the band table to find pairs reliably.
+        """
+        if recall(threshold) < MIN_RECALL:
+            groups = [self._signed(CONTENT)]
+        else:
+            rows = self.conn.execute(
+                "SELECT GROUP_CONCAT(feature, char(10)) FROM buckets WHERE kind = ? "
+                "GROUP BY band, hash HAVING COUNT(*) > 1",
+                (CONTENT,),
+            )
+            groups = [members.split("\n") for (members,) in rows]
+        pairs: set[tuple[str, str]] = set()
+        for members in groups:
+            names = sorted(members)
+            pairs.update(
+                (first, second)
+                for index, first in enumerate(names)
+                for second in names[index + 1 :]
+            )
+        signatures: dict[str, tuple[str, list[int] | None]] = {}
+        duplicates = []
+        for first, second in sorted(pairs):
+            for name in (first, second):
+                if name not in signatures:
+                    signatures[name] = self._signature(name, CONTENT)
+            (title, sig), (other_title, other_sig) = signatures[first], signatures[second]
+            score = similarity(sig, other_sig)
+            if score >= threshold:
+                duplicates.append(Duplicate(first, second, round(score, 3), title, other_title))
+        return sorted(duplicates, key=lambda d: -d.similarity)
@@ -0,0 +1,68 @@
+"""Collision-free feature ID allocation for swhat.
+
+Feature creation is serialized through a lock file in the workspace's
+index directory, and a persisted counter hands out sequence numbers, so
+concurrent `swhat new` calls from several agents never collide and never
+need to rescan the workspace. The counter is seeded once, from existing
+numbered feature directories, the first time it is used.
+"""
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from swhat.fsutil import atomic_write_text, file_lock
+from swhat.workspace import feature_dirs, index_dir
+
+# Files inside the workspace index directory
+LOCK_FILE = "ids.lock"
+COUNTER_FILE = "counter"
+
+_NUMBERED = re.compile(r"^(\d+)-")
+
+
+@contextmanager
+def allocation_lock(workspace: Path) -> Iterator[None]:
+    """Hold the workspace-wide feature allocation lock."""
+    with file_lock(index_dir(workspace) / LOCK_FILE):
+        yield
+
+
+def used_numbers(workspace: Path) -> set[int]:
+    """Return the sequence numbers of existing numbered features."""
+    return {
+        int(match.group(1))
+        for directory in feature_dirs(workspace)
+        if (match := _NUMBERED.match(directory.name))
+    }
+
+
+def _seed(workspace: Path) -> int:
+    """Compute the first counter value from existing numbered features."""
+    return max(used_numbers(workspace), default=0) + 1
+
+
+def peek_number(workspace: Path) -> int:
+    """Return the next sequence number without reserving it.
+
+    Must be called with `allocation_lock()` held.
+    """
+    counter = index_dir(workspace) / COUNTER_FILE
+    try:
+        return int(counter.read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return _seed(workspace)
+
+
+def commit_number(workspace: Path, number: int) -> None:
+    """Record that a sequence number has been used.
+
+    Must be called with `allocation_lock()` held.
+    """
+    atomic_write_text(index_dir(workspace) / COUNTER_FILE, f"{number + 1}\n")
+
+
+def format_numbered(number: int, short_name: str) -> str:
+    """Format a spec-kit style numbered feature name, e.g. "007-user-auth"."""
+    return f"{number:03d}-{short_name}"
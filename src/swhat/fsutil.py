@@ -0,0 +1,84 @@
+"""Filesystem helpers shared by swhat commands."""
+
+import hashlib
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Return the sha256 hex digest of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(content: str) -> str:
+    """Return the sha256 hex digest of UTF-8 encoded text."""
+    return sha256_bytes(content.encode("utf-8"))
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write text to a file so readers never observe partial content.
+
+    The content is written to a temporary file in the same directory and
+    renamed over the destination, which is atomic on POSIX and Windows.
+    Parent directories are created as needed. The new file gets the usual
+    umask-derived permissions, like a plain write would.
+
+    Args:
+        path: Destination file.
+        content: Text to write (UTF-8).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.parent / f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+    try:
+        with open(tmp_path, "x", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on a lock file.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows. The lock file
+    is created if needed and left in place afterwards.
+
+    Args:
+        path: Lock file path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            import time
+
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
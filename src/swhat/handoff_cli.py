@@ -0,0 +1,158 @@
+"""Deterministic hand-off prompts for implementation agents.
+
+This module handles the `swhat handoff` command. When the specify, plan
+or feature workflow hands a feature to a new implementation agent, the
+continuation prompt is built mechanically from the parsed spec (feature
+name, user stories, functional requirements, success criteria, open
+clarifications) plus the paths of the feature's artifacts, instead of
+being summarized by the model each time.
+
+Prompts are cached in `.swhat/.index/handoff/`, keyed by the content
+hash of spec.md and the set of artifacts present, so each version is
+rendered once and every hand-off of that version is byte-identical.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from swhat.artifact_parser import parse_bytes
+from swhat.fsutil import atomic_write_text, sha256_bytes
+from swhat.workspace import index_dir
+
+# Bump when the prompt layout changes; invalidates cached prompts
+HANDOFF_VERSION = 1
+
+# Directory for cached prompts inside the workspace index directory
+HANDOFF_CACHE_DIR = "handoff"
+
+# Artifacts listed in the prompt, with their labels
+HANDOFF_ARTIFACTS = {
+    "spec.md": "Specification",
+    "plan.md": "Implementation plan",
+    "tasks.md": "Tasks",
+    "research.md": "Research",
+    "data-model.md": "Data model",
+    "quickstart.md": "Quickstart",
+}
+
+INSTRUCTIONS = """\
+1. Analyze the specification and the current codebase
+2. Determine the best approach to implement this feature
+3. If you need clarification on HOW to accomplish any requirement, ask the user
+4. Implement the feature incrementally, testing as you go
+5. If you encounter blockers or need decisions, ask the user before proceeding
+6. Focus on delivering a working MVP that satisfies the P1 user story first"""
+
+
+@dataclass
+class Handoff:
+    """A rendered hand-off prompt."""
+
+    feature: str
+    key: str
+    prompt: str
+    cached: bool
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "feature": self.feature,
+            "key": self.key,
+            "cached": self.cached,
+            "prompt": self.prompt,
+        }
+
+
+def _user_description(value: str) -> str:
+    prefix = "User description:"
+    if value.startswith(prefix):
+        value = value[len(prefix) :].strip()
+    return value.strip().strip('"')
+
+
+def render_prompt(feature: Path, spec: bytes, artifacts: list[str], root: Path) -> str:
+    """Build the hand-off prompt for a feature from its spec.md content.
+
+    Args:
+        feature: Feature directory.
+        spec: Content of spec.md.
+        artifacts: Names of the artifact files present, in HANDOFF_ARTIFACTS order.
+        root: Directory the artifact paths are shown relative to.
+    """
+    doc = parse_bytes(spec, "spec")
+    heading = next((s for s in doc.sections if s.level == 1), None)
+    title = heading.title if heading else feature.name
+    title = title.removeprefix("Feature Specification:").strip()
+
+    lines = [
+        "You are implementing a feature based on the following specification.",
+        "",
+        "## Feature Summary",
+        f"**Feature**: {title} (`{feature.name}`)",
+    ]
+    description = _user_description(doc.fields.get("Input", ""))
+    if description:
+        lines.append(f"**Description**: {description}")
+    if doc.stories:
+        lines += ["", "**User stories**:"]
+        for story in sorted(doc.stories, key=lambda s: (s.priority, s.number)):
+            lines.append(f"- {story.tag} ({story.priority}): {story.title}")
+    lines += ["", "## Your Instructions", INSTRUCTIONS]
+    if doc.requirements:
+        lines += ["", "## Key Requirements"]
+        lines += [f"- {item.id}: {item.text}" for item in doc.requirements]
+    if doc.success_criteria:
+        lines += ["", "## Success Criteria"]
+        lines += [f"- {item.id}: {item.text}" for item in doc.success_criteria]
+    if doc.clarifications:
+        lines += ["", "## Open Questions"]
+        lines += [
+            f"- {c.text or 'Unspecified'} (spec.md line {c.line})" for c in doc.clarifications
+        ]
+    lines += ["", "## Artifacts"]
+    try:
+        base = feature.relative_to(root)
+    except ValueError:
+        base = feature
+    for name in artifacts:
+        lines.append(f"- {HANDOFF_ARTIFACTS[name]}: {(base / name).as_posix()}")
+    lines += ["", "Begin by exploring the codebase and proposing your implementation approach."]
+    return "\n".join(lines) + "\n"
+
+
+def handoff(feature: Path, workspace: Path) -> Handoff:
+    """Return the hand-off prompt for a feature, rendering it only if not cached.
+
+    Raises:
+        OSError: If spec.md cannot be read.
+    """
+    spec = (feature / "spec.md").read_bytes()
+    artifacts = [name for name in HANDOFF_ARTIFACTS if (feature / name).is_file()]
+    # The prompt depends only on spec.md's content and which artifacts exist.
+    material = json.dumps(
+        {
+            "version": HANDOFF_VERSION,
+            "feature": feature.name,
+            "spec": sha256_bytes(spec),
+            "artifacts": artifacts,
+        },
+        sort_keys=True,
+    )
+    key = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+    cache_dir = index_dir(workspace) / HANDOFF_CACHE_DIR
+    cache_file = cache_dir / f"{feature.name}.{key}.md"
+    try:
+        return Handoff(feature.name, key, cache_file.read_text(encoding="utf-8"), True)
+    except OSError:
+        pass
+    prompt = render_prompt(feature, spec, artifacts, workspace.parent)
+    try:
+        for stale in cache_dir.glob(f"{feature.name}.*.md"):
+            stale.unlink(missing_ok=True)
+        atomic_write_text(cache_file, prompt)
+    except OSError:
+        pass  # The cache is an optimization only.
+    return Handoff(feature.name, key, prompt, False)
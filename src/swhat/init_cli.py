@@ -5,30 +5,306 @@ for specification-driven development by creating directories and
 installing AI agent command files.
 """
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import click
 
-from swhat.commands import (
-    CLAUDE_SPECIFY_COMMAND,
-    ROO_SPECIFY_COMMAND,
-    CLAUDE_PLAN_COMMAND,
-    ROO_PLAN_COMMAND,
-    CLAUDE_TASKS_COMMAND,
-    ROO_TASKS_COMMAND,
-    CLAUDE_FEATURE_SKILL,
-    ROO_FEATURE_SKILL,
-)
+from swhat import __version__
+from swhat.commands import load_command_content
+from swhat.fsutil import atomic_write_text, sha256_bytes, sha256_text
 
+# Agent files installed by init: (path relative to project root, content constant)
+INSTALL_FILES: list[tuple[str, str]] = [
+    # Claude Code: commands
+    (".claude/commands/swhat.specify.md", "CLAUDE_SPECIFY_COMMAND"),
+    (".claude/commands/swhat.plan.md", "CLAUDE_PLAN_COMMAND"),
+    (".claude/commands/swhat.tasks.md", "CLAUDE_TASKS_COMMAND"),
+    # Claude Code: skills
+    (".claude/skills/swhat-feature-workflow/SKILL.md", "CLAUDE_FEATURE_SKILL"),
+    # Roo: commands (uses dashes, not dots)
+    (".roo/commands/swhat-specify.md", "ROO_SPECIFY_COMMAND"),
+    (".roo/commands/swhat-plan.md", "ROO_PLAN_COMMAND"),
+    (".roo/commands/swhat-tasks.md", "ROO_TASKS_COMMAND"),
+    # Roo: skills
+    (".roo/skills/swhat-feature-workflow/SKILL.md", "ROO_FEATURE_SKILL"),
+]
+
+# Record of installed file hashes, relative to the project root
+MANIFEST_PATH = ".swhat/manifest.json"
+
+# Default number of project roots initialized concurrently
+DEFAULT_JOBS = 8
+
+
+def _load_manifest(root: Path) -> dict:
+    """Load the install manifest, or an empty one if missing or unreadable."""
+    try:
+        manifest = json.loads((root / MANIFEST_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), dict):
+        return {"files": {}}
+    return manifest
+
+
+def _is_current(path: Path, digest: str, recorded: dict | None) -> bool:
+    """Check whether a file on disk already holds content with this digest.
+
+    A file whose size and mtime still match the manifest entry for the same
+    digest is trusted without being read; otherwise its bytes are hashed.
+    """
+    # Links into the shared cache are replaced by a private copy.
+    if path.is_symlink():
+        return False
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    if stat.st_nlink > 1:
+        return False
+    if (
+        recorded
+        and recorded.get("sha256") == digest
+        and recorded.get("size") == stat.st_size
+        and recorded.get("mtime_ns") == stat.st_mtime_ns
+    ):
+        return True
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return False
+    return sha256_bytes(data) == digest
+
+
+def _write_file(path: Path, content: str, recorded: dict | None) -> tuple[str, dict]:
+    """Write a file if its content changed.
+
+    Returns:
+        Tuple of (action, manifest entry), where action is "Created",
+        "Updated" or "Unchanged" and the entry records sha256, size and
+        mtime_ns of the file as installed.
+    """
+    digest = sha256_text(content)
+    if _is_current(path, digest, recorded):
+        action = "Unchanged"
+    else:
+        action = "Updated" if path.exists() else "Created"
+        atomic_write_text(path, content)
+    stat = path.stat()
+    return action, {
+        "sha256": digest,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "mode": "copy",
+    }
+
+
+def _link_file(
+    path: Path, relative_path: str, content: str, blob: Path, mode: str, recorded: dict | None
+) -> tuple[str, dict]:
+    """Link a file from the shared cache, falling back to a private copy.
+
+    Returns:
+        Tuple of (action, manifest entry) as for `_write_file()`.
+    """
+    from swhat.shared_cache import link_file
+
+    try:
+        action = link_file(path, relative_path, blob, mode)
+    except OSError:
+        return _write_file(path, content, recorded)
+    return action, {"sha256": sha256_text(content), "mode": mode}
+
+
+def prepare_shared() -> dict[str, Path]:
+    """Materialize the current install files in the shared cache.
+
+    Returns:
+        Mapping of install path (relative to project root) -> store file.
+    """
+    from swhat.shared_cache import prepare
+
+    files = {relative_path: load_command_content(c) for relative_path, c in INSTALL_FILES}
+    return prepare(files, __version__)
+
+
+@dataclass
+class InitResult:
+    """Outcome of initializing one project root."""
+
+    root: Path
+    # (action, path relative to root) in install order
+    actions: list[tuple[str, str]] = field(default_factory=list)
+    error: str | None = None
+
+    def count(self, action: str) -> int:
+        """Return how many files (not directories) were handled with the given action."""
+        return sum(1 for done, path in self.actions if done == action and not path.endswith("/"))
+
+
+def install_project(
+    root: Path, shared: str | None = None, blobs: dict[str, Path] | None = None
+) -> InitResult:
+    """Create the workspace and install agent files under a project root.
+
+    Nothing is printed; the caller reports the returned result.
+
+    Args:
+        root: Project root directory. Must already exist.
+        shared: None to install private copies, or "hardlink"/"symlink" to
+            link files from the shared cache.
+        blobs: Result of `prepare_shared()`; required when shared is set.
+
+    Returns:
+        InitResult describing what was created, updated or left unchanged.
+    """
+    result = InitResult(root=root)
+    if not root.is_dir():
+        result.error = "not a directory"
+        return result
+
+    try:
+        # Create .swhat/ directory
+        swhat_dir = root / ".swhat"
+        if swhat_dir.exists():
+            result.actions.append(("Exists", ".swhat/"))
+        else:
+            swhat_dir.mkdir(parents=True, exist_ok=True)
+            result.actions.append(("Created", ".swhat/"))
+
+        manifest = _load_manifest(root)
+        installed = {}
+        for relative_path, constant in INSTALL_FILES:
+            content = load_command_content(constant)
+            recorded = manifest["files"].get(relative_path)
+            if shared:
+                action, installed[relative_path] = _link_file(
+                    root / relative_path,
+                    relative_path,
+                    content,
+                    blobs[relative_path],
+                    shared,
+                    recorded,
+                )
+            else:
+                action, installed[relative_path] = _write_file(
+                    root / relative_path, content, recorded
+                )
+            result.actions.append((action, relative_path))
+
+        new_manifest = {"swhat_version": __version__, "files": installed}
+        if new_manifest != manifest:
+            atomic_write_text(root / MANIFEST_PATH, json.dumps(new_manifest, indent=2) + "\n")
+    except OSError as exc:
+        result.error = str(exc)
+    return result
 
-def _write_file(path: Path, content: str, display_path: str) -> None:
-    """Write a file and report status."""
-    action = "Updated" if path.exists() else "Created"
-    path.write_text(content, encoding="utf-8")
-    click.echo(f"  {action} {display_path}")
 
+def find_git_roots(directory: Path) -> list[Path]:
+    """Find git repository roots at or below a directory.
 
-def initialize_project() -> bool:
+    Descent stops at each repository found, and hidden directories and
+    node_modules/ are not searched.
+
+    Args:
+        directory: Directory to search.
+
+    Returns:
+        Sorted list of directories containing a `.git` entry.
+    """
+    roots = []
+    for current, dirnames, filenames in os.walk(directory):
+        if ".git" in dirnames or ".git" in filenames:
+            roots.append(Path(current))
+            dirnames.clear()
+            continue
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
+    return sorted(roots)
+
+
+def read_path_list(source: str) -> list[Path]:
+    """Read project roots from a file (or "-" for stdin), one per line.
+
+    Blank lines and lines starting with "#" are ignored.
+    """
+    if source == "-":
+        lines = click.get_text_stream("stdin").read().splitlines()
+    else:
+        lines = Path(source).read_text(encoding="utf-8").splitlines()
+    entries = (line.strip() for line in lines)
+    return [Path(entry) for entry in entries if entry and not entry.startswith("#")]
+
+
+def initialize_projects(
+    roots: list[Path], jobs: int = DEFAULT_JOBS, shared: str | None = None
+) -> bool:
+    """Initialize several project roots concurrently and print a summary.
+
+    Args:
+        roots: Project root directories to initialize.
+        jobs: Maximum number of roots initialized at once.
+        shared: Link mode for shared installs, or None for private copies.
+
+    Returns:
+        True if every root succeeded, False otherwise.
+    """
+    # Resolve duplicates while keeping the caller's order
+    unique = list(dict.fromkeys(root.resolve() for root in roots))
+    if not unique:
+        click.echo("No project roots to initialize.", err=True)
+        return False
+
+    # Load all content (and the shared cache) up front so workers never race
+    for _, constant in INSTALL_FILES:
+        load_command_content(constant)
+    blobs = _prepare_shared_or_report(shared)
+    if shared and blobs is None:
+        return False
+
+    click.echo(f"Initializing swhat in {len(unique)} project(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(unique)))) as pool:
+        results = list(pool.map(lambda root: install_project(root, shared, blobs), unique))
+
+    totals = {"Created": 0, "Updated": 0, "Unchanged": 0}
+    failed = 0
+    for result in results:
+        if result.error is not None:
+            failed += 1
+            click.echo(f"  {result.root}: error: {result.error}", err=True)
+            continue
+        counts = {action: result.count(action) for action in totals}
+        for action, count in counts.items():
+            totals[action] += count
+        click.echo(
+            f"  {result.root}: {counts['Created']} created, "
+            f"{counts['Updated']} updated, {counts['Unchanged']} unchanged"
+        )
+
+    click.echo("")
+    click.echo(
+        f"Initialized {len(results) - failed} of {len(results)} project(s): "
+        f"{totals['Created']} created, {totals['Updated']} updated, "
+        f"{totals['Unchanged']} unchanged"
+    )
+    return failed == 0
+
+
+def _prepare_shared_or_report(shared: str | None) -> dict[str, Path] | None:
+    """Prepare the shared cache if requested, reporting failures."""
+    if not shared:
+        return None
+    try:
+        return prepare_shared()
+    except OSError as exc:
+        click.echo(f"Error: Cannot prepare shared cache: {exc}", err=True)
+        return None
+
+
+def initialize_project(shared: str | None = None) -> bool:
     """Initialize the current directory for swhat specification workflow.
 
     Creates:
@@ -41,77 +317,33 @@ def initialize_project() -> bool:
         - .roo/commands/swhat-plan.md for Roo
         - .roo/commands/swhat-tasks.md for Roo
         - .roo/skills/swhat-feature-workflow/SKILL.md for Roo
+        - .swhat/manifest.json recording installed hashes and swhat version
+
+    Files whose content already matches are left untouched (no rewrite,
+    no mtime change); changed files are replaced atomically.
+
+    Args:
+        shared: None to install private copies, or "hardlink"/"symlink" to
+            link files from the machine-wide shared cache.
 
     Returns:
         True if initialization succeeded, False otherwise.
     """
-    cwd = Path.cwd()
+    blobs = _prepare_shared_or_report(shared)
+    if shared and blobs is None:
+        return False
 
     click.echo("Initializing swhat in current directory...")
 
-    # Create .swhat/ directory
-    swhat_dir = cwd / ".swhat"
-    if swhat_dir.exists():
-        click.echo("  .swhat/ already exists")
-    else:
-        swhat_dir.mkdir(parents=True, exist_ok=True)
-        click.echo("  Created .swhat/")
-
-    # Claude Code: commands
-    claude_commands_dir = cwd / ".claude" / "commands"
-    claude_commands_dir.mkdir(parents=True, exist_ok=True)
-    _write_file(
-        claude_commands_dir / "swhat.specify.md",
-        CLAUDE_SPECIFY_COMMAND,
-        ".claude/commands/swhat.specify.md",
-    )
-    _write_file(
-        claude_commands_dir / "swhat.plan.md",
-        CLAUDE_PLAN_COMMAND,
-        ".claude/commands/swhat.plan.md",
-    )
-    _write_file(
-        claude_commands_dir / "swhat.tasks.md",
-        CLAUDE_TASKS_COMMAND,
-        ".claude/commands/swhat.tasks.md",
-    )
-
-    # Claude Code: skills
-    claude_skill_dir = cwd / ".claude" / "skills" / "swhat-feature-workflow"
-    claude_skill_dir.mkdir(parents=True, exist_ok=True)
-    _write_file(
-        claude_skill_dir / "SKILL.md",
-        CLAUDE_FEATURE_SKILL,
-        ".claude/skills/swhat-feature-workflow/SKILL.md",
-    )
-
-    # Roo: commands (uses dashes, not dots)
-    roo_commands_dir = cwd / ".roo" / "commands"
-    roo_commands_dir.mkdir(parents=True, exist_ok=True)
-    _write_file(
-        roo_commands_dir / "swhat-specify.md",
-        ROO_SPECIFY_COMMAND,
-        ".roo/commands/swhat-specify.md",
-    )
-    _write_file(
-        roo_commands_dir / "swhat-plan.md",
-        ROO_PLAN_COMMAND,
-        ".roo/commands/swhat-plan.md",
-    )
-    _write_file(
-        roo_commands_dir / "swhat-tasks.md",
-        ROO_TASKS_COMMAND,
-        ".roo/commands/swhat-tasks.md",
-    )
-
-    # Roo: skills
-    roo_skill_dir = cwd / ".roo" / "skills" / "swhat-feature-workflow"
-    roo_skill_dir.mkdir(parents=True, exist_ok=True)
-    _write_file(
-        roo_skill_dir / "SKILL.md",
-        ROO_FEATURE_SKILL,
-        ".roo/skills/swhat-feature-workflow/SKILL.md",
-    )
+    result = install_project(Path.cwd(), shared, blobs)
+    for action, display_path in result.actions:
+        if action == "Exists":
+            click.echo(f"  {display_path} already exists")
+        else:
+            click.echo(f"  {action} {display_path}")
+    if result.error is not None:
+        click.echo(f"Error: {result.error}", err=True)
+        return False
 
     click.echo("")
     click.echo("Initialization complete!")
@@ -0,0 +1,184 @@
+"""Feature workspace scaffolding for swhat.
+
+This module handles the `swhat new` command, which creates a feature
+directory under `.swhat/` with spec.md and requirements.md pre-rendered
+from the registered templates, in a single process call.
+"""
+
+import os
+import re
+import secrets
+import shutil
+import string
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from swhat.feature_ids import (
+    allocation_lock,
+    commit_number,
+    format_numbered,
+    peek_number,
+    used_numbers,
+)
+from swhat.fsutil import atomic_write_text
+from swhat.template_cli import render_template
+
+# Length and alphabet of the random suffix appended to feature short names
+SUFFIX_LENGTH = 12
+SUFFIX_ALPHABET = string.ascii_lowercase + string.digits
+
+# Maximum number of keywords kept in a derived short name
+MAX_NAME_WORDS = 4
+
+# Words dropped when deriving a short name from a description
+_STOPWORDS = frozenset(
+    """
+    a an the i we you they it this that these those my our your their
+    want wants need needs would like please should must can could will shall
+    to for of in on at by with from into onto about as and or but so
+    be is are was were been being have has had do does did
+    implement implementing create creating build building make making
+    new feature ability able allow allows support supports let lets
+    """.split()
+)
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+@dataclass
+class NewFeature:
+    """A freshly created feature workspace."""
+
+    name: str
+    short_name: str
+    # Sequence number, for numbered features only
+    number: int | None
+    directory: Path
+    spec: Path
+    requirements: Path
+
+
+def derive_short_name(description: str, max_words: int = MAX_NAME_WORDS) -> str:
+    """Derive a short kebab-case name from a feature description.
+
+    The result is deterministic: stopwords and filler verbs are dropped and
+    the first remaining keywords are kept, lowercased, in order.
+
+    Args:
+        description: Natural-language feature description.
+        max_words: Maximum number of keywords to keep.
+
+    Returns:
+        Short name such as "add-user-authentication", or "feature" if the
+        description has no usable keywords.
+    """
+    words = [w.lower() for w in _WORD.findall(description)]
+    keywords = [w for w in words if w not in _STOPWORDS]
+    keywords = list(dict.fromkeys(keywords))[:max_words]
+    return "-".join(keywords) or "feature"
+
+
+def normalize_short_name(name: str) -> str:
+    """Normalize a user-supplied short name to lowercase kebab-case."""
+    return "-".join(w.lower() for w in _WORD.findall(name)) or "feature"
+
+
+def random_suffix(length: int = SUFFIX_LENGTH) -> str:
+    """Return a random [a-z0-9] suffix from a cryptographic RNG."""
+    return "".join(secrets.choice(SUFFIX_ALPHABET) for _ in range(length))
+
+
+def _title(description: str, short_name: str) -> str:
+    """Pick a human-readable feature title for the rendered templates."""
+    first_line = description.strip().splitlines()[0] if description.strip() else ""
+    if first_line and len(first_line) <= 80:
+        return first_line.rstrip(".")
+    return short_name.replace("-", " ").title()
+
+
+def render_feature_files(description: str, short_name: str, today: str) -> dict:
+    """Render the initial artifacts for a feature.
+
+    Returns:
+        Dict of file name -> rendered content.
+    """
+    values = {
+        "FEATURE NAME": _title(description, short_name),
+        "DATE": today,
+        "ARGUMENTS": description.strip(),
+    }
+    spec = render_template("specification", values)
+    requirements = render_template("specification-checklist", values)
+    requirements = requirements.replace("[Link to spec.md]", "[spec.md](spec.md)")
+    return {"spec.md": spec, "requirements.md": requirements}
+
+
+def create_feature(
+    workspace: Path,
+    description: str,
+    short_name: str | None = None,
+    today: str | None = None,
+    numbered: bool = False,
+) -> NewFeature:
+    """Create a feature directory with pre-rendered spec and checklist.
+
+    Allocation runs under the workspace lock, so concurrent callers never
+    collide. A suffixed name is checked with a single stat; a numbered
+    name takes the persisted counter, skipping any number an existing
+    feature already uses under a different short name. The directory is
+    assembled under a hidden staging name and renamed into place, so
+    other processes never see a half-populated feature.
+
+    Args:
+        workspace: The `.swhat/` directory.
+        description: Natural-language feature description.
+        short_name: Explicit short name; derived from the description if None.
+        today: ISO date for the [DATE] placeholder; defaults to today.
+        numbered: Name the directory "NNN-<short-name>" from the counter
+            instead of "<short-name>_<random suffix>".
+
+    Returns:
+        The created feature.
+
+    Raises:
+        OSError: If the directory cannot be created.
+    """
+    short_name = normalize_short_name(short_name) if short_name else derive_short_name(description)
+    today = today or date.today().isoformat()
+    files = render_feature_files(description, short_name, today)
+
+    with allocation_lock(workspace):
+        number = peek_number(workspace) if numbered else None
+        if number is not None:
+            # Skip numbers already used by any feature, whatever its short name.
+            used = used_numbers(workspace)
+            while number in used:
+                number += 1
+            name = format_numbered(number, short_name)
+        else:
+            name = f"{short_name}_{random_suffix()}"
+            while (workspace / name).exists():
+                name = f"{short_name}_{random_suffix()}"
+
+        directory = workspace / name
+        staging = workspace / f".new-{name}-{os.getpid()}"
+        try:
+            staging.mkdir(parents=True)
+            for file_name, content in files.items():
+                atomic_write_text(staging / file_name, content + "\n")
+            os.rename(staging, directory)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        if number is not None:
+            commit_number(workspace, number)
+
+    return NewFeature(
+        name=name,
+        short_name=short_name,
+        number=number,
+        directory=directory,
+        spec=directory / "spec.md",
+        requirements=directory / "requirements.md",
+    )
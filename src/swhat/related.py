@@ -0,0 +1,287 @@
+"""Related-artifact retrieval for swhat.
+
+This module handles `swhat related`. The spec, plan and research
+documents of every feature form a sparse term-count matrix, persisted in
+`.swhat/.index/related.sqlite` as one packed row per document and
+refreshed incrementally: only documents whose mtime or size changed are
+re-tokenized. At query time the counts are weighted with TF-IDF
+(sublinear term frequency, smoothed inverse document frequency) and
+documents are ranked by cosine similarity to the feature's own artifacts.
+
+NumPy and SciPy (the `fast` extra) are used when installed; otherwise a
+pure-Python implementation computes the same scores.
+"""
+
+import math
+import re
+import sqlite3
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.search_index import tokenize
+from swhat.workspace import feature_dirs, index_dir
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:  # pragma: no cover - optional dependency
+    csr_matrix = None
+
+# Related database file inside the workspace index directory
+RELATED_FILE = "related.sqlite"
+
+# Bump when the schema or tokenizer changes; forces a rebuild
+RELATED_VERSION = 1
+
+# Artifacts included in the matrix
+RELATED_ARTIFACTS = ("spec", "plan", "research")
+
+# Default number of results
+DEFAULT_K = 5
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vocab (
+    term TEXT PRIMARY KEY,
+    id INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS docs (
+    path TEXT PRIMARY KEY,
+    feature TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    terms BLOB NOT NULL,
+    counts BLOB NOT NULL
+);
+"""
+
+
+@dataclass
+class Related:
+    """An artifact related to the queried feature."""
+
+    path: str
+    feature: str
+    artifact: str
+    # Cosine similarity of TF-IDF vectors
+    score: float
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+@dataclass
+class _Matrix:
+    """Term-count rows in CSR layout."""
+
+    paths: list[str]
+    features: list[str]
+    artifacts: list[str]
+    indptr: list[int]
+    indices: array
+    counts: array
+    vocab_size: int
+
+
+def engine() -> str:
+    """Return the implementation used for scoring: "scipy", "numpy" or "python"."""
+    if np is None:
+        return "python"
+    return "scipy" if csr_matrix is not None else "numpy"
+
+
+class RelatedIndex:
+    """Incrementally maintained TF-IDF matrix for one workspace."""
+
+    def __init__(self, workspace: Path) -> None:
+        self.workspace = workspace
+        self.path = index_dir(workspace) / RELATED_FILE
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != RELATED_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS vocab")
+            self.conn.execute("DROP TABLE IF EXISTS docs")
+            self.conn.execute(f"PRAGMA user_version = {RELATED_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "RelatedIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def refresh(self) -> int:
+        """Bring the matrix up to date with the workspace.
+
+        Returns:
+            Number of documents that were (re)read or removed.
+        """
+        new_terms: list[tuple[str, int]] = []
+        seen = set()
+        changed = 0
+        with self.conn:
+            # Term IDs are assigned from the stored vocabulary, so concurrent
+            # refreshes must not interleave.
+            self.conn.execute("BEGIN IMMEDIATE")
+            stored = dict(self.conn.execute("SELECT path, stamp FROM docs"))
+            vocab = dict(self.conn.execute("SELECT term, id FROM vocab"))
+            for directory in feature_dirs(self.workspace):
+                for artifact in RELATED_ARTIFACTS:
+                    path = directory / f"{artifact}.md"
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    relative = f"{directory.name}/{artifact}.md"
+                    seen.add(relative)
+                    stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+                    if stored.get(relative) == stamp:
+                        continue
+                    try:
+                        text = path.read_text(encoding="utf-8", errors="replace")
+                    except OSError:
+                        continue
+                    counts: dict[int, int] = {}
+                    for term in tokenize(_COMMENT.sub(" ", text)):
+                        if term not in vocab:
+                            vocab[term] = len(vocab)
+                            new_terms.append((term, vocab[term]))
+                        counts[vocab[term]] = counts.get(vocab[term], 0) + 1
+                    ids = sorted(counts)
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            relative,
+                            directory.name,
+                            artifact,
+                            stamp,
+                            array("I", ids).tobytes(),
+                            array("I", (counts[i] for i in ids)).tobytes(),
+                        ),
+                    )
+                    changed += 1
+            self.conn.executemany("INSERT INTO vocab VALUES (?, ?)", new_terms)
+            for relative in set(stored) - seen:
+                self.conn.execute("DELETE FROM docs WHERE path = ?", (relative,))
+                changed += 1
+        return changed
+
+    def _load(self) -> _Matrix:
+        vocab_size = self.conn.execute("SELECT COUNT(*) FROM vocab").fetchone()[0]
+        matrix = _Matrix([], [], [], [0], array("I"), array("I"), vocab_size)
+        rows = self.conn.execute(
+            "SELECT path, feature, artifact, terms, counts FROM docs ORDER BY path"
+        )
+        for path, feature, artifact, terms, counts in rows:
+            if not terms:
+                continue
+            matrix.paths.append(path)
+            matrix.features.append(feature)
+            matrix.artifacts.append(artifact)
+            matrix.indices.frombytes(terms)
+            matrix.counts.frombytes(counts)
+            matrix.indptr.append(len(matrix.indices))
+        return matrix
+
+    def related(
+        self, feature: str, k: int = DEFAULT_K, artifacts: tuple[str, ...] = ()
+    ) -> list[Related]:
+        """Rank other features' artifacts by similarity to one feature.
+
+        The query vector is the sum of the feature's own spec, plan and
+        research term counts.
+
+        Args:
+            feature: Feature directory name.
+            k: Maximum number of results.
+            artifacts: Only return these artifacts (default: all).
+
+        Returns:
+            Up to k artifacts of other features, most similar first.
+        """
+        matrix = self._load()
+        own = [row for row, name in enumerate(matrix.features) if name == feature]
+        if not own:
+            return []
+        if np is not None:
+            scores = _scores_numpy(matrix, own)
+        else:
+            scores = _scores_python(matrix, own)
+        results = [
+            Related(matrix.paths[row], matrix.features[row], matrix.artifacts[row], score)
+            for row, score in enumerate(scores)
+            if score > 0
+            and matrix.features[row] != feature
+            and (not artifacts or matrix.artifacts[row] in artifacts)
+        ]
+        results.sort(key=lambda r: (-r.score, r.path))
+        for result in results[:k]:
+            result.score = round(result.score, 4)
+        return results[:k]
+
+
+def _scores_numpy(matrix: _Matrix, own: list[int]) -> list[float]:
+    indptr = np.asarray(matrix.indptr, dtype=np.int64)
+    indices = np.asarray(matrix.indices).astype(np.int64)
+    counts = np.asarray(matrix.counts).astype(np.float64)
+    rows = len(matrix.paths)
+    df = np.bincount(indices, minlength=matrix.vocab_size)
+    idf = np.log((1 + rows) / (1 + df)) + 1
+    weights = (1 + np.log(counts)) * idf[indices]
+
+    query_counts = np.zeros(matrix.vocab_size)
+    for row in own:
+        segment = slice(indptr[row], indptr[row + 1])
+        np.add.at(query_counts, indices[segment], counts[segment])
+    nonzero = query_counts > 0
+    query = np.zeros(matrix.vocab_size)
+    query[nonzero] = (1 + np.log(query_counts[nonzero])) * idf[nonzero]
+    query /= np.linalg.norm(query) or 1.0
+
+    # Every stored row has at least one term, so no reduceat segment is empty.
+    starts = indptr[:-1]
+    norms = np.sqrt(np.add.reduceat(weights * weights, starts))
+    if csr_matrix is not None:
+        dots = csr_matrix((weights, indices, indptr), shape=(rows, matrix.vocab_size)) @ query
+    else:
+        dots = np.add.reduceat(weights * query[indices], starts)
+    return (dots / np.where(norms > 0, norms, 1.0)).tolist()
+
+
+def _scores_python(matrix: _Matrix, own: list[int]) -> list[float]:
+    rows = len(matrix.paths)
+    df: dict[int, int] = {}
+    for term in matrix.indices:
+        df[term] = df.get(term, 0) + 1
+    idf = {term: math.log((1 + rows) / (1 + count)) + 1 for term, count in df.items()}
+
+    query_counts: dict[int, int] = {}
+    for row in own:
+        for position in range(matrix.indptr[row], matrix.indptr[row + 1]):
+            term = matrix.indices[position]
+            query_counts[term] = query_counts.get(term, 0) + matrix.counts[position]
+    query = {t: (1 + math.log(c)) * idf[t] for t, c in query_counts.items()}
+    query_norm = math.sqrt(sum(w * w for w in query.values())) or 1.0
+
+    scores = []
+    for row in range(rows):
+        dot = norm = 0.0
+        for position in range(matrix.indptr[row], matrix.indptr[row + 1]):
+            term = matrix.indices[position]
+            weight = (1 + math.log(matrix.counts[position])) * idf[term]
+            norm += weight * weight
+            dot += weight * query.get(term, 0.0)
+        scores.append(dot / (math.sqrt(norm) * query_norm) if norm else 0.0)
+    return scores
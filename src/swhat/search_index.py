@@ -0,0 +1,391 @@
+"""Full-text search over the artifacts in a swhat workspace.
+
+The index is an inverted index in a SQLite database at
+`.swhat/.index/search.sqlite`. Every Markdown file in a feature
+directory is split at its headings, and each section's terms are stored
+as postings (term -> section, term frequency). Hits are ranked with BM25
+per section, scaled by a weight for the kind of section, so a match in
+Functional Requirements ranks above the same match in Assumptions.
+
+The index is refreshed incrementally: files are compared by mtime and
+size against the stored stamp, and only changed files are re-tokenized.
+"""
+
+import math
+import os
+import re
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.artifact_parser import parse_bytes
+from swhat.workspace import feature_dirs, index_dir
+
+# Search database file inside the workspace index directory
+SEARCH_FILE = "search.sqlite"
+
+# Bump when the schema, tokenizer or weights change; forces a rebuild
+SEARCH_VERSION = 1
+
+# Normalized section title prefix -> ranking weight. A section takes the
+# weight of its nearest heading (itself or an ancestor) listed here.
+SECTION_WEIGHTS: dict[str, float] = {
+    "functional requirements": 3.0,
+    "user story": 2.5,
+    "key entities": 2.0,
+    "success criteria": 2.0,
+    "summary": 2.0,
+    "user scenarios": 2.0,
+    "requirements": 2.0,
+    "technical context": 1.5,
+    "edge cases": 1.5,
+    "assumptions": 0.5,
+    "notes": 0.5,
+    "complexity tracking": 0.5,
+}
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+# Extra term frequency for words in a section's heading
+_TITLE_BOOST = 2
+
+# Longest snippet shown for a hit
+_SNIPPET_CHARS = 160
+
+_WORD = re.compile(r"[a-z0-9]+")
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have if in into is it its may must not of on "
+    "or our should such than that the their then there these this to was were when which "
+    "will with".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    feature TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    stamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_file ON sections (file_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    section_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, section_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_section ON postings (section_id);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Hit:
+    """One matching section."""
+
+    path: str
+    feature: str
+    artifact: str
+    section: str
+    line: int
+    score: float
+    # Number of distinct query terms found in the section
+    matched: int
+    snippet: str
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into normalized search terms."""
+    return [
+        _stem(word)
+        for word in _WORD.findall(text.lower())
+        if word not in _STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def section_weight(titles: list[str]) -> float:
+    """Return the weight for a section, given its heading and its ancestors' (innermost first)."""
+    for title in titles:
+        normalized = " ".join(title.lower().strip("#*_` ").split())
+        for prefix, weight in SECTION_WEIGHTS.items():
+            if normalized.startswith(prefix):
+                return weight
+    return 1.0
+
+
+def _segments(data: bytes) -> list[tuple[str, int, int, int, float, str]]:
+    """Split a file at its headings.
+
+    Each heading owns the text up to the next heading of any level, so
+    every byte belongs to exactly one segment.
+
+    Returns:
+        List of (title, line, start, end, weight, text) tuples.
+    """
+    doc = parse_bytes(data)
+    sections = doc.sections
+    segments = []
+    first = sections[0].start if sections else len(data)
+    if data[:first].strip():
+        segments.append(("", 1, 0, first, 1.0, data[:first].decode("utf-8", errors="replace")))
+    for index, section in enumerate(sections):
+        end = sections[index + 1].start if index + 1 < len(sections) else len(data)
+        titles = []
+        current: int | None = index
+        while current is not None:
+            titles.append(sections[current].title)
+            current = sections[current].parent
+        body = data[section.body_start : end].decode("utf-8", errors="replace")
+        text = (section.title + "\n") * (1 + _TITLE_BOOST) + body
+        segments.append(
+            (section.title, section.line, section.start, end, section_weight(titles), text)
+        )
+    return segments
+
+
+def _snippet(data: bytes, start: int, end: int, terms: set[str]) -> str:
+    text = _COMMENT.sub("", data[start:end].decode("utf-8", errors="replace"))
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[1:] + lines[:1]:
+        if terms & set(tokenize(line)):
+            line = line.lstrip("#-*> ").strip()
+            if len(line) > _SNIPPET_CHARS:
+                line = line[: _SNIPPET_CHARS - 3].rstrip() + "..."
+            return line
+    return ""
+
+
+class SearchIndex:
+    """Incrementally maintained full-text index for one workspace."""
+
+    def __init__(self, workspace: Path) -> None:
+        self.workspace = workspace
+        self.path = index_dir(workspace) / SEARCH_FILE
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SEARCH_VERSION:
+            for table in ("files", "sections", "postings", "stats"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version = {SEARCH_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _files(self) -> dict[str, tuple[str, str, str]]:
+        """Return relative path -> (feature, artifact, stamp) for every Markdown file."""
+        found = {}
+        for directory in feature_dirs(self.workspace):
+            pending = [(directory, "")]
+            while pending:
+                current, prefix = pending.pop()
+                try:
+                    entries = list(os.scandir(current))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    relative = prefix + entry.name
+                    try:
+                        if entry.is_dir():
+                            pending.append((entry.path, relative + "/"))
+                            continue
+                        if not entry.name.endswith(".md"):
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    found[f"{directory.name}/{relative}"] = (
+                        directory.name,
+                        relative[: -len(".md")],
+                        f"{stat.st_mtime_ns}:{stat.st_size}",
+                    )
+        return found
+
+    def _drop(self, file_id: int) -> None:
+        self.conn.execute(
+            "DELETE FROM postings WHERE section_id IN (SELECT id FROM sections WHERE file_id = ?)",
+            (file_id,),
+        )
+        self.conn.execute("DELETE FROM sections WHERE file_id = ?", (file_id,))
+        self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _add(self, relative: str, feature: str, artifact: str, stamp: str) -> None:
+        try:
+            data = (self.workspace / relative).read_bytes()
+        except OSError:
+            return
+        file_id = self.conn.execute(
+            "INSERT INTO files (path, feature, artifact, stamp) VALUES (?, ?, ?, ?)",
+            (relative, feature, artifact, stamp),
+        ).lastrowid
+        for title, line, start, end, weight, text in _segments(data):
+            terms = tokenize(_COMMENT.sub("", text))
+            if not terms:
+                continue
+            section_id = self.conn.execute(
+                "INSERT INTO sections (file_id, title, line, start, end, weight, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_id, title, line, start, end, weight, len(terms)),
+            ).lastrowid
+            counts: dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            self.conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)",
+                ((term, section_id, tf) for term, tf in counts.items()),
+            )
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the workspace.
+
+        Returns:
+            Number of files that were (re)indexed or removed.
+        """
+        stored = {
+            path: (file_id, stamp)
+            for file_id, path, stamp in self.conn.execute("SELECT id, path, stamp FROM files")
+        }
+        found = self._files()
+        changed = 0
+        with self.conn:
+            for relative, (file_id, stamp) in stored.items():
+                if found.get(relative, (None, None, None))[2] != stamp:
+                    self._drop(file_id)
+                    changed += 1
+            for relative, (feature, artifact, stamp) in found.items():
+                if relative in stored and stored[relative][1] == stamp:
+                    continue
+                self._add(relative, feature, artifact, stamp)
+                changed += relative not in stored
+            if changed:
+                count, average = self.conn.execute(
+                    "SELECT COUNT(*), AVG(length) FROM sections"
+                ).fetchone()
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO stats VALUES (?, ?)",
+                    (("sections", count), ("average_length", average or 0.0)),
+                )
+        return changed
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        feature: str | None = None,
+        artifact: str | None = None,
+    ) -> list[Hit]:
+        """Rank sections against a query.
+
+        Sections matching more of the query's terms rank first; ties are
+        broken by weighted BM25 score.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of hits.
+            feature: Only search features whose name starts with this.
+            artifact: Only search this artifact (e.g. "spec", "plan").
+
+        Returns:
+            Hits, best first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        stats = dict(self.conn.execute("SELECT key, value FROM stats"))
+        total = stats.get("sections", 0.0)
+        average = stats.get("average_length", 0.0) or 1.0
+        weights = []
+        for term in terms:
+            df = self.conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,))
+            df = df.fetchone()[0]
+            weights.append((term, math.log(1 + (total - df + 0.5) / (df + 0.5))))
+
+        values = ", ".join("(?, ?)" for _ in weights)
+        filters = ""
+        filter_params: list = []
+        if feature:
+            # An exact prefix test: LIKE would treat the "_" before a
+            # feature's suffix as a wildcard.
+            filters += " AND substr(f.feature, 1, ?) = ?"
+            filter_params += [len(feature), feature]
+        if artifact:
+            filters += " AND f.artifact = ?"
+            filter_params.append(artifact)
+        rows = self.conn.execute(
+            f"""
+            WITH q (term, idf) AS (VALUES {values})
+            SELECT f.path, f.feature, f.artifact, s.title, s.line, s.start, s.end,
+                   s.weight * SUM(q.idf * p.tf * {_K1 + 1}
+                       / (p.tf + {_K1} * (1 - {_B} + {_B} * s.length / ?))) AS score,
+                   COUNT(*) AS matched
+            FROM q
+            JOIN postings p ON p.term = q.term
+            JOIN sections s ON s.id = p.section_id
+            JOIN files f ON f.id = s.file_id
+            WHERE 1 {filters}
+            GROUP BY s.id
+            ORDER BY matched DESC, score DESC
+            LIMIT ?
+            """,
+            [*(value for pair in weights for value in pair), average, *filter_params, limit],
+        ).fetchall()
+
+        hits = []
+        query_terms = set(terms)
+        for path, feature_name, artifact_name, title, line, start, end, score, matched in rows:
+            try:
+                data = (self.workspace / path).read_bytes()
+                snippet = _snippet(data, start, end, query_terms)
+            except OSError:
+                snippet = ""
+            hits.append(
+                Hit(
+                    path,
+                    feature_name,
+                    artifact_name,
+                    title,
+                    line,
+                    round(score, 3),
+                    matched,
+                    snippet,
+                )
+            )
+        return hits
@@ -0,0 +1,397 @@
+"""Persistent template server for swhat.
+
+This module handles the `swhat serve` command, which keeps the template
+registry and agent command content resident behind a local Unix socket.
+Agent workflows shell out to `swhat template ...` several times per run;
+forwarding those calls to a warm daemon skips interpreter, click and
+content import costs on every call.
+
+Only the standard library is imported at module level so the thin client
+in `swhat.client` can use `forward()` without pulling in click.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+
+from swhat import __version__
+
+# Subcommands the client is allowed to forward to the daemon. They only
+# depend on the cwd, which the daemon switches to for each call.
+FORWARDED_COMMANDS = frozenset({"template"})
+
+# Options that write files. Invocations using them always run in-process,
+# so files are created with the caller's umask and credentials rather
+# than the daemon's.
+LOCAL_OPTIONS = frozenset({"--out"})
+
+# Seconds the client waits on the daemon before falling back in-process.
+CLIENT_TIMEOUT = 2.0
+
+# Seconds the daemon waits for a connection before re-checking whether a
+# shutdown was requested (e.g. by SIGTERM).
+POLL_INTERVAL = 0.5
+
+# Upper bound on a single request or response payload.
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def socket_path() -> str:
+    """Return the Unix socket path used by the daemon.
+
+    Resolution order: $SWHAT_SOCKET, $XDG_RUNTIME_DIR/swhat-serve.sock,
+    then a per-user directory under $TMPDIR (or /tmp).
+
+    Returns:
+        Absolute path to the socket file.
+    """
+    override = os.environ.get("SWHAT_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "swhat-serve.sock")
+    return os.path.join(_fallback_dir(), "serve.sock")
+
+
+def _fallback_dir() -> str:
+    """Return the per-user socket directory used without $XDG_RUNTIME_DIR."""
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    tmp_dir = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmp_dir, f"swhat-{uid}")
+
+
+def check_socket_dir(path: str) -> None:
+    """Check that a socket's directory cannot be used by other users.
+
+    Only the per-user directory under $TMPDIR is checked: it lives in a
+    world-writable location, so another user could create it first and
+    listen there. It must be a real directory owned by the current user
+    with mode 0700. $XDG_RUNTIME_DIR and $SWHAT_SOCKET locations are the
+    user's own choice and are trusted.
+
+    Raises:
+        OSError: If the directory is missing, a symlink, owned by another
+            user or accessible to others.
+    """
+    directory = os.path.dirname(path)
+    if not hasattr(os, "getuid") or directory != _fallback_dir():
+        return
+    info = os.lstat(directory)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise OSError(f"{directory} is not a directory")
+    if info.st_uid != os.getuid():
+        raise OSError(f"{directory} is owned by another user")
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        raise OSError(f"{directory} must have mode 0700, not {stat.S_IMODE(info.st_mode):o}")
+
+
+def _check_socket(path: str) -> None:
+    """Check that a daemon socket is safe to connect to.
+
+    Raises:
+        OSError: If the socket or its directory could belong to another user.
+    """
+    check_socket_dir(path)
+    if not hasattr(os, "getuid"):
+        return
+    info = os.lstat(path)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise OSError(f"{path} is not a socket")
+    if info.st_uid != os.getuid():
+        raise OSError(f"{path} is owned by another user")
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    """Read from a socket until the peer closes its write side."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_MESSAGE_BYTES:
+            raise OSError("message too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _request(message: dict, path: str | None = None, timeout: float = CLIENT_TIMEOUT) -> dict:
+    """Send one JSON request to the daemon and return its JSON response.
+
+    Raises:
+        OSError: If the daemon is unreachable, its socket could belong to
+            another user, or the exchange fails.
+        ValueError: If the response is not valid JSON.
+    """
+    path = path or socket_path()
+    _check_socket(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        return json.loads(_recv_all(sock).decode("utf-8"))
+    finally:
+        sock.close()
+
+
+def is_forwardable(argv: list[str]) -> bool:
+    """Return whether an invocation may run on the daemon."""
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return False
+    for arg in argv[1:]:
+        if arg == "--":
+            break
+        if arg.split("=", 1)[0] in LOCAL_OPTIONS:
+            return False
+    return True
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a CLI invocation on the daemon if one is available.
+
+    Args:
+        argv: Command-line arguments, excluding the program name.
+
+    Returns:
+        The exit code of the forwarded command, or None if the call was not
+        forwarded (unsupported command or option, no daemon, version
+        mismatch, or any communication error) and must run in-process instead.
+    """
+    if not is_forwardable(argv):
+        return None
+    if os.environ.get("SWHAT_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    if not os.path.exists(path):
+        return None
+
+    message = {"op": "run", "version": __version__, "argv": argv, "cwd": os.getcwd()}
+    try:
+        response = _request(message, path)
+    except (OSError, ValueError):
+        return None
+    if response.get("version") != __version__ or "exit_code" not in response:
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stderr.flush()
+    return int(response["exit_code"])
+
+
+def ping(path: str | None = None) -> str | None:
+    """Check whether a daemon is listening.
+
+    Returns:
+        The daemon's swhat version if it answered, None otherwise.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        response = _request({"op": "ping"}, path)
+    except (OSError, ValueError):
+        return None
+    return response.get("version")
+
+
+def stop(path: str | None = None) -> bool:
+    """Ask a running daemon to shut down.
+
+    Returns:
+        True if a daemon acknowledged the request, False otherwise.
+    """
+    try:
+        response = _request({"op": "shutdown"}, path)
+    except (OSError, ValueError):
+        return False
+    return bool(response.get("ok"))
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """Map a SystemExit raised by click to a numeric exit code."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    return 1
+
+
+def _run_cli(argv: list[str], cwd: str) -> dict:
+    """Run a CLI invocation in-process, capturing its output."""
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+
+    from swhat.cli import main as cli_main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                cli_main.main(args=argv, prog_name="swhat", standalone_mode=True)
+            except SystemExit as exc:
+                exit_code = _exit_code(exc)
+    except OSError as exc:
+        stderr.write(f"Error: {exc}\n")
+        exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+def _handle(message: dict) -> tuple[dict, bool]:
+    """Dispatch one daemon request.
+
+    Returns:
+        Tuple of (response, shutdown_requested).
+    """
+    op = message.get("op", "run")
+    if op == "ping":
+        return {"version": __version__, "pid": os.getpid()}, False
+    if op == "shutdown":
+        return {"version": __version__, "ok": True}, True
+    if op != "run":
+        return {"version": __version__, "error": f"unknown op '{op}'"}, False
+    if message.get("version") != __version__:
+        return {"version": __version__, "error": "version mismatch"}, False
+
+    argv = [str(arg) for arg in message.get("argv") or []]
+    if not is_forwardable(argv):
+        return {"version": __version__, "error": "command not served"}, False
+    response = _run_cli(argv, str(message.get("cwd") or os.getcwd()))
+    response["version"] = __version__
+    return response, False
+
+
+def _preload() -> None:
+    """Import all template and command content so it stays resident."""
+    import swhat.cli  # noqa: F401
+    import swhat.template_cli  # noqa: F401
+    from swhat.commands import COMMAND_MODULES, load_command_content
+    from swhat.templates import TEMPLATE_MODULES, load_template_content
+
+    for name in TEMPLATE_MODULES:
+        load_template_content(name)
+    for name in COMMAND_MODULES:
+        load_command_content(name)
+
+
+def serve(path: str | None = None, echo=None) -> bool:
+    """Run the template daemon in the foreground until stopped.
+
+    Args:
+        path: Socket path to listen on. Defaults to `socket_path()`.
+        echo: Callable used for status messages.
+
+    Returns:
+        True on clean shutdown, False if the daemon could not start.
+    """
+    import signal
+    import socketserver
+
+    echo = echo or print
+    if not hasattr(socket, "AF_UNIX"):
+        echo("Error: swhat serve requires Unix domain socket support.")
+        return False
+
+    path = path or socket_path()
+    running = ping(path)
+    if running is not None:
+        echo(f"Error: swhat serve {running} is already listening on {path}")
+        return False
+
+    socket_dir = os.path.dirname(path)
+    try:
+        if socket_dir:
+            os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        check_socket_dir(path)
+    except OSError as exc:
+        echo(f"Error: Refusing to listen on {path}: {exc}")
+        return False
+    if os.path.lexists(path):
+        # Stale socket left behind by a daemon that did not shut down cleanly.
+        os.unlink(path)
+
+    _preload()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                message = json.loads(_recv_all(self.connection).decode("utf-8"))
+                if not isinstance(message, dict):
+                    raise ValueError("request must be a JSON object")
+            except (OSError, ValueError) as exc:
+                response, shutdown = {"version": __version__, "error": str(exc)}, False
+            else:
+                response, shutdown = _handle(message)
+            self.wfile.write(json.dumps(response).encode("utf-8"))
+            if shutdown:
+                self.server.shutdown_requested = True
+
+    server = socketserver.UnixStreamServer(path, Handler)
+    server.shutdown_requested = False
+    # handle_request() returns after this long without a connection, so a
+    # shutdown requested by a signal takes effect without waiting for a client.
+    server.timeout = POLL_INTERVAL
+    os.chmod(path, 0o600)
+
+    def _terminate(signum, frame):
+        server.shutdown_requested = True
+
+    signal.signal(signal.SIGTERM, _terminate)
+    echo(f"swhat serve {__version__} listening on {path} (pid {os.getpid()})")
+    try:
+        while not server.shutdown_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+    echo("swhat serve stopped")
+    return True
+
+
+def serve_detached(path: str | None = None, wait: float = 5.0) -> bool:
+    """Start the daemon in a background process and wait until it answers.
+
+    Returns:
+        True if the daemon is reachable after starting, False otherwise.
+    """
+    import subprocess
+    import time
+
+    path = path or socket_path()
+    if ping(path) is not None:
+        return True
+    command = [
+        sys.executable,
+        "-c",
+        "from swhat.cli import main; main()",
+        "serve",
+        "--socket",
+        path,
+    ]
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if ping(path) is not None:
+            return True
+        time.sleep(0.05)
+    return False
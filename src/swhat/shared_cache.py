@@ -0,0 +1,136 @@
+"""Machine-wide shared install cache for swhat init.
+
+With `swhat init --shared`, each installed agent file is materialized once
+in a per-user cache and linked into projects instead of being copied:
+
+    <cache>/store/<sha256>                  content-addressed, read-only
+    <cache>/versions/<version>/<rel path>   hard links into store/
+    <cache>/current -> versions/<version>   switched atomically on install
+
+Hard-link mode links project files to `store/` so every checkout shares
+one inode per file version. Symlink mode points project files at
+`current/`, so installing a new swhat version anywhere re-targets every
+linked project at once.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from swhat.fsutil import atomic_write_text, sha256_text
+
+# Supported link modes for shared installs
+LINK_MODES = ("hardlink", "symlink")
+
+
+def cache_dir() -> Path:
+    """Return the shared cache root.
+
+    Resolution order: $SWHAT_CACHE_DIR, %LOCALAPPDATA%/swhat on Windows,
+    $XDG_CACHE_HOME/swhat, then ~/.cache/swhat.
+    """
+    override = os.environ.get("SWHAT_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "swhat"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    if xdg:
+        return Path(xdg) / "swhat"
+    return Path.home() / ".cache" / "swhat"
+
+
+def _temp_sibling(path: Path) -> Path:
+    return path.parent / f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+
+
+def _replace_with_link(path: Path, target: Path, mode: str) -> None:
+    """Atomically replace path with a hard or symbolic link to target."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _temp_sibling(path)
+    try:
+        if mode == "hardlink":
+            os.link(target, tmp_path)
+        else:
+            os.symlink(target, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _store(cache: Path, content: str) -> Path:
+    """Materialize content once in the content-addressed store."""
+    blob = cache / "store" / sha256_text(content)
+    if not blob.exists():
+        atomic_write_text(blob, content)
+        # Shared inodes must not be edited through a project checkout.
+        os.chmod(blob, 0o444)
+    return blob
+
+
+def prepare(files: dict[str, str], version: str, cache: Path | None = None) -> dict[str, Path]:
+    """Materialize a version of the installed files in the shared cache.
+
+    Args:
+        files: Mapping of path relative to the project root -> content.
+        version: swhat version the files belong to.
+        cache: Cache root. Defaults to `cache_dir()`.
+
+    Returns:
+        Mapping of relative path -> content-addressed store file.
+    """
+    cache = cache or cache_dir()
+    version_dir = cache / "versions" / version
+    blobs = {}
+    for relative_path, content in files.items():
+        blob = _store(cache, content)
+        blobs[relative_path] = blob
+        entry = version_dir / relative_path
+        if not (entry.exists() and os.path.samefile(entry, blob)):
+            try:
+                _replace_with_link(entry, blob, "hardlink")
+            except OSError:
+                atomic_write_text(entry, content)
+
+    current = cache / "current"
+    target = Path("versions") / version
+    if not (current.is_symlink() and Path(os.readlink(current)) == target):
+        _replace_with_link(current, target, "symlink")
+    return blobs
+
+
+def link_file(
+    path: Path, relative_path: str, blob: Path, mode: str, cache: Path | None = None
+) -> str:
+    """Link one installed file into a project.
+
+    Args:
+        path: Destination inside the project.
+        relative_path: Destination relative to the project root.
+        blob: Store file returned by `prepare()` for this path.
+        mode: "hardlink" or "symlink".
+        cache: Cache root. Defaults to `cache_dir()`.
+
+    Returns:
+        "Created", "Updated" or "Unchanged".
+
+    Raises:
+        OSError: If the link cannot be created (e.g. the project is on a
+            different filesystem for hard links, or symlinks are not
+            permitted). Callers fall back to a plain copy.
+    """
+    if mode == "symlink":
+        target = (cache or cache_dir()) / "current" / relative_path
+        if path.is_symlink() and Path(os.readlink(path)) == target:
+            return "Unchanged"
+    else:
+        target = blob
+        if not path.is_symlink() and path.exists() and os.path.samefile(path, blob):
+            return "Unchanged"
+    action = "Updated" if os.path.lexists(path) else "Created"
+    _replace_with_link(path, target, mode)
+    return action
@@ -0,0 +1,173 @@
+"""Section-addressable reads of feature artifacts.
+
+This module handles the `swhat show` command, which returns only the
+requested slices of a feature's Markdown artifacts: named sections,
+numbered items such as FR-003 or T012, and user stories. The heading
+index comes from `swhat.artifact_parser` and is cached per file version,
+so each slice is a single seek and read instead of a full-file scan.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.artifact_parser import Document, parse_file
+
+# Artifact name -> candidate paths, in the order they are searched
+SHOW_ARTIFACTS: dict[str, tuple[str, ...]] = {
+    "spec": ("spec.md",),
+    "plan": ("plan.md",),
+    "tasks": ("tasks.md",),
+    "research": ("research.md",),
+    "data-model": ("data-model.md",),
+    "quickstart": ("quickstart.md",),
+    "requirements": ("requirements.md", "checklists/requirements.md"),
+}
+
+_STORY_REF = re.compile(r"^(?:US)?(\d+)$", re.IGNORECASE)
+
+
+@dataclass
+class Slice:
+    """One requested part of an artifact."""
+
+    artifact: str
+    path: str
+    kind: str
+    key: str
+    title: str
+    line: int
+    content: str
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+def artifact_paths(feature: Path, names: list[str] | None = None) -> dict[str, Path]:
+    """Return the existing Markdown artifacts of a feature, in search order."""
+    found = {}
+    for name, candidates in SHOW_ARTIFACTS.items():
+        if names and name not in names:
+            continue
+        for candidate in candidates:
+            path = feature / candidate
+            if path.is_file():
+                found[name] = path
+                break
+    return found
+
+
+def _read_range(path: Path, start: int, end: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8", errors="replace")
+
+
+def _read_line(path: Path, start: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.readline().decode("utf-8", errors="replace")
+
+
+def _find_section(docs: dict[str, tuple[Path, Document]], heading: str) -> list[Slice]:
+    for name, (path, doc) in docs.items():
+        matches = doc.find_sections(heading)
+        if matches:
+            return [
+                Slice(
+                    name,
+                    str(path),
+                    "section",
+                    heading,
+                    s.title,
+                    s.line,
+                    _read_range(path, s.start, s.end),
+                )
+                for s in matches
+            ]
+    return []
+
+
+def _find_item(docs: dict[str, tuple[Path, Document]], item_id: str) -> list[Slice]:
+    item_id = item_id.upper()
+    for name, (path, doc) in docs.items():
+        for item in doc.items:
+            if item.id == item_id:
+                content = _read_range(path, item.start, item.end)
+                return [Slice(name, str(path), "item", item_id, item.id, item.line, content)]
+        for task in doc.tasks:
+            if task.id == item_id:
+                content = _read_line(path, task.start)
+                return [Slice(name, str(path), "task", item_id, task.id, task.line, content)]
+    return []
+
+
+def _find_story(docs: dict[str, tuple[Path, Document]], story: str) -> list[Slice]:
+    match = _STORY_REF.match(story.strip())
+    if not match:
+        return []
+    number = int(match.group(1))
+    for name, (path, doc) in docs.items():
+        for entry in doc.stories:
+            if entry.number == number:
+                section = doc.sections[entry.section]
+                content = _read_range(path, section.start, section.end)
+                return [
+                    Slice(name, str(path), "story", entry.tag, section.title, entry.line, content)
+                ]
+    return []
+
+
+def show(
+    feature: Path,
+    sections: list[str],
+    items: list[str],
+    stories: list[str],
+    artifacts: list[str] | None = None,
+) -> tuple[list[Slice], list[str]]:
+    """Collect the requested slices of a feature's artifacts.
+
+    Each selector is resolved against the artifacts in SHOW_ARTIFACTS
+    order; the first artifact that contains a match wins.
+
+    Args:
+        feature: Feature directory.
+        sections: Heading titles (case-insensitive; a prefix matches if
+            no heading matches exactly).
+        items: Item IDs such as FR-003, SC-001 or T012.
+        stories: User story references such as US2 or 2.
+        artifacts: Restrict the search to these artifact names.
+
+    Returns:
+        Tuple of (slices in request order, selectors that matched nothing).
+
+    Raises:
+        OSError: If an artifact cannot be read.
+    """
+    docs = {
+        name: (path, parse_file(path)) for name, path in artifact_paths(feature, artifacts).items()
+    }
+    slices = []
+    missing = []
+    requests = (
+        [(_find_section, s, "section") for s in sections]
+        + [(_find_item, i, "item") for i in items]
+        + [(_find_story, s, "story") for s in stories]
+    )
+    for finder, key, kind in requests:
+        found = finder(docs, key)
+        if found:
+            slices.extend(found)
+        else:
+            missing.append(f"{kind} '{key}'")
+    return slices, missing
+
+
+def outline(feature: Path, artifacts: list[str] | None = None) -> dict[str, list[dict]]:
+    """Return the heading index of each artifact: level, title and line."""
+    result = {}
+    for name, path in artifact_paths(feature, artifacts).items():
+        doc = parse_file(path)
+        result[name] = [{"level": s.level, "title": s.title, "line": s.line} for s in doc.sections]
+    return result
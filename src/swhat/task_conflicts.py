@@ -0,0 +1,180 @@
+"""File-conflict detection for parallel tasks in tasks.md.
+
+This module handles `swhat tasks conflicts`. The tasks template defines
+[P] as "different files, no dependencies"; this checks it. File paths are
+extracted from each task description and indexed (path -> tasks). Two
+tasks conflict when they touch the same path, or one names a directory
+containing the other's file, and the task graph does not order them, so
+an executor may run them at the same time (e.g. in the same wave).
+
+Conflicts between [P] tasks of the same phase can be fixed by demoting
+the later task: dropping its [P] marker makes it wait for the tasks
+listed before it. Conflicts across parallel user story phases cannot be
+fixed that way and are only reported.
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from swhat.artifact_parser import Document, Task
+from swhat.task_file import edit_task_lines
+from swhat.task_graph import TaskGraph, build_graph, schedule
+
+_TOKEN_STRIP = "`'\"()[]{}<>,;:"
+_FILE_NAME = re.compile(r"^[\w.\-\[\]{}]{2,}\.[A-Za-z][A-Za-z0-9]{0,7}$")
+_PARALLEL_TAG = re.compile(r"\[P\]\s*")
+
+
+@dataclass
+class Conflict:
+    """Tasks that may run concurrently while touching the same path."""
+
+    path: str
+    tasks: list[str]
+    # Tasks whose [P] marker can be dropped to order them
+    demotable: list[str] = field(default_factory=list)
+
+
+def extract_paths(description: str) -> list[str]:
+    """Extract file and directory paths mentioned in a task description.
+
+    A token counts as a path if it ends with "/", has a file extension, or
+    contains at least two "/" separators, so prose such as "and/or" is
+    not mistaken for a path.
+    """
+    paths = []
+    for token in description.split():
+        token = token.lstrip(_TOKEN_STRIP).rstrip(_TOKEN_STRIP + ".")
+        if not token or "://" in token:
+            continue
+        if token.startswith("./"):
+            token = token[2:]
+        name = token.rsplit("/", 1)[-1]
+        if token.endswith("/") or _FILE_NAME.match(name) or token.count("/") >= 2:
+            paths.append(token)
+    return list(dict.fromkeys(paths))
+
+
+def path_index(tasks: list[Task]) -> dict[str, list[str]]:
+    """Return path -> IDs of the tasks that mention it, in task order."""
+    index: dict[str, list[str]] = {}
+    for task in tasks:
+        for path in extract_paths(task.description):
+            index.setdefault(path, []).append(task.id)
+    return index
+
+
+def _ancestors(graph: TaskGraph) -> dict[str, int]:
+    """Return task ID -> bitset of all its transitive dependencies."""
+    bit = {task_id: 1 << index for index, task_id in enumerate(graph.tasks)}
+    result: dict[str, int] = {}
+    entered: set[str] = set()
+    # Explicit stack so long dependency chains cannot hit the recursion limit.
+    for root in graph.tasks:
+        stack = [root]
+        while stack:
+            task_id = stack[-1]
+            if task_id in result:
+                stack.pop()
+            elif task_id not in entered:
+                entered.add(task_id)
+                # Entered dependencies are done or on a cycle; schedule() reports cycles.
+                stack.extend(dep for dep in graph.deps[task_id] if dep not in entered)
+            else:
+                mask = 0
+                for dep in graph.deps[task_id]:
+                    mask |= bit[dep] | result.get(dep, 0)
+                result[task_id] = mask
+                stack.pop()
+    return result
+
+
+def _overlaps(index: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Return path -> tasks touching it, including tasks naming a parent directory."""
+    directories = [path for path in index if path.endswith("/")]
+    touching = {path: list(ids) for path, ids in index.items()}
+    for path, ids in index.items():
+        for directory in directories:
+            if path != directory and path.startswith(directory):
+                touching[path] = list(dict.fromkeys(touching[path] + index[directory]))
+    return touching
+
+
+def find_conflicts(doc: Document, include_done: bool = False) -> list[Conflict]:
+    """Find unordered tasks that touch overlapping paths.
+
+    Args:
+        doc: Document parsed from tasks.md.
+        include_done: Also check completed tasks.
+
+    Returns:
+        Conflicts, one per path, in path order.
+
+    Raises:
+        ValueError: If the task dependencies contain a cycle.
+    """
+    graph = build_graph(doc)
+    schedule(graph, include_done=True)  # raises on cycles
+    ancestors = _ancestors(graph)
+    bit = {task_id: 1 << index for index, task_id in enumerate(graph.tasks)}
+    candidates = [t for t in graph.tasks.values() if include_done or not t.done]
+
+    conflicts = []
+    for path, ids in sorted(_overlaps(path_index(candidates)).items()):
+        involved: list[str] = []
+        demotable: list[str] = []
+        for later_pos, later in enumerate(ids):
+            for earlier in ids[:later_pos]:
+                if ancestors[later] & bit[earlier] or ancestors[earlier] & bit[later]:
+                    continue
+                involved += [earlier, later]
+                task = graph.tasks[later]
+                if task.parallel and task.phase == graph.tasks[earlier].phase:
+                    demotable.append(later)
+        if involved:
+            conflicts.append(
+                Conflict(path, list(dict.fromkeys(involved)), list(dict.fromkeys(demotable)))
+            )
+    return conflicts
+
+
+def plan_demotions(doc: Document) -> list[str]:
+    """Choose the [P] markers to drop so same-phase conflicts disappear.
+
+    Demotes one task at a time and re-checks, since each demotion changes
+    the ordering of the tasks after it.
+
+    Returns:
+        IDs of the tasks to demote, in task order.
+    """
+    tasks = [replace(task) for task in doc.tasks]
+    current = replace(doc, tasks=tasks)
+    order = {task.id: index for index, task in enumerate(tasks)}
+    demoted: list[str] = []
+    while True:
+        candidates = [c.demotable[0] for c in find_conflicts(current) if c.demotable]
+        if not candidates:
+            break
+        first = min(candidates, key=order.__getitem__)
+        for task in tasks:
+            if task.id == first:
+                task.parallel = False
+        demoted.append(first)
+    return sorted(demoted, key=order.__getitem__)
+
+
+def demote(path: Path, task_ids: set[str]) -> list[str]:
+    """Drop the [P] marker from the given tasks in tasks.md.
+
+    Returns:
+        IDs of the tasks whose lines changed.
+    """
+
+    def drop_parallel(task: Task, line: str) -> str | None:
+        if task.id not in task_ids or not task.parallel:
+            return None
+        start = line.index(task.id) + len(task.id)
+        return line[:start] + _PARALLEL_TAG.sub("", line[start:], count=1)
+
+    return edit_task_lines(path, drop_parallel)
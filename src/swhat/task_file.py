@@ -0,0 +1,77 @@
+"""Locked in-place edits to task lines in tasks.md.
+
+Several swhat commands rewrite individual task lines (ticking a checkbox,
+dropping a [P] marker) while agents may be doing the same. Every edit
+takes an exclusive lock on a sibling lock file, re-parses the current
+content, rewrites only the affected lines and replaces the file
+atomically, so concurrent writers never lose each other's changes.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from swhat.artifact_parser import Task, parse_bytes
+from swhat.fsutil import atomic_write_text, file_lock
+from swhat.workspace import ignore_sidecars
+
+
+def lock_path(path: Path) -> Path:
+    """Return the lock file guarding edits to a tasks.md."""
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """Hold the edit lock for a tasks.md."""
+    ignore_sidecars(path)
+    with file_lock(lock_path(path)):
+        yield
+
+
+def edit_task_lines(path: Path, edit: Callable[[Task, str], str | None]) -> list[str]:
+    """Rewrite task lines in place under the edit lock.
+
+    Args:
+        path: tasks.md to edit.
+        edit: Called with each task and its line (without line ending);
+            returns the replacement line, or None to leave it unchanged.
+
+    Returns:
+        IDs of the tasks whose lines changed.
+
+    Raises:
+        OSError: If the file cannot be read or written.
+    """
+    with locked(path):
+        data = path.read_bytes()
+        doc = parse_bytes(data, "tasks")
+        # Split the bytes as the parser does: str.splitlines() would also
+        # break on form feeds, U+2028 and the like, shifting line numbers.
+        lines = [line.decode("utf-8") for line in data.splitlines(keepends=True)]
+        by_line = {task.line: task for task in doc.tasks}
+        changed = []
+        for number, task in by_line.items():
+            line = lines[number - 1]
+            body = line.rstrip("\r\n")
+            replacement = edit(task, body)
+            if replacement is None or replacement == body:
+                continue
+            lines[number - 1] = replacement + line[len(body) :]
+            changed.append(task.id)
+        if changed:
+            atomic_write_text(path, "".join(lines))
+    return changed
+
+
+def set_done(path: Path, task_ids: set[str], done: bool = True) -> list[str]:
+    """Tick (or untick) the checkboxes of the given tasks."""
+    mark = "x" if done else " "
+
+    def tick(task: Task, line: str) -> str | None:
+        if task.id not in task_ids or task.done == done:
+            return None
+        index = line.index("[") + 1
+        return line[:index] + mark + line[index + 1 :]
+
+    return edit_task_lines(path, tick)
@@ -0,0 +1,253 @@
+"""Task dependency graph and wave scheduling for tasks.md.
+
+This module handles `swhat tasks graph`. It turns the tasks parsed by
+`swhat.artifact_parser` into a DAG using the ordering rules of the tasks
+template:
+
+- Phases run in order, except that consecutive user story phases run in
+  parallel with each other once the preceding phases are complete.
+- Within a phase, tasks run in listed order. A [P] task depends only on
+  the last non-[P] task before it, so a run of [P] tasks can execute
+  together; the next non-[P] task waits for the whole run.
+- "depends on T012, T013" notes in a task description add explicit edges.
+
+From the DAG it computes topological waves (tasks that can run at the
+same time), the critical path, and the maximum useful parallelism.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from swhat.artifact_parser import Document, Task
+
+_STORY_PHASE = re.compile(r"\bUser Stor(?:y|ies)\b", re.IGNORECASE)
+
+
+@dataclass
+class PhaseGroup:
+    """Tasks of one phase, in listed order."""
+
+    title: str
+    tasks: list[Task]
+    story: bool
+
+
+@dataclass
+class TaskGraph:
+    """Dependency graph over the tasks of one tasks.md."""
+
+    tasks: dict[str, Task]
+    # Task ID -> IDs it depends on
+    deps: dict[str, set[str]]
+    phases: list[PhaseGroup]
+    warnings: list[str] = field(default_factory=list)
+
+    def dependents(self) -> dict[str, set[str]]:
+        """Return task ID -> IDs of tasks that depend on it."""
+        result: dict[str, set[str]] = {task_id: set() for task_id in self.tasks}
+        for task_id, deps in self.deps.items():
+            for dep in deps:
+                result[dep].add(task_id)
+        return result
+
+
+@dataclass
+class Schedule:
+    """Waves of concurrently runnable tasks and the critical path."""
+
+    waves: list[list[str]]
+    critical_path: list[str]
+    max_parallelism: int
+
+
+def _phase_groups(doc: Document) -> list[PhaseGroup]:
+    """Group tasks by phase; tasks outside any phase form their own group."""
+    groups: list[PhaseGroup] = []
+    current: int | None | str = "start"
+    for task in doc.tasks:
+        if task.phase != current:
+            current = task.phase
+            title = doc.phases[task.phase].title if task.phase is not None else "Tasks"
+            groups.append(PhaseGroup(title, [], False))
+        groups[-1].tasks.append(task)
+    for group in groups:
+        group.story = bool(_STORY_PHASE.search(group.title)) or any(
+            task.story for task in group.tasks
+        )
+    return groups
+
+
+def _link_phase(group: PhaseGroup, entry: set[str], deps: dict[str, set[str]]) -> set[str]:
+    """Add the ordering edges inside one phase.
+
+    Args:
+        group: The phase's tasks.
+        entry: Tasks the phase waits for.
+        deps: Dependency map to update.
+
+    Returns:
+        The phase's exit tasks: those every later phase must wait for.
+    """
+    barrier = set(entry)
+    parallel_run: list[str] = []
+    for task in group.tasks:
+        if task.parallel:
+            deps[task.id] |= barrier
+            parallel_run.append(task.id)
+        else:
+            deps[task.id] |= set(parallel_run) if parallel_run else barrier
+            barrier = {task.id}
+            parallel_run = []
+    return set(parallel_run) if parallel_run else barrier
+
+
+def build_graph(doc: Document) -> TaskGraph:
+    """Build the dependency graph for a parsed tasks.md.
+
+    Args:
+        doc: Document parsed from tasks.md.
+
+    Returns:
+        The task graph. Unknown or duplicate task references are reported
+        in `warnings` and ignored.
+    """
+    tasks: dict[str, Task] = {}
+    warnings = []
+    for task in doc.tasks:
+        if task.id in tasks:
+            warnings.append(f"Duplicate task ID {task.id} on line {task.line}; ignored")
+            continue
+        tasks[task.id] = task
+
+    groups = _phase_groups(doc)
+    for group in groups:
+        group.tasks = [t for t in group.tasks if tasks.get(t.id) is t]
+    deps: dict[str, set[str]] = {task_id: set() for task_id in tasks}
+
+    # Consecutive story phases share one entry set and run side by side.
+    entry: set[str] = set()
+    story_exits: set[str] = set()
+    for group in groups:
+        if group.story:
+            story_exits |= _link_phase(group, entry, deps)
+            continue
+        if story_exits:
+            entry = story_exits
+            story_exits = set()
+        entry = _link_phase(group, entry, deps)
+
+    for task in tasks.values():
+        for dep in task.depends_on:
+            if dep == task.id:
+                continue
+            if dep not in tasks:
+                warnings.append(f"{task.id} depends on unknown task {dep}")
+                continue
+            deps[task.id].add(dep)
+    return TaskGraph(tasks, deps, groups, warnings)
+
+
+def schedule(graph: TaskGraph, include_done: bool = False) -> Schedule:
+    """Compute waves, the critical path and the maximum parallelism.
+
+    Completed tasks are treated as already satisfied and left out of the
+    schedule unless `include_done` is set.
+
+    Raises:
+        ValueError: If the dependencies contain a cycle.
+    """
+    pending = {task_id for task_id, task in graph.tasks.items() if include_done or not task.done}
+    position = {task_id: index for index, task_id in enumerate(graph.tasks)}
+    indegree = {t: sum(1 for d in graph.deps[t] if d in pending) for t in pending}
+    dependents = graph.dependents()
+    ready = sorted((t for t, n in indegree.items() if n == 0), key=position.__getitem__)
+    level: dict[str, int] = {t: 0 for t in ready}
+    via: dict[str, str | None] = {t: None for t in ready}
+    visited = 0
+    while ready:
+        task_id = ready.pop()
+        visited += 1
+        for child in dependents[task_id]:
+            if child not in pending:
+                continue
+            if level[task_id] + 1 > level.get(child, -1):
+                level[child] = level[task_id] + 1
+                via[child] = task_id
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if visited < len(pending):
+        cycle = sorted((t for t, n in indegree.items() if n > 0), key=position.__getitem__)
+        raise ValueError(f"Dependency cycle among tasks: {', '.join(cycle)}")
+
+    order = list(graph.tasks)
+    waves: list[list[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for task_id in order:
+        if task_id in level:
+            waves[level[task_id]].append(task_id)
+
+    critical_path: list[str] = []
+    if level:
+        node: str | None = max(order, key=lambda t: level.get(t, -1))
+        while node is not None:
+            critical_path.append(node)
+            node = via[node]
+        critical_path.reverse()
+    return Schedule(waves, critical_path, max((len(w) for w in waves), default=0))
+
+
+def to_dict(graph: TaskGraph, plan: Schedule) -> dict:
+    """Return the graph and schedule as a JSON-serializable dict."""
+    order = {task_id: index for index, task_id in enumerate(graph.tasks)}
+    return {
+        "tasks": [
+            {
+                "id": task.id,
+                "done": task.done,
+                "parallel": task.parallel,
+                "story": task.story,
+                "phase": task.phase,
+                "line": task.line,
+                "description": task.description,
+                "depends_on": sorted(graph.deps[task.id], key=order.__getitem__),
+            }
+            for task in graph.tasks.values()
+        ],
+        "phases": [
+            {"title": group.title, "story": group.story, "tasks": [t.id for t in group.tasks]}
+            for group in graph.phases
+        ],
+        "waves": plan.waves,
+        "critical_path": plan.critical_path,
+        "max_parallelism": plan.max_parallelism,
+        "warnings": graph.warnings,
+    }
+
+
+def _dot_label(text: str, limit: int = 48) -> str:
+    if len(text) > limit:
+        text = text[: limit - 1] + "…"
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_dot(graph: TaskGraph, plan: Schedule) -> str:
+    """Render the graph in Graphviz DOT format, one cluster per phase."""
+    critical = set(plan.critical_path)
+    lines = ["digraph tasks {", "  rankdir=LR;", "  node [shape=box, fontsize=10];"]
+    for index, group in enumerate(graph.phases):
+        lines.append(f"  subgraph cluster_{index} {{")
+        lines.append(f'    label="{_dot_label(group.title, 64)}";')
+        for task in group.tasks:
+            attrs = [f'label="{task.id}\\n{_dot_label(task.description)}"']
+            if task.done:
+                attrs.append('style=filled, fillcolor="#dddddd"')
+            if task.id in critical:
+                attrs.append("penwidth=2")
+            lines.append(f'    "{task.id}" [{", ".join(attrs)}];')
+        lines.append("  }")
+    for task_id, deps in graph.deps.items():
+        for dep in sorted(deps):
+            style = " [penwidth=2]" if dep in critical and task_id in critical else ""
+            lines.append(f'  "{dep}" -> "{task_id}"{style};')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+"""Incremental task state index for tasks.md.
+
+This module backs `swhat tasks next`, `status` and `progress`. Parsing a
+long tasks.md and rebuilding its task graph on every agent query is the
+expensive part, and between queries the file usually changes only by a
+ticked checkbox. The index (`.tasks.md.index`, beside tasks.md) stores
+the graph, the byte offset of every task checkbox and a hash of the file
+with those checkboxes masked out, and is refreshed by the cheapest check
+that is still correct:
+
+- size, mtime and inode unchanged: use the index as is (the inode
+  catches atomic replacements on filesystems with coarse mtimes)
+- size unchanged and the masked hash still matches: only checkboxes
+  changed, so read the done states at the stored offsets
+- otherwise: re-parse the file and rebuild the index
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from swhat.artifact_parser import parse_bytes
+from swhat.fsutil import atomic_write_text
+from swhat.task_graph import build_graph
+from swhat.workspace import ignore_sidecars
+
+# Bump when the index layout changes; forces a rebuild
+INDEX_VERSION = 2
+
+# Task states
+DONE = "done"
+READY = "ready"
+CLAIMED = "claimed"
+BLOCKED = "blocked"
+
+# Placeholder for the checkbox characters when hashing the file
+_MASK = ord("?")
+_MARKS = {ord(" "): False, ord("x"): True, ord("X"): True}
+
+
+@dataclass
+class IndexedTask:
+    """A task line as recorded in the index."""
+
+    id: str
+    done: bool
+    description: str
+    phase: int | None
+    story: str | None
+    # Byte offset of the checkbox character
+    checkbox: int
+    deps: list[str] = field(default_factory=list)
+
+
+@dataclass
+class TaskIndex:
+    """Completion state and dependency graph of one tasks.md."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+    # SHA-256 of the file with every task checkbox masked
+    skeleton: str
+    phases: list[str]
+    tasks: list[IndexedTask]
+    # How the last load was satisfied: "cached", "checkboxes" or "parsed"
+    refresh: str = "parsed"
+
+    def states(self, claimed: set[str] | None = None) -> dict[str, str]:
+        """Return task ID -> state, in task order."""
+        claimed = claimed or set()
+        done = {task.id for task in self.tasks if task.done}
+        result = {}
+        for task in self.tasks:
+            if task.done:
+                result[task.id] = DONE
+            elif task.id in claimed:
+                result[task.id] = CLAIMED
+            elif all(dep in done for dep in task.deps):
+                result[task.id] = READY
+            else:
+                result[task.id] = BLOCKED
+        return result
+
+    def get(self, task_id: str) -> IndexedTask | None:
+        """Return the task with the given ID, if any."""
+        return next((task for task in self.tasks if task.id == task_id), None)
+
+    def phase_title(self, task: IndexedTask) -> str | None:
+        """Return the title of the task's phase."""
+        return self.phases[task.phase] if task.phase is not None else None
+
+
+def index_path(tasks_file: Path) -> Path:
+    """Return the index file for a tasks.md."""
+    return tasks_file.with_name(f".{tasks_file.name}.index")
+
+
+def _skeleton(data: bytes, checkboxes: list[int]) -> str:
+    masked = bytearray(data)
+    for offset in checkboxes:
+        masked[offset] = _MASK
+    return hashlib.sha256(masked).hexdigest()
+
+
+def _build(tasks_file: Path) -> TaskIndex:
+    with open(tasks_file, "rb") as f:
+        data = f.read()
+        stat = os.fstat(f.fileno())
+    doc = parse_bytes(data, "tasks")
+    graph = build_graph(doc)
+    tasks = [
+        IndexedTask(
+            task.id,
+            task.done,
+            task.description,
+            task.phase,
+            task.story,
+            task.checkbox,
+            [dep for dep in graph.tasks if dep in graph.deps[task.id]],
+        )
+        for task in graph.tasks.values()
+    ]
+    skeleton = _skeleton(data, [task.checkbox for task in tasks])
+    phases = [phase.title for phase in doc.phases]
+    return TaskIndex(stat.st_size, stat.st_mtime_ns, stat.st_ino, skeleton, phases, tasks)
+
+
+def _refresh_checkboxes(tasks_file: Path, index: TaskIndex) -> bool:
+    """Update the done states if nothing but checkboxes changed.
+
+    Returns:
+        True if the index is current, False if a full rebuild is needed.
+    """
+    data = tasks_file.read_bytes()
+    if len(data) != index.size:
+        return False
+    marks = [data[task.checkbox] for task in index.tasks]
+    if any(mark not in _MARKS for mark in marks):
+        return False
+    if _skeleton(data, [task.checkbox for task in index.tasks]) != index.skeleton:
+        return False
+    for task, mark in zip(index.tasks, marks):
+        task.done = _MARKS[mark]
+    return True
+
+
+def _save(tasks_file: Path, index: TaskIndex) -> None:
+    data = asdict(index)
+    data.pop("refresh")
+    data["version"] = INDEX_VERSION
+    ignore_sidecars(tasks_file)
+    try:
+        atomic_write_text(index_path(tasks_file), json.dumps(data, separators=(",", ":")))
+    except OSError:
+        pass  # The index is only a cache.
+
+
+def _load_saved(tasks_file: Path) -> TaskIndex | None:
+    try:
+        data = json.loads(index_path(tasks_file).read_text(encoding="utf-8"))
+        if data.pop("version", None) != INDEX_VERSION:
+            return None
+        data["tasks"] = [IndexedTask(**task) for task in data["tasks"]]
+        return TaskIndex(**data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_index(tasks_file: Path) -> TaskIndex:
+    """Return an up-to-date index for a tasks.md.
+
+    Raises:
+        OSError: If tasks.md cannot be read.
+    """
+    stat = os.stat(tasks_file)
+    index = _load_saved(tasks_file)
+    if index is not None and index.size == stat.st_size:
+        if index.mtime_ns == stat.st_mtime_ns and index.inode == stat.st_ino:
+            index.refresh = "cached"
+            return index
+        if _refresh_checkboxes(tasks_file, index):
+            index.mtime_ns = stat.st_mtime_ns
+            index.inode = stat.st_ino
+            index.refresh = "checkboxes"
+            _save(tasks_file, index)
+            return index
+    index = _build(tasks_file)
+    _save(tasks_file, index)
+    return index
@@ -0,0 +1,199 @@
+"""Lease-based task claiming for agents sharing one tasks.md.
+
+This module handles `swhat tasks claim`, `heartbeat` and `complete`.
+Independently launched agent sessions pull work from the same tasks.md:
+each claim hands out the first ready task (all dependencies ticked, no
+live lease) under an exclusive, time-limited lease. Agents renew the
+lease with heartbeats while they work and finish with complete, which
+ticks the task in tasks.md. A lease that is not renewed expires and the
+task is handed out again.
+
+Leases live in a small SQLite database beside tasks.md
+(`.tasks.md.leases`). Every claim runs in an immediate transaction, which
+holds SQLite's write lock, so concurrent claims never hand out the same
+task twice.
+"""
+
+import os
+import secrets
+import socket
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from swhat.task_file import set_done
+from swhat.task_index import load_index
+from swhat.workspace import ignore_sidecars
+
+# Default lease duration in seconds
+DEFAULT_TTL = 900
+
+# Bump when the schema changes; forces a rebuild
+LEASES_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    task_id TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class Lease:
+    """An exclusive, time-limited claim on one task."""
+
+    task_id: str
+    token: str
+    owner: str
+    claimed_at: float
+    expires_at: float
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+def leases_path(tasks_file: Path) -> Path:
+    """Return the lease database for a tasks.md."""
+    return tasks_file.with_name(f".{tasks_file.name}.leases")
+
+
+def default_owner() -> str:
+    """Identify the calling agent session: $SWHAT_AGENT_ID or host:parent-pid."""
+    return os.environ.get("SWHAT_AGENT_ID") or f"{socket.gethostname()}:{os.getppid()}"
+
+
+class LeaseStore:
+    """Lease database for one tasks.md."""
+
+    def __init__(self, tasks_file: Path) -> None:
+        self.tasks_file = tasks_file
+        self.path = leases_path(tasks_file)
+        ignore_sidecars(tasks_file)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != LEASES_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS leases")
+            self.conn.execute(f"PRAGMA user_version = {LEASES_VERSION}")
+        self.conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "LeaseStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def active(self, now: float | None = None) -> dict[str, Lease]:
+        """Return task ID -> live lease."""
+        now = time.time() if now is None else now
+        rows = self.conn.execute("SELECT * FROM leases WHERE expires_at > ?", (now,))
+        return {row[0]: Lease(*row) for row in rows}
+
+    def claim(self, owner: str, ttl: float = DEFAULT_TTL) -> tuple[Lease | None, dict]:
+        """Lease the first ready task that nobody holds.
+
+        Only the row of the task being handed out is replaced; other
+        expired leases stay in place so their holders can still renew
+        them with `heartbeat()` until the task is reassigned.
+
+        Returns:
+            Tuple of (lease or None, summary dict with "remaining" and
+            "claimed" counts for the caller to report). When a task is
+            leased, the summary also holds its "description", "phase"
+            and "story", read under the same transaction.
+
+        Raises:
+            OSError: If tasks.md cannot be read.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            held = {
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT task_id FROM leases WHERE expires_at > ?", (now,)
+                )
+            }
+            index = load_index(self.tasks_file)
+            done = {task.id for task in index.tasks if task.done}
+            remaining = [task for task in index.tasks if not task.done]
+            lease = None
+            details: dict = {}
+            for task in remaining:
+                if task.id in held or not all(dep in done for dep in task.deps):
+                    continue
+                lease = Lease(task.id, secrets.token_hex(8), owner, now, now + ttl)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?, ?)",
+                    (lease.task_id, lease.token, lease.owner, lease.claimed_at, lease.expires_at),
+                )
+                details = {
+                    "description": task.description,
+                    "phase": index.phase_title(task),
+                    "story": task.story,
+                }
+                break
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        claimed = len(held) + (1 if lease else 0)
+        return lease, {**details, "remaining": len(remaining), "claimed": claimed}
+
+    def _owned(self, task_id: str, token: str) -> Lease:
+        row = self.conn.execute("SELECT * FROM leases WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None or row[1] != token:
+            raise ValueError(f"No lease on {task_id} with that token; it may have been reassigned")
+        return Lease(*row)
+
+    def heartbeat(self, task_id: str, token: str, ttl: float = DEFAULT_TTL) -> Lease:
+        """Extend a lease. An expired lease can be renewed until it is reassigned.
+
+        Raises:
+            ValueError: If the caller no longer holds the lease.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            lease = self._owned(task_id, token)
+            lease.expires_at = time.time() + ttl
+            self.conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE task_id = ?", (lease.expires_at, task_id)
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return lease
+
+    def complete(self, task_id: str, token: str, release: bool = False) -> None:
+        """Finish a leased task: tick it in tasks.md and drop the lease.
+
+        Args:
+            task_id: Leased task.
+            token: Lease token returned by `claim()`.
+            release: Drop the lease without ticking the task, so it is
+                handed out again.
+
+        Raises:
+            ValueError: If the caller no longer holds the lease.
+            OSError: If tasks.md cannot be updated.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._owned(task_id, token)
+            if not release:
+                set_done(self.tasks_file, {task_id})
+            self.conn.execute("DELETE FROM leases WHERE task_id = ?", (task_id,))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
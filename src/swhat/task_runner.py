@@ -0,0 +1,459 @@
+"""Local multi-worker executor for tasks.md.
+
+This module handles `swhat tasks run`. It schedules the task graph from
+`swhat.task_graph` onto a pool of workers, each of which hands one ready
+task to a backend (by default a local command such as `claude -p`):
+
+- a task starts once every task it depends on has completed
+- completed tasks are ticked `[x]` in tasks.md as soon as they finish
+- each task's output is streamed with a "[T012]" prefix and written to
+  its own log file
+- when a task fails, every task that depends on it is skipped; unrelated
+  tasks keep running
+- phases with a **Checkpoint** can be gated on a validation command, or
+  end the run so the increment can be reviewed
+
+Backends implement `Backend.run()`; `CommandBackend` covers any local
+command, which also makes the executor testable with a stub script.
+"""
+
+import os
+import shlex
+import shutil
+import string
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from swhat.artifact_parser import Document, Task, parse_file
+from swhat.task_file import set_done
+from swhat.task_graph import TaskGraph, build_graph, schedule
+
+# Default number of concurrent workers
+DEFAULT_WORKERS = 4
+
+# Task states reported by the executor
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Fields a CommandBackend argument may use
+COMMAND_FIELDS = ("id", "description", "prompt", "tasks_file", "feature_dir")
+
+
+@dataclass
+class RunContext:
+    """What a backend needs to run one task."""
+
+    task: Task
+    tasks_file: Path
+    feature_dir: Path
+    phase: str | None
+    prompt: str
+    log_path: Path
+
+
+class Backend(ABC):
+    """Runs one task to completion. Subclasses implement `run()`."""
+
+    @abstractmethod
+    def run(self, context: RunContext, emit: Callable[[str], None]) -> int:
+        """Run a task and return its exit status (0 on success).
+
+        Args:
+            context: The task and its files.
+            emit: Called with each line of output, for streaming.
+        """
+
+    def cancel(self) -> None:
+        """Stop any work still in progress."""
+
+
+def _check_fields(arg: str) -> None:
+    """Reject an argument that would fail to format with the task's fields."""
+    try:
+        fields = list(string.Formatter().parse(arg))
+    except ValueError as exc:
+        raise ValueError(f"{exc} in {arg!r}; write {{{{ and }}}} for literal braces") from None
+    for _, name, spec, _ in fields:
+        if name is None:
+            continue
+        if name == "" or name.isdigit():
+            raise ValueError(
+                f"positional placeholder in {arg!r}; write {{{{ and }}}} for literal braces"
+            )
+        if name not in COMMAND_FIELDS:
+            raise ValueError(
+                f"unknown placeholder {{{name}}} in {arg!r}; use one of "
+                + ", ".join(f"{{{field}}}" for field in COMMAND_FIELDS)
+            )
+        if spec:
+            _check_fields(spec)
+
+
+def resolve_command(command: str, cwd: Path | None = None) -> list[str]:
+    """Split a command line and check that its program can be run.
+
+    Args:
+        command: Shell-style command line.
+        cwd: Directory the command will run in; relative program paths
+            such as ./check.sh are resolved against it.
+
+    Returns:
+        The command's arguments.
+
+    Raises:
+        ValueError: If the command is empty, badly quoted or not found.
+    """
+    argv = shlex.split(command)
+    if not argv:
+        raise ValueError("empty command")
+    program = argv[0]
+    if os.path.dirname(program) and cwd is not None:
+        program = os.path.join(cwd, program)
+    if shutil.which(program) is None:
+        raise ValueError(f"command not found: {argv[0]}")
+    return argv
+
+
+class CommandBackend(Backend):
+    """Run each task as a local command.
+
+    The command is split like a shell command line, and each argument may
+    use the placeholders {id}, {description}, {prompt}, {tasks_file} and
+    {feature_dir}; write {{ and }} for literal braces. The prompt is also
+    written to the command's stdin, and SWHAT_TASK_ID, SWHAT_TASKS_FILE
+    and SWHAT_FEATURE_DIR are set in its environment. The command runs in
+    the project root.
+
+    Raises:
+        ValueError: If the command is empty or uses an unknown or
+            positional placeholder.
+    """
+
+    def __init__(self, command: str, cwd: Path | None = None) -> None:
+        self.argv = shlex.split(command)
+        if not self.argv:
+            raise ValueError("empty command")
+        for arg in self.argv:
+            _check_fields(arg)
+        self.cwd = cwd
+        self._procs: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    def run(self, context: RunContext, emit: Callable[[str], None]) -> int:
+        values = {
+            "id": context.task.id,
+            "description": context.task.description,
+            "prompt": context.prompt,
+            "tasks_file": str(context.tasks_file),
+            "feature_dir": str(context.feature_dir),
+        }
+        argv = [arg.format_map(values) for arg in self.argv]
+        env = dict(
+            os.environ,
+            SWHAT_TASK_ID=context.task.id,
+            SWHAT_TASKS_FILE=str(context.tasks_file),
+            SWHAT_FEATURE_DIR=str(context.feature_dir),
+        )
+        proc = subprocess.Popen(
+            argv,
+            cwd=self.cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        with self._lock:
+            self._procs.add(proc)
+        try:
+            try:
+                proc.stdin.write(context.prompt)
+                proc.stdin.close()
+            except OSError:
+                pass  # The command does not read stdin.
+            for line in proc.stdout:
+                emit(line.rstrip("\n"))
+            return proc.wait()
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+
+    def cancel(self) -> None:
+        with self._lock:
+            for proc in self._procs:
+                proc.terminate()
+
+
+@dataclass
+class RunResult:
+    """Outcome of an executor run."""
+
+    states: dict[str, str] = field(default_factory=dict)
+    # Task ID -> reason it was skipped
+    skipped: dict[str, str] = field(default_factory=dict)
+    # Titles of checkpoint phases that passed (or ended the run)
+    checkpoints: list[str] = field(default_factory=list)
+    stopped_at: str | None = None
+
+    @property
+    def failed(self) -> list[str]:
+        """IDs of the tasks that failed."""
+        return [task_id for task_id, state in self.states.items() if state == FAILED]
+
+
+def task_prompt(task: Task, tasks_file: Path, phase: str | None) -> str:
+    """Build the instruction handed to the agent for one task."""
+    lines = [f"Implement task {task.id} from {tasks_file}:", "", task.description, ""]
+    if phase:
+        lines.append(f"Phase: {phase}")
+    if task.story:
+        lines.append(f"User story: {task.story}")
+    lines += [
+        "",
+        "Use the feature's spec.md and plan.md in the same directory for context.",
+        "Only do this task. Do not edit tasks.md; it is marked complete for you.",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class Executor:
+    """Schedule the tasks of one tasks.md onto a pool of workers.
+
+    Raises:
+        ValueError: If checkpoint_command is badly quoted or not found.
+    """
+
+    def __init__(
+        self,
+        tasks_file: Path,
+        backend: Backend,
+        log_dir: Path,
+        workers: int = DEFAULT_WORKERS,
+        echo: Callable[[str], None] = print,
+        stream: bool = True,
+        checkpoint_command: str | None = None,
+        stop_at_checkpoint: bool = False,
+    ) -> None:
+        self.tasks_file = tasks_file
+        self.backend = backend
+        self.log_dir = log_dir
+        self.workers = workers
+        self.echo = echo
+        self.stream = stream
+        self.checkpoint_command = checkpoint_command
+        self.checkpoint_argv = (
+            resolve_command(checkpoint_command, getattr(backend, "cwd", None))
+            if checkpoint_command
+            else None
+        )
+        self.stop_at_checkpoint = stop_at_checkpoint
+        self._echo_lock = threading.Lock()
+
+    def _say(self, message: str) -> None:
+        with self._echo_lock:
+            self.echo(message)
+
+    def _run_task(self, task: Task, phase: str | None) -> int:
+        log_path = self.log_dir / f"{task.id}.log"
+        context = RunContext(
+            task,
+            self.tasks_file,
+            self.tasks_file.parent,
+            phase,
+            task_prompt(task, self.tasks_file, phase),
+            log_path,
+        )
+        with open(log_path, "w", encoding="utf-8") as log:
+
+            def emit(line: str) -> None:
+                log.write(line + "\n")
+                log.flush()
+                if self.stream:
+                    self._say(f"[{task.id}] {line}")
+
+            try:
+                return self.backend.run(context, emit)
+            except OSError as exc:
+                emit(f"Error: {exc}")
+                return 127
+
+    def _run_checkpoint(self, title: str) -> bool:
+        if not self.checkpoint_argv:
+            return True
+        self._say(f"checkpoint: {title}: running {self.checkpoint_command}")
+        try:
+            proc = subprocess.run(
+                self.checkpoint_argv, cwd=getattr(self.backend, "cwd", None), check=False
+            )
+        except OSError as exc:
+            self._say(f"checkpoint: {title}: {exc}")
+            return False
+        return proc.returncode == 0
+
+    def run(self, doc: Document | None = None) -> RunResult:
+        """Run every pending task and return the final states.
+
+        Raises:
+            ValueError: If the task dependencies contain a cycle.
+            OSError: If tasks.md cannot be read or updated.
+        """
+        doc = doc or parse_file(self.tasks_file, kind="tasks")
+        graph = build_graph(doc)
+        schedule(graph)  # raises on cycles
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        return self._execute(graph, doc)
+
+    def _execute(self, graph: TaskGraph, doc: Document) -> RunResult:
+        result = RunResult()
+        finished = {t for t, task in graph.tasks.items() if task.done}
+        pending = [t for t in graph.tasks if t not in finished]
+        dependents = graph.dependents()
+        phase_title = {
+            t: doc.phases[task.phase].title if task.phase is not None else None
+            for t, task in graph.tasks.items()
+        }
+        # Phase index -> IDs still open, for phases that declare a checkpoint
+        gated = {
+            index: {t for t in pending if graph.tasks[t].phase == index}
+            for index, phase in enumerate(doc.phases)
+            if phase.checkpoint
+        }
+        gated = {index: ids for index, ids in gated.items() if ids}
+        closed_gates: set[int] = set()
+        stop = False
+
+        def gate_open(task_id: str) -> bool:
+            phase = graph.tasks[task_id].phase
+            for dep in graph.deps[task_id]:
+                dep_phase = graph.tasks[dep].phase
+                if dep_phase != phase and dep_phase in gated and dep_phase not in closed_gates:
+                    return False
+            return True
+
+        def skip_dependents(task_id: str, reason: str) -> None:
+            stack = list(dependents[task_id])
+            while stack:
+                child = stack.pop()
+                if child in result.states or child in finished:
+                    continue
+                result.states[child] = SKIPPED
+                result.skipped[child] = reason
+                self._say(f"skip  {child} ({reason})")
+                stack.extend(dependents[child])
+
+        running: dict[Future, tuple[str, float]] = {}
+        started: set[str] = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while True:
+                    if not stop:
+                        for task_id in pending:
+                            if len(running) >= self.workers:
+                                break
+                            if task_id in started or task_id in result.states:
+                                continue
+                            if not graph.deps[task_id] <= finished or not gate_open(task_id):
+                                continue
+                            task = graph.tasks[task_id]
+                            self._say(f"start {task_id} {task.description}")
+                            future = pool.submit(self._run_task, task, phase_title[task_id])
+                            running[future] = (task_id, time.monotonic())
+                            started.add(task_id)
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task_id, start_time = running.pop(future)
+                        elapsed = time.monotonic() - start_time
+                        status = future.result()
+                        log_path = self.log_dir / f"{task_id}.log"
+                        if status != 0:
+                            result.states[task_id] = FAILED
+                            self._say(f"FAIL  {task_id} (exit {status}, {elapsed:.1f}s) {log_path}")
+                            skip_dependents(task_id, f"depends on failed {task_id}")
+                            continue
+                        set_done(self.tasks_file, {task_id})
+                        finished.add(task_id)
+                        result.states[task_id] = DONE
+                        self._say(f"done  {task_id} ({elapsed:.1f}s)")
+                        if self._close_gate(task_id, graph, doc, gated, closed_gates, result):
+                            stop = True
+            except KeyboardInterrupt:
+                self.backend.cancel()
+                raise
+        for task_id in pending:
+            if task_id not in result.states:
+                result.states[task_id] = SKIPPED
+                result.skipped[task_id] = self._blocked_reason(
+                    task_id, graph, doc, finished, gated, closed_gates, result
+                )
+        return result
+
+    @staticmethod
+    def _blocked_reason(
+        task_id: str,
+        graph: TaskGraph,
+        doc: Document,
+        finished: set[str],
+        gated: dict[int, set[str]],
+        closed_gates: set[int],
+        result: RunResult,
+    ) -> str:
+        """Explain why a task never started."""
+        if result.stopped_at is not None:
+            return f"run stopped at {result.stopped_at}"
+        deps = [dep for dep in graph.tasks if dep in graph.deps[task_id]]
+        unfinished = [dep for dep in deps if dep not in finished]
+        if unfinished:
+            return f"depends on unfinished {', '.join(unfinished)}"
+        phase = graph.tasks[task_id].phase
+        for dep in deps:
+            dep_phase = graph.tasks[dep].phase
+            if dep_phase != phase and dep_phase in gated and dep_phase not in closed_gates:
+                still_open = [t for t in graph.tasks if t in gated[dep_phase]]
+                return (
+                    f"checkpoint {doc.phases[dep_phase].title} not reached "
+                    f"({', '.join(still_open)} not done)"
+                )
+        return "not started"
+
+    def _close_gate(
+        self,
+        task_id: str,
+        graph: TaskGraph,
+        doc: Document,
+        gated: dict[int, set[str]],
+        closed_gates: set[int],
+        result: RunResult,
+    ) -> bool:
+        """Record a finished task; run the phase checkpoint once it is complete.
+
+        Returns:
+            True if the run should start no further tasks.
+        """
+        phase = graph.tasks[task_id].phase
+        if phase not in gated:
+            return False
+        gated[phase].discard(task_id)
+        if gated[phase]:
+            return False
+        title = doc.phases[phase].title
+        if not self._run_checkpoint(title):
+            self._say(f"FAIL  checkpoint {title}")
+            result.stopped_at = title
+            return True
+        closed_gates.add(phase)
+        result.checkpoints.append(title)
+        self._say(f"checkpoint passed: {title}")
+        if self.stop_at_checkpoint:
+            result.stopped_at = title
+            return True
+        return False
@@ -1,25 +1,30 @@
 """Template registry for swhat CLI.
 
 This module provides the registry and lookup functions for templates.
-Template content is stored in the templates/ subpackage.
+Template content is stored in the templates/ subpackage and is only
+imported when a template body is actually requested; names and
+descriptions are available without loading any content.
 """
 
-from swhat.templates import (
-    SPEC_TEMPLATE_CONTENT,
-    CHECKLIST_CONTENT,
-    PLAN_TEMPLATE_CONTENT,
-    TASKS_TEMPLATE_CONTENT,
-)
+import functools
+import re
+from dataclasses import dataclass
+
+from swhat.fsutil import sha256_text
+from swhat.templates import load_template_content
 
-# Type alias for registry entries: (content, description)
+# Type alias for lookup results: (content, description)
 TemplateEntry = tuple[str, str]
 
-# Template registry: name -> (content, description)
-TEMPLATES: dict[str, TemplateEntry] = {
-    "specification": (SPEC_TEMPLATE_CONTENT, "Feature specification template"),
-    "specification-checklist": (CHECKLIST_CONTENT, "Spec quality validation checklist"),
-    "plan": (PLAN_TEMPLATE_CONTENT, "Implementation plan template"),
-    "tasks": (TASKS_TEMPLATE_CONTENT, "Task list template for implementation"),
+# Type alias for registry entries: (content constant name, description)
+TemplateSource = tuple[str, str]
+
+# Template registry: name -> (content constant name, description)
+TEMPLATES: dict[str, TemplateSource] = {
+    "specification": ("SPEC_TEMPLATE_CONTENT", "Feature specification template"),
+    "specification-checklist": ("CHECKLIST_CONTENT", "Spec quality validation checklist"),
+    "plan": ("PLAN_TEMPLATE_CONTENT", "Implementation plan template"),
+    "tasks": ("TASKS_TEMPLATE_CONTENT", "Task list template for implementation"),
 }
 
 
@@ -32,13 +37,166 @@ def get_template(name: str) -> TemplateEntry | None:
     Returns:
         Tuple of (content, description) if found, None otherwise.
     """
-    return TEMPLATES.get(name.lower())
+    source = TEMPLATES.get(name.lower())
+    if source is None:
+        return None
+    constant, description = source
+    return load_template_content(constant), description
+
+
+def content_hash(content: str) -> str:
+    """Return the sha256 hex digest of template content.
+
+    Args:
+        content: Template content.
+
+    Returns:
+        Hex digest of the UTF-8 encoded content.
+    """
+    return sha256_text(content)
+
+
+def get_templates(
+    names: list[str] | tuple[str, ...],
+    with_hash: bool = False,
+    values: dict[str, str] | None = None,
+) -> dict:
+    """Get several templates at once, keyed by their registered names.
+
+    Args:
+        names: Template names to look up (case-insensitive). Unknown names
+            are skipped.
+        with_hash: If True, each value is {"content": ..., "sha256": ...}
+            instead of the bare content string.
+        values: Optional placeholder values; if given, each template is
+            rendered with `render_template()` before being returned.
+
+    Returns:
+        Dict of name -> content (or content and hash), in request order.
+    """
+    results: dict = {}
+    for name in names:
+        if values:
+            content = render_template(name, values)
+        else:
+            entry = get_template(name)
+            content = entry[0] if entry is not None else None
+        if content is None:
+            continue
+        if with_hash:
+            results[name.lower()] = {"content": content, "sha256": content_hash(content)}
+        else:
+            results[name.lower()] = content
+    return results
 
 
 def list_templates() -> list[tuple[str, str]]:
-    """List all available templates.
+    """List all available templates without loading their content.
 
     Returns:
         List of (name, description) tuples, sorted by name.
     """
     return sorted((name, entry[1]) for name, entry in TEMPLATES.items())
+
+
+# Placeholder forms used by the templates: [UPPER CASE], {free form} and $UPPER
+_PLACEHOLDER = re.compile(
+    r"\[([A-Z][A-Z0-9 _-]*)\]|\{([A-Za-z][A-Za-z0-9 _-]*)\}|\$([A-Z][A-Z0-9_]*)"
+)
+
+# Bracketed markers that are part of the document structure, not
+# placeholders: task IDs, [P] parallel and [USn] story tags, and the
+# [REMOVE IF UNUSED] / [NEEDS CLARIFICATION] notes (normalized keys)
+_MARKERS = re.compile(r"id|p|us\d+|remove_if_unused|needs_clarification")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal segments and placeholder slots.
+
+    `segments` always has one more entry than `slots`; rendering
+    interleaves them, so filling a template is a single join.
+    """
+
+    content: str
+    segments: tuple[str, ...]
+    # (start offset, end offset, normalized key) per placeholder occurrence
+    slots: tuple[tuple[int, int, str], ...]
+
+    def keys(self) -> list[str]:
+        """Return the distinct placeholder keys in order of first use."""
+        return list(dict.fromkeys(key for _, _, key in self.slots))
+
+    def render(self, values: dict[str, str]) -> str:
+        """Fill placeholders from values, leaving unknown ones untouched.
+
+        Args:
+            values: Mapping of placeholder key to replacement text. Keys
+                are normalized with `normalize_key()`.
+
+        Returns:
+            The rendered document.
+        """
+        normalized = {normalize_key(key): value for key, value in values.items()}
+        parts = [self.segments[0]]
+        for (start, end, key), segment in zip(self.slots, self.segments[1:]):
+            parts.append(normalized.get(key, self.content[start:end]))
+            parts.append(segment)
+        return "".join(parts)
+
+
+def normalize_key(key: str) -> str:
+    """Normalize a placeholder key for matching.
+
+    `[FEATURE NAME]`, `{feature name}`, `feature-name` and `FEATURE_NAME`
+    all normalize to `feature_name`.
+    """
+    return re.sub(r"[\s_-]+", "_", key.strip()).lower()
+
+
+def compile_content(content: str) -> CompiledTemplate:
+    """Build the placeholder offset table for a piece of template content."""
+    segments = []
+    slots = []
+    position = 0
+    for match in _PLACEHOLDER.finditer(content):
+        key = normalize_key(match.group(1) or match.group(2) or match.group(3))
+        if match.group(1) and _MARKERS.fullmatch(key):
+            continue
+        segments.append(content[position : match.start()])
+        slots.append((match.start(), match.end(), key))
+        position = match.end()
+    segments.append(content[position:])
+    return CompiledTemplate(content=content, segments=tuple(segments), slots=tuple(slots))
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(name: str) -> CompiledTemplate | None:
+    """Compile a registered template once and cache the result.
+
+    Args:
+        name: Template name (case-insensitive).
+
+    Returns:
+        The compiled template, or None if no such template exists.
+    """
+    entry = get_template(name)
+    if entry is None:
+        return None
+    return compile_content(entry[0])
+
+
+def render_template(name: str, values: dict[str, str]) -> str | None:
+    """Render a registered template with placeholder values.
+
+    Args:
+        name: Template name (case-insensitive).
+        values: Mapping of placeholder key to replacement text.
+
+    Returns:
+        The rendered content, or None if no such template exists.
+    """
+    compiled = compile_template(name.lower())
+    if compiled is None:
+        return None
+    return compiled.render(values)
@@ -1,13 +1,40 @@
-"""Template content for swhat CLI."""
-
-from swhat.templates.spec_template import SPEC_TEMPLATE_CONTENT
-from swhat.templates.checklist_template import CHECKLIST_CONTENT
-from swhat.templates.plan_template import PLAN_TEMPLATE_CONTENT
-from swhat.templates.tasks_template import TASKS_TEMPLATE_CONTENT
-
-__all__ = [
-    "SPEC_TEMPLATE_CONTENT",
-    "CHECKLIST_CONTENT",
-    "PLAN_TEMPLATE_CONTENT",
-    "TASKS_TEMPLATE_CONTENT",
-]
+"""Template content for swhat CLI.
+
+Content constants are loaded lazily: each one lives in its own module and
+is only imported on first access, so listing templates or running
+unrelated commands never loads the template bodies.
+"""
+
+import importlib
+
+# Content name -> module that defines it
+TEMPLATE_MODULES: dict[str, str] = {
+    "SPEC_TEMPLATE_CONTENT": "swhat.templates.spec_template",
+    "CHECKLIST_CONTENT": "swhat.templates.checklist_template",
+    "PLAN_TEMPLATE_CONTENT": "swhat.templates.plan_template",
+    "TASKS_TEMPLATE_CONTENT": "swhat.templates.tasks_template",
+}
+
+__all__ = list(TEMPLATE_MODULES)
+
+
+def load_template_content(name: str) -> str:
+    """Import and return a template content constant by name.
+
+    Args:
+        name: Constant name, e.g. "SPEC_TEMPLATE_CONTENT".
+
+    Returns:
+        The template content.
+
+    Raises:
+        KeyError: If the name is not a registered template constant.
+    """
+    module = importlib.import_module(TEMPLATE_MODULES[name])
+    return getattr(module, name)
+
+
+def __getattr__(name: str) -> str:
+    if name in TEMPLATE_MODULES:
+        return load_template_content(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,400 @@
+"""Mechanical specification quality validation for swhat.
+
+This module handles the `swhat validate` command. It evaluates a
+feature's spec.md against the items of the specification quality
+checklist (`CHECKLIST_CONTENT`) that can be decided without judgment:
+
+- mandatory sections present and free of template placeholders
+- no [NEEDS CLARIFICATION] markers (and never more than the limit of 3)
+- success criteria that contain measurable quantities
+- acceptance scenarios for every user story, edge cases listed
+
+Items that need judgment (e.g. "Written for non-technical stakeholders")
+are reported as "manual" and left for the agent to review.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from swhat.artifact_parser import Document, Section, parse_bytes
+from swhat.fsutil import atomic_write_text, sha256_bytes, sha256_text
+
+# Maximum [NEEDS CLARIFICATION] markers a draft spec may carry
+MAX_CLARIFICATIONS = 3
+
+# Candidate checklist locations relative to the feature directory
+CHECKLIST_FILES = ("requirements.md", "checklists/requirements.md")
+
+# Bump when the checks change; invalidates cached results
+VALIDATOR_VERSION = 1
+
+# Directory for cached results inside the workspace index directory
+RESULT_CACHE_DIR = "validate"
+
+# Result status values
+PASS = "pass"
+FAIL = "fail"
+MANUAL = "manual"
+
+_CHECKBOX = re.compile(r"^(\s*[-*]\s+\[)([ xX])(\]\s+)(.*?)\s*$")
+_BRACKET = re.compile(r"\[([^\]\n]+)\](?!\()")
+_EXAMPLE = re.compile(r"\[[^\]\n]*\be\.g\.,[^\]\n]*\]")
+# A number, or an absolute quantifier that makes a pass/fail outcome countable
+_QUANTITY = re.compile(r"\d|\b(?:all|every|each|no|none|zero|without|never|always)\b", re.I)
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_MANDATORY = "*(mandatory)*"
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one checklist item (or extra mechanical check)."""
+
+    item: str
+    status: str
+    details: list[str] = field(default_factory=list)
+    # False for checks that are not part of the checklist template
+    checklist: bool = True
+
+
+@dataclass
+class ValidationResult:
+    """All check results for one feature's spec."""
+
+    feature: str
+    spec: str
+    sha256: str
+    checks: list[CheckResult] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        """True if no mechanical check failed."""
+        return all(check.status != FAIL for check in self.checks)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        data = asdict(self)
+        data["passed"] = self.passed
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationResult":
+        """Rebuild a result from `to_dict()` output."""
+        checks = [CheckResult(**check) for check in data["checks"]]
+        return cls(data["feature"], data["spec"], data["sha256"], checks)
+
+
+@dataclass
+class Outcome:
+    """Validation outcome for one feature in a batch."""
+
+    feature: Path
+    result: ValidationResult | None = None
+    error: str | None = None
+    cached: bool = False
+
+
+def checklist_items(content: str | None = None) -> list[str]:
+    """Return the item texts of the specification quality checklist."""
+    if content is None:
+        from swhat.templates import CHECKLIST_CONTENT
+
+        content = CHECKLIST_CONTENT
+    items = []
+    for line in content.splitlines():
+        match = _CHECKBOX.match(line)
+        if match:
+            items.append(match.group(4))
+    return items
+
+
+@lru_cache(maxsize=1)
+def _template_placeholders() -> frozenset[str]:
+    """Bracketed placeholders used by the specification template."""
+    from swhat.templates import SPEC_TEMPLATE_CONTENT
+
+    return frozenset(
+        f"[{text}]"
+        for text in _BRACKET.findall(SPEC_TEMPLATE_CONTENT)
+        if not text.startswith("NEEDS CLARIFICATION") and text.strip() not in ("", "x", "X")
+    )
+
+
+@lru_cache(maxsize=1)
+def _mandatory_sections() -> tuple[str, ...]:
+    """Titles of the sections the specification template marks mandatory."""
+    from swhat.templates import SPEC_TEMPLATE_CONTENT
+
+    template = parse_bytes(SPEC_TEMPLATE_CONTENT.encode("utf-8"), "spec")
+    return tuple(
+        s.title.replace(_MANDATORY, "").strip() for s in template.sections if _MANDATORY in s.title
+    )
+
+
+def _section_text(data: bytes, section: Section) -> str:
+    return data[section.body_start : section.end].decode("utf-8", errors="replace")
+
+
+def _without_comments(text: str) -> str:
+    """Blank out HTML comments, keeping line numbers intact."""
+    return _COMMENT.sub(lambda m: "\n" * m.group(0).count("\n"), text)
+
+
+def _check_mandatory(data: bytes, doc: Document) -> CheckResult:
+    details = []
+    for title in _mandatory_sections():
+        matches = doc.find_sections(title)
+        if not matches:
+            details.append(f"Missing section: {title}")
+        elif not _section_text(data, matches[0]).strip():
+            details.append(f"Empty section: {title}")
+    if not doc.stories:
+        details.append("No user stories with a priority")
+    if not doc.requirements:
+        details.append("No functional requirements (FR-###)")
+    if not doc.success_criteria:
+        details.append("No success criteria (SC-###)")
+
+    placeholders = _template_placeholders()
+    text = _without_comments(data.decode("utf-8", errors="replace"))
+    for number, line in enumerate(text.splitlines(), start=1):
+        found = [p for p in placeholders if p in line] + _EXAMPLE.findall(line)
+        for placeholder in sorted(dict.fromkeys(found), key=line.index):
+            details.append(f"Line {number}: template placeholder {placeholder}")
+    return CheckResult("All mandatory sections completed", FAIL if details else PASS, details)
+
+
+def _check_clarifications(data: bytes, doc: Document) -> CheckResult:
+    details = [f"Line {c.line}: {c.text or 'NEEDS CLARIFICATION'}" for c in doc.clarifications]
+    return CheckResult(
+        "No [NEEDS CLARIFICATION] markers remain", FAIL if details else PASS, details
+    )
+
+
+def _check_measurable(data: bytes, doc: Document) -> CheckResult:
+    criteria = doc.success_criteria
+    details = [
+        f"{sc.id} has no measurable quantity" for sc in criteria if not _QUANTITY.search(sc.text)
+    ]
+    if not criteria:
+        details.append("No success criteria (SC-###)")
+    return CheckResult("Success criteria are measurable", FAIL if details else PASS, details)
+
+
+def _check_scenarios(data: bytes, doc: Document) -> CheckResult:
+    details = []
+    for story in doc.stories:
+        body = _section_text(data, doc.sections[story.section])
+        if "**Given**" not in body:
+            details.append(f"{story.tag} has no Given/When/Then acceptance scenario")
+    if not doc.stories:
+        details.append("No user stories with a priority")
+    return CheckResult("All acceptance scenarios are defined", FAIL if details else PASS, details)
+
+
+def _check_edge_cases(data: bytes, doc: Document) -> CheckResult:
+    details = []
+    sections = doc.find_sections("Edge Cases")
+    if not sections:
+        details.append("Missing section: Edge Cases")
+    else:
+        body = _section_text(data, sections[0])
+        if not re.search(r"^\s*[-*]\s+\S", body, re.MULTILINE):
+            details.append("Edge Cases lists no cases")
+    return CheckResult("Edge cases are identified", FAIL if details else PASS, details)
+
+
+# Checklist item text -> mechanical check
+CHECKS = {
+    "All mandatory sections completed": _check_mandatory,
+    "No [NEEDS CLARIFICATION] markers remain": _check_clarifications,
+    "Success criteria are measurable": _check_measurable,
+    "All acceptance scenarios are defined": _check_scenarios,
+    "Edge cases are identified": _check_edge_cases,
+}
+
+
+def _normalize_item(item: str) -> str:
+    return " ".join(item.lower().split())
+
+
+_CHECKS_BY_KEY = {_normalize_item(item): check for item, check in CHECKS.items()}
+
+
+def validate_spec(feature: Path) -> ValidationResult:
+    """Run the mechanical checks against a feature's spec.md.
+
+    Args:
+        feature: Feature directory containing spec.md.
+
+    Returns:
+        Results for every checklist item, followed by the clarification
+        limit check.
+
+    Raises:
+        OSError: If spec.md cannot be read.
+    """
+    spec = feature / "spec.md"
+    data = spec.read_bytes()
+    # Parse the bytes already read, so the result always matches doc.sha256.
+    doc = parse_bytes(data, "spec")
+    result = ValidationResult(feature.name, str(spec), doc.sha256)
+    for item in checklist_items():
+        check = _CHECKS_BY_KEY.get(_normalize_item(item))
+        if check is None:
+            result.checks.append(CheckResult(item, MANUAL))
+        else:
+            outcome = check(data, doc)
+            outcome.item = item
+            result.checks.append(outcome)
+
+    count = len(doc.clarifications)
+    result.checks.append(
+        CheckResult(
+            f"At most {MAX_CLARIFICATIONS} [NEEDS CLARIFICATION] markers",
+            FAIL if count > MAX_CLARIFICATIONS else PASS,
+            [f"{count} markers found"] if count > MAX_CLARIFICATIONS else [],
+            checklist=False,
+        )
+    )
+    return result
+
+
+@lru_cache(maxsize=1)
+def checklist_version() -> str:
+    """Return a hash identifying the checklist, spec template and checks."""
+    from swhat.templates import CHECKLIST_CONTENT, SPEC_TEMPLATE_CONTENT
+
+    return sha256_text(f"{VALIDATOR_VERSION}\0{CHECKLIST_CONTENT}\0{SPEC_TEMPLATE_CONTENT}")[:16]
+
+
+def _cache_source(spec: Path) -> str:
+    return sha256_bytes(str(spec.resolve()).encode("utf-8"))[:16]
+
+
+def _cache_file(cache_dir: Path, spec: Path, digest: str) -> Path:
+    return cache_dir / f"{_cache_source(spec)}-{digest}-{checklist_version()}.json"
+
+
+def _load_cached(feature: Path, cache_dir: Path) -> ValidationResult | None:
+    """Return the cached result for the feature's current spec.md, if any."""
+    spec = feature / "spec.md"
+    try:
+        digest = sha256_bytes(spec.read_bytes())
+        data = json.loads(_cache_file(cache_dir, spec, digest).read_text(encoding="utf-8"))
+        result = ValidationResult.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    result.feature = feature.name
+    result.spec = str(spec)
+    return result
+
+
+def _store_cached(result: ValidationResult, cache_dir: Path) -> None:
+    spec = Path(result.spec)
+    try:
+        # Drop this spec's results for content or checklists it no longer has.
+        for stale in cache_dir.glob(f"{_cache_source(spec)}-*.json"):
+            stale.unlink(missing_ok=True)
+        atomic_write_text(_cache_file(cache_dir, spec, result.sha256), json.dumps(result.to_dict()))
+    except OSError:
+        pass
+
+
+def _validate_worker(feature: str) -> ValidationResult | str:
+    """Process pool entry point: validate one feature, or return an error."""
+    try:
+        return validate_spec(Path(feature))
+    except OSError as exc:
+        return str(exc)
+
+
+def validate_features(
+    features: list[Path], jobs: int | None = None, cache_dir: Path | None = None
+) -> list[Outcome]:
+    """Validate many features, reusing cached results for unchanged specs.
+
+    Results are cached under `cache_dir`, keyed on the spec's path, its
+    content hash and `checklist_version()`; storing a result drops the
+    spec's older entries. Specs without a cached result are
+    validated on a process pool of `jobs` workers (default: CPU count);
+    a single miss, or jobs=1, runs in-process.
+
+    Args:
+        features: Feature directories containing spec.md.
+        jobs: Maximum worker processes.
+        cache_dir: Result cache directory, or None to disable caching.
+
+    Returns:
+        One outcome per feature, in input order.
+    """
+    outcomes = [Outcome(feature) for feature in features]
+    pending = []
+    for outcome in outcomes:
+        cached = _load_cached(outcome.feature, cache_dir) if cache_dir else None
+        if cached is not None:
+            outcome.result, outcome.cached = cached, True
+        else:
+            pending.append(outcome)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            # Batch specs per task so IPC does not dominate the per-spec work.
+            chunksize = max(1, len(pending) // (jobs * 4))
+            paths = [str(o.feature) for o in pending]
+            results = list(pool.map(_validate_worker, paths, chunksize=chunksize))
+    else:
+        results = [_validate_worker(str(o.feature)) for o in pending]
+
+    for outcome, result in zip(pending, results):
+        if isinstance(result, str):
+            outcome.error = result
+            continue
+        outcome.result = result
+        if cache_dir:
+            _store_cached(result, cache_dir)
+    return outcomes
+
+
+def find_checklist(feature: Path) -> Path | None:
+    """Return the feature's quality checklist file, if any."""
+    for candidate in CHECKLIST_FILES:
+        path = feature / candidate
+        if path.is_file():
+            return path
+    return None
+
+
+def update_checklist(path: Path, result: ValidationResult) -> int:
+    """Tick or untick checklist items in place from mechanical results.
+
+    Items reported as "manual" are left as they are.
+
+    Returns:
+        Number of checkbox lines changed.
+    """
+    status = {_normalize_item(c.item): c.status for c in result.checks if c.checklist}
+    content = path.read_text(encoding="utf-8")
+    lines = content.splitlines(keepends=True)
+    changed = 0
+    for index, line in enumerate(lines):
+        match = _CHECKBOX.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+        outcome = status.get(_normalize_item(match.group(4)), MANUAL)
+        if outcome == MANUAL:
+            continue
+        mark = "x" if outcome == PASS else " "
+        if match.group(2).lower() == mark:
+            continue
+        ending = line[len(line.rstrip("\r\n")) :]
+        lines[index] = f"{match.group(1)}{mark}{match.group(3)}{match.group(4)}{ending}"
+        changed += 1
+    if changed:
+        atomic_write_text(path, "".join(lines))
+    return changed
@@ -0,0 +1,104 @@
+"""Workspace discovery for swhat.
+
+A swhat workspace is the `.swhat/` directory created by `swhat init`. Each
+feature lives in its own subdirectory (e.g. `.swhat/user-auth_a3b7x9k2m4n1/`)
+holding spec.md, requirements.md, plan.md, tasks.md and related artifacts.
+Directories starting with "." are reserved for swhat's own state.
+"""
+
+from pathlib import Path
+
+# Workspace directory name, relative to the project root
+WORKSPACE_DIR = ".swhat"
+
+# Directory for swhat's derived state (indexes, caches) inside the workspace
+INDEX_DIR = ".index"
+
+
+def find_workspace(start: Path | None = None) -> Path | None:
+    """Find the nearest `.swhat/` directory at or above a directory.
+
+    Args:
+        start: Directory to start from. Defaults to the current directory.
+
+    Returns:
+        Path to the workspace directory, or None if there is none.
+    """
+    current = (start or Path.cwd()).resolve()
+    for directory in (current, *current.parents):
+        candidate = directory / WORKSPACE_DIR
+        if candidate.is_dir():
+            return candidate
+    return None
+
+
+def index_dir(workspace: Path) -> Path:
+    """Return the directory for derived state, creating it if needed.
+
+    The directory gets a `.gitignore` matching everything in it, so
+    indexes and caches never show up as changes to commit.
+    """
+    path = workspace / INDEX_DIR
+    path.mkdir(parents=True, exist_ok=True)
+    ignore_file = path / ".gitignore"
+    if not ignore_file.exists():
+        try:
+            ignore_file.write_text("*\n", encoding="utf-8")
+        except OSError:
+            pass
+    return path
+
+
+def ignore_sidecars(path: Path) -> None:
+    """List a file's hidden `.<name>.*` state files in its directory's .gitignore.
+
+    Used for the lock, index and lease files kept beside tasks.md. Failures
+    are ignored; the entry only keeps derived state out of commits.
+    """
+    pattern = f".{path.name}.*"
+    ignore_file = path.with_name(".gitignore")
+    try:
+        try:
+            existing = ignore_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            existing = ""
+        if pattern in existing.splitlines():
+            return
+        with open(ignore_file, "a", encoding="utf-8") as f:
+            if existing and not existing.endswith("\n"):
+                f.write("\n")
+            f.write(pattern + "\n")
+    except OSError:
+        pass
+
+
+def feature_dirs(workspace: Path) -> list[Path]:
+    """List feature directories in a workspace, sorted by name."""
+    try:
+        entries = list(workspace.iterdir())
+    except OSError:
+        return []
+    return sorted(p for p in entries if p.is_dir() and not p.name.startswith("."))
+
+
+def resolve_feature(workspace: Path, name: str) -> Path | None:
+    """Resolve a feature by exact directory name or unique prefix.
+
+    Args:
+        workspace: Workspace directory.
+        name: Full feature directory name, or a prefix of it (such as the
+            short name without its random suffix). A path such as
+            `.swhat/<name>` is accepted too.
+
+    Returns:
+        The feature directory, or None if it does not exist or the prefix
+        is ambiguous.
+    """
+    name = Path(name.strip().rstrip("/")).name
+    if not name or name.startswith("."):
+        return None
+    exact = workspace / name
+    if exact.is_dir():
+        return exact
+    matches = [p for p in feature_dirs(workspace) if p.name.startswith(name)]
+    return matches[0] if len(matches) == 1 else None
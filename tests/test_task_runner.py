@@ -0,0 +1,129 @@
+"""Tests for the tasks.md executor, driven by a stub agent command."""
+
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+from swhat.task_runner import DONE, FAILED, SKIPPED, CommandBackend, Executor
+
+TASKS = """\
+# Tasks: Demo
+
+## Phase 1: Setup
+
+- [ ] T001 Create project structure
+- [ ] T002 Configure tooling
+- [ ] T003 Write contributor docs
+
+## Phase 2: Core
+
+- [ ] T004 Build the core module
+"""
+
+# Prints its task ID and exits non-zero for the IDs given as arguments.
+STUB = """\
+import os, sys
+task = os.environ["SWHAT_TASK_ID"]
+print(f"stub ran {task} {sys.argv[1]}")
+sys.exit(1 if task in sys.argv[2:] else 0)
+"""
+
+
+def run_tasks(tmp_path: Path, *failing: str):
+    feature = tmp_path / "demo"
+    feature.mkdir()
+    tasks_file = feature / "tasks.md"
+    tasks_file.write_text(TASKS, encoding="utf-8")
+    stub = tmp_path / "stub.py"
+    stub.write_text(STUB, encoding="utf-8")
+    command = " ".join(shlex.quote(arg) for arg in (sys.executable, str(stub), "{id}", *failing))
+    messages: list[str] = []
+    executor = Executor(
+        tasks_file,
+        CommandBackend(command, cwd=tmp_path),
+        tmp_path / "logs",
+        workers=2,
+        echo=messages.append,
+    )
+    return executor.run(), tasks_file, messages
+
+
+def test_all_tasks_run_and_are_ticked(tmp_path):
+    result, tasks_file, messages = run_tasks(tmp_path)
+
+    assert result.states == {"T001": DONE, "T002": DONE, "T003": DONE, "T004": DONE}
+    assert tasks_file.read_text(encoding="utf-8") == TASKS.replace("- [ ]", "- [x]")
+    assert "[T004] stub ran T004 T004" in messages
+    assert (tmp_path / "logs" / "T001.log").read_text() == "stub ran T001 T001\n"
+
+
+def test_failure_skips_dependents_only(tmp_path):
+    result, tasks_file, _ = run_tasks(tmp_path, "T002")
+
+    assert result.states == {"T001": DONE, "T002": FAILED, "T003": SKIPPED, "T004": SKIPPED}
+    assert result.failed == ["T002"]
+    assert result.skipped["T003"] == "depends on failed T002"
+    text = tasks_file.read_text(encoding="utf-8")
+    assert "- [x] T001" in text
+    assert "- [ ] T002" in text
+    assert "- [ ] T003" in text
+    assert "- [ ] T004" in text
+
+
+@pytest.mark.parametrize("command", ["echo {}", "echo {0}", "echo {task}", "echo }"])
+def test_bad_placeholders_are_rejected_up_front(command):
+    with pytest.raises(ValueError):
+        CommandBackend(command)
+
+
+GATED_TASKS = """\
+# Tasks: Demo
+
+## Phase 1: Setup
+
+- [ ] T001 Create project structure
+
+**Checkpoint**: structure ready
+
+## Phase 2: Core
+
+- [ ] T002 Build the core module
+"""
+
+
+def test_unknown_checkpoint_command_is_rejected_up_front(tmp_path):
+    tasks_file = tmp_path / "tasks.md"
+    tasks_file.write_text(GATED_TASKS, encoding="utf-8")
+    with pytest.raises(ValueError, match="not found"):
+        Executor(
+            tasks_file,
+            CommandBackend("true", cwd=tmp_path),
+            tmp_path / "logs",
+            checkpoint_command="swhat-no-such-checkpoint-command",
+        )
+
+
+def test_checkpoint_that_cannot_start_stops_the_run(tmp_path):
+    tasks_file = tmp_path / "tasks.md"
+    tasks_file.write_text(GATED_TASKS, encoding="utf-8")
+    check = tmp_path / "check.sh"
+    check.write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+    check.chmod(0o755)
+    command = " ".join(shlex.quote(arg) for arg in (sys.executable, "-c", "pass"))
+    executor = Executor(
+        tasks_file,
+        CommandBackend(command, cwd=tmp_path),
+        tmp_path / "logs",
+        echo=lambda message: None,
+        checkpoint_command="./check.sh",
+    )
+    check.unlink()
+
+    result = executor.run()
+
+    assert result.states == {"T001": DONE, "T002": SKIPPED}
+    assert result.stopped_at == "Phase 1: Setup"
+    assert result.skipped["T002"] == "run stopped at Phase 1: Setup"
+    assert "- [x] T001" in tasks_file.read_text(encoding="utf-8")